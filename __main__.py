@@ -17,12 +17,37 @@ In addition, you should have the following subfolders
 
 Moving any of these folders or files will prevent the game from working properly
 
+After the optional numbers of rows, aliens per row and alien speed (see consts.py), you
+may give --record FILE to record your keyboard to a file, or --replay FILE to play back
+such a recording instead of using the keyboard.
+
 Author: Walker M. White (wmw2)
 Date:   November 1, 2017 (Python 3 Version)
 """
 from consts import *
 from app import *
 
+import sys
+
+
+def option(name):
+    """
+    Returns the value given after the command line flag name, or None if the
+    flag is missing
+
+    Parameter name: the flag to look for
+    Precondition: name is a string starting with '--'
+    """
+    if name in sys.argv:
+        pos = sys.argv.index(name)
+        if pos+1 < len(sys.argv):
+            return sys.argv[pos+1]
+    return None
+
+
 # Application code
 if __name__ == '__main__':
-    Invaders(width=GAME_WIDTH,height=GAME_HEIGHT).run()
+    Invaders(width=GAME_WIDTH,height=GAME_HEIGHT,
+             record=option('--record'),replay=option('--replay'),
+             atlas=SPRITE_ATLAS,step=GAME_STEP,
+             governor=GGovernor(MIN_FPS,MAX_FPS)).run()
@@ -49,7 +49,7 @@ class Invaders(GameApp):
         input:  the user input, used to control the ship and change state
                 [instance of GInput; it is inherited from GameApp]
         _state: the current state of the game represented as a value from consts.py
-                [one of STATE_INACTIVE, STATE_NEWWAVE, STATE_ACTIVE, STATE_PAUSED, STATE_CONTINUE, STATE_COMPLETE]
+                [one of STATE_LOADING, STATE_INACTIVE, STATE_NEWWAVE, STATE_ACTIVE, STATE_PAUSED, STATE_CONTINUE, STATE_COMPLETE]
         _wave:  the subcontroller for a single wave, which manages the ships and aliens
                 [Wave, or None if there is no wave currently active]
         _text:  the currently active message
@@ -71,12 +71,31 @@ class Invaders(GameApp):
     _lives_numlabel
     _pause_message
     _score_label
+    _miss_label
+    _left_b_label
+    _right_b_label
+    _messages
     _score
     _background
     _infotext
     _pause
     _right_b_hp
     _left_b_hp
+
+    The HUD labels (_lives_numlabel, _score_label, _miss_label, _left_b_label and
+    _right_b_label) are GText objects created once in start.  Every frame only their
+    text is set.  Their glyphs come from a shared atlas, so new text only changes
+    the vertices of a mesh (and the same text changes nothing).
+    _messages maps the text of each pause message to its GLabel [dict of str to
+    GLabel], so each message is only created the first time it is shown.
+    _profile_key: whether PROFILE_KEY was down in the last frame [bool]
+    _loader: the preloader of the images, fonts and sounds [GPreloader]
+    _loading_frame: the outline of the progress bar in STATE_LOADING [GRectangle]
+    _loading_bar: the filled part of the progress bar [GRectangle]
+    _sounds: the sound effects played by every wave [SoundEffects, or None in
+             STATE_LOADING]
+    In STATE_LOADING the attributes made by make_screens (_background, _text,
+    _infotext and the HUD labels) are None.
     """
 
     # DO NOT MAKE A NEW INITIALIZER
@@ -92,14 +111,49 @@ class Invaders(GameApp):
         You should use it to initialize any game specific attributes.
 
         This method should make sure that all of the attributes satisfy the given
-        invariants. When done, it sets the _state to STATE_INACTIVE and create a message
-        (in attribute _text) saying that the user should press to play a game.
+        invariants. When done, it sets the _state to STATE_LOADING and starts loading
+        the images, fonts and sounds in the background.  Only a progress bar is made
+        here; the screens are made by make_screens once the loading is done.
         """
-        self._state = STATE_INACTIVE
-        self._background =GImage(x=GAME_WIDTH/2,y=GAME_HEIGHT/2,width=GAME_WIDTH,height=GAME_HEIGHT,\
-        source='space.png')
+        #only add and remove what changed on the canvas each frame
+        self.view.retained = True
+        self._state = STATE_LOADING
         self._wave = None
         self._pause = 0
+        self._profile_key = False
+        self.profiler.top = GAME_HEIGHT-70
+        self._loader = GPreloader(PRELOAD_IMAGES,PRELOAD_FONTS,PRELOAD_SOUNDS)
+        self._loader.start()
+        self._loading_frame = GRectangle(x=GAME_WIDTH/2,y=GAME_HEIGHT/2,\
+        width=LOADING_WIDTH+4,height=LOADING_HEIGHT+4,fillcolor=None,\
+        linecolor='white',linewidth=2)
+        self._loading_bar = GRectangle(left=GAME_WIDTH/2-LOADING_WIDTH/2,\
+        y=GAME_HEIGHT/2,width=1,height=LOADING_HEIGHT,fillcolor='white')
+        self._background = None
+        self._text = None
+        self._infotext = None
+        self._lives = PLAYER_LIVES
+        self._lives_numlabel = None
+        self._pause_message = None
+        self._messages = {}
+        self._score = 0
+        self._score_label = None
+        self._miss_label = None
+        self._left_b_hp = BARRIER_HP
+        self._right_b_hp = BARRIER_HP
+        self._left_b_label = None
+        self._right_b_label = None
+        self._sounds = None
+
+    def make_screens(self):
+        """
+        Makes the background, the welcome screen and the HUD labels
+
+        This method is called once the images and fonts are loaded, so that none
+        of them are loaded in the middle of a frame.
+        """
+        self._background =GImage(x=GAME_WIDTH/2,y=GAME_HEIGHT/2,width=GAME_WIDTH,height=GAME_HEIGHT,\
+        source='space.png')
         self._text = GLabel(text='Press \'s\' to play',halign='center',\
         valign='top',x=GAME_WIDTH/2,y=GAME_HEIGHT/2,fillcolor=None,\
         font_name='Arcade',font_size=80, linecolor = "white")
@@ -108,21 +162,22 @@ class Invaders(GameApp):
         valign='top',x=GAME_WIDTH/2,y=GAME_HEIGHT/2.5,fillcolor=None,\
         font_name='Arcade',font_size=30, linecolor = "white")
 
-        self._lives = PLAYER_LIVES
-        self._lives_numlabel = GLabel(text=str(self._lives)+' Lives Left',\
-        halign='right',valign='top',x=GAME_WIDTH-25,y=GAME_HEIGHT-25,\
-        fillcolor=[1,1,1,1],font_name='Arcade',font_size=40)
-        self._pause_message = None
-        self._score = 0
-        self._left_b_hp = BARRIER_HP
-        self._right_b_hp = BARRIER_HP
-        self._left_b_label = GLabel(text='L-Barrier HP:'\
+        self._lives_numlabel = GText(text=str(self._lives)+' Lives',\
+        halign='right',valign='top',x=GAME_WIDTH-75,y=GAME_HEIGHT-25,\
+        fillcolor=None,font_name='Arcade',font_size=40, linecolor = "white")
+        self._score_label = GText(text='Score: '+str(self._score),\
+        halign='right',valign='top',x=100,y=GAME_HEIGHT-25,\
+        fillcolor=None,font_name='Arcade',font_size=40, linecolor = "white")
+        self._miss_label = GText(text='Misses: '+str(0), \
+        halign='right',valign='top',x=75,y=GAME_HEIGHT-50, \
+        fillcolor=None,font_name='Arcade',font_size=20, linecolor = "white")
+        self._left_b_label = GText(text='L-Barrier HP:'\
         +str(self._left_b_hp), \
-        halign='right',valign='top',x=250,y=GAME_HEIGHT-50, \
+        halign='right',valign='top',x=GAME_WIDTH/2,y=GAME_HEIGHT-25, \
         fillcolor=None,font_name='Arcade',font_size=20, linecolor = "white")
-        self._right_b_label = GLabel(text='R-Barrier HP:'\
+        self._right_b_label = GText(text='R-Barrier HP:'\
         +str(self._right_b_hp), \
-        halign='right',valign='top',x=400,y=GAME_HEIGHT-50, \
+        halign='right',valign='top',x=GAME_WIDTH/2,y=GAME_HEIGHT-50, \
         fillcolor=None,font_name='Arcade',font_size=20, linecolor = "white")
 
 
@@ -141,7 +196,12 @@ class Invaders(GameApp):
         STATE_ACTIVE, STATE_PAUSED, STATE_CONTINUE, and STATE_COMPLETE.  Each one of these
         does its own thing and might even needs its own helper.  We describe these below.
 
-        STATE_INACTIVE: This is the state when the application first opens.  It is a
+        STATE_LOADING: This is the state when the application first opens.  It shows
+        a progress bar while the images, fonts and sounds load in the background (see
+        GPreloader).  When they are all loaded, it makes the screens and switches to
+        STATE_INACTIVE.  The keyboard is ignored in this state.
+
+        STATE_INACTIVE: This is the state after the application has loaded.  It is a
         paused state, waiting for the player to start the game.  It displays a simple
         message on the screen. The application remains in this state so long as the
         player never presses a key.  In addition, this is the state the application
@@ -170,17 +230,28 @@ class Invaders(GameApp):
         You are allowed to add more states if you wish. Should you do so, you should
         describe them here.
 
+        In the states STATE_INACTIVE, STATE_PAUSED and STATE_COMPLETE nothing on the
+        screen moves, so this method marks the application idle (see GameApp) and the
+        frame is not redrawn until the player presses a key.
+
         Parameter dt: The time in seconds since last update
         Precondition: dt is a number (int or float)
         """
         # IMPLEMENT ME
 
+        self.toggle_profiler()
+        self.STATE_LOADING_Helper()
         self.STATE_INACTIVE_Helper()
         self.STATE_NEWWAVE_Helper()
         self.STATE_ACTIVE_Helper(dt)
         self.STATE_PAUSED_Helper()
         self.STATE_CONTINUE_Helper()
         self.STATE_COMPLETE_Helper()
+        self.idle = self._state in (STATE_INACTIVE, STATE_PAUSED, STATE_COMPLETE)
+        if self.profiler.enabled and self._wave != None:
+            self.profiler.set_count('aliens',
+                ALIEN_ROWS*ALIENS_IN_ROW-self._wave.get_dead_count())
+            self.profiler.set_count('bolts',self._wave.get_bolt_count())
 
     def draw(self):
         """
@@ -194,6 +265,10 @@ class Invaders(GameApp):
         or you need to add a draw method to class Wave.  We suggest the latter.  See
         the example subcontroller.py from class.
         """
+        if self._state == STATE_LOADING:
+            self._loading_frame.draw(self.view)
+            self._loading_bar.draw(self.view)
+            return
         self._background.draw(self.view)
         if self._state == STATE_INACTIVE:
             self._text.draw(self.view)
@@ -201,7 +276,7 @@ class Invaders(GameApp):
         if self._state == STATE_NEWWAVE:
             self._text = None
         if self._state == STATE_ACTIVE:
-            self._wave.draw(self.view)
+            self._wave.draw(self.view,self.blend)
             self._lives_numlabel.draw(self.view)
             self._score_label.draw(self.view)
             self._miss_label.draw(self.view)
@@ -227,6 +302,54 @@ class Invaders(GameApp):
 
 
     # HELPER METHODS FOR THE STATES GO HERE
+    def toggle_profiler(self):
+        """
+        Shows or hides the frame profiler when PROFILE_KEY is pressed
+
+        The profiler times the parts of every frame and of every step of the
+        wave, and shows the times and the number of aliens and bolts on screen.
+        """
+        down = self.input.is_key_down(PROFILE_KEY)
+        if down and not self._profile_key:
+            self.profiler.enabled = not self.profiler.enabled
+        self._profile_key = down
+
+    def make_sounds(self):
+        """
+        Makes the sound effects from SOUND_EFFECTS
+
+        This method is called once the sounds are loaded, so the voices of
+        each effect are the preloaded sounds and no file is read here.
+        """
+        self._sounds = SoundEffects(SOUND_VOICES,SOUND_LIMIT)
+        for key in SOUND_EFFECTS:
+            self._sounds[key] = SOUND_EFFECTS[key]
+
+    def STATE_LOADING_Helper(self):
+        """
+        Helper while state is STATE_LOADING
+
+        Finishes the files that were loaded in the background since the last
+        frame, and grows the progress bar.  When every file is loaded, makes
+        the screens and changes state to STATE_INACTIVE.
+
+        While the keyboard is recorded or replayed, everything is loaded in
+        the first frame, so that a replay starts on the same frame as its
+        recording on any machine.
+        """
+        if self._state == STATE_LOADING:
+            if self.input.recording or self.input.replaying:
+                self._loader.finish()
+            else:
+                self._loader.update()
+            left = self._loading_bar.left
+            self._loading_bar.width = max(1,LOADING_WIDTH*self._loader.progress)
+            self._loading_bar.left = left
+            if self._loader.done:
+                self.make_screens()
+                self.make_sounds()
+                self._state = STATE_INACTIVE
+
     def STATE_INACTIVE_Helper(self):
         """
         Helper while state is STATE_INACTIVE
@@ -244,10 +367,15 @@ class Invaders(GameApp):
         """
         Helper while state is STATE_NEWWAVE
 
-        This method creates a wave and changes state to STATE_ACTIVE
+        This method creates a wave and changes state to STATE_ACTIVE.
+        The wave is seeded with INPUT_SEED if the keyboard is being recorded
+        or replayed.
         """
         if self._state == STATE_NEWWAVE:
-            self._wave = Wave()
+            if self.input.recording or self.input.replaying:
+                self._wave = Wave(INPUT_SEED,profiler=self.profiler,sounds=self._sounds)
+            else:
+                self._wave = Wave(profiler=self.profiler,sounds=self._sounds)
             self._state = STATE_ACTIVE
 
     def STATE_ACTIVE_Helper(self, dt):
@@ -264,19 +392,12 @@ class Invaders(GameApp):
         """
         if(self._state == STATE_ACTIVE):
             #update life if lost a life
-            self._lives_numlabel = GLabel(text=str(self._lives)+' Lives',\
-            halign='right',valign='top',x=GAME_WIDTH-75,y=GAME_HEIGHT-25,\
-            fillcolor=None,font_name='Arcade',font_size=40, linecolor = "white")
+            self._lives_numlabel.text = str(self._lives)+' Lives'
             #updates Score #more score is rewarded for less missed shots
             self._score = int(self._wave.get_dead_count()*POINTS_PER_KILL\
             -self._wave.get_missed_shots()*MISS_PENALTY)
-            self._score_label = GLabel(text='Score: '+str(self._score),\
-            halign='right',valign='top',x=100,y=GAME_HEIGHT-25,\
-            fillcolor=None,font_name='Arcade',font_size=40, linecolor = "white")
-            self._miss_label = GLabel(text='Misses: '\
-            +str(self._wave.get_missed_shots()), \
-            halign='right',valign='top',x=75,y=GAME_HEIGHT-50, \
-            fillcolor=None,font_name='Arcade',font_size=20, linecolor = "white")
+            self._score_label.text = 'Score: '+str(self._score)
+            self._miss_label.text = 'Misses: '+str(self._wave.get_missed_shots())
             self._wave.update(self._input, dt)
             #Checks if the ship is alive, if ship dies,reduce score by DEATH_PENALTY
             if self._wave.get_ship_alive() == False:
@@ -294,33 +415,28 @@ class Invaders(GameApp):
             self.update_barriers()
 
     def update_barriers(self):
-        if self._wave.get_left_barrier != None:
-            self._left_b_hp = self._wave.get_left_barrier_health()
-            self._left_b_label = GLabel(text='L-Barrier HP:'\
-            +str(self._left_b_hp), \
-            halign='right',valign='top',x=GAME_WIDTH/2,y=GAME_HEIGHT-25, \
-            fillcolor=None,font_name='Arcade',font_size=20, linecolor = "white")
-
-        if self._wave.get_right_barrier != None:
-            self._right_b_hp = self._wave.get_right_barrier_health()
-            self._right_b_label = GLabel(text='R-Barrier HP:'\
-            +str(self._right_b_hp), \
-            halign='right',valign='top',x=GAME_WIDTH/2,y=GAME_HEIGHT-50, \
-            fillcolor=None,font_name='Arcade',font_size=20, linecolor = "white")
-
-        if self._wave.get_left_barrier == None:
-            self._left_b_hp = 0
-            self._left_b_label = GLabel(text='L-Barrier HP:'\
-            +str(0), \
-            halign='right',valign='top',x=GAME_WIDTH/2,y=GAME_HEIGHT-25, \
-            fillcolor=None,font_name='Arcade',font_size=20, linecolor = "white")
-
-        if self._wave.get_right_barrier == None:
-            self._right_b_hp = 0
-            self._right_b_label = GLabel(text='R-Barrier HP:'\
-            +str(0), \
-            halign='right',valign='top',x=GAME_WIDTH/2,y=GAME_HEIGHT-50, \
-            fillcolor=None,font_name='Arcade',font_size=20, linecolor = "white")
+        """
+        Updates the barrier HP labels with the health of each barrier
+        (0 once a barrier is destroyed)
+        """
+        self._left_b_hp = self._wave.get_left_barrier_health()
+        self._left_b_label.text = 'L-Barrier HP:'+str(self._left_b_hp)
+        self._right_b_hp = self._wave.get_right_barrier_health()
+        self._right_b_label.text = 'R-Barrier HP:'+str(self._right_b_hp)
+
+    def show_message(self,text):
+        """
+        Makes the pause message the label with the given text, creating the label
+        the first time the message is shown
+
+        Parameter text: the message to show
+        Precondition: text is a string
+        """
+        if not text in self._messages:
+            self._messages[text] = GLabel(text=text,\
+            halign='right',valign='top',x=GAME_WIDTH/2,y=GAME_HEIGHT/2,\
+            fillcolor=None,font_name='Arcade',font_size=40, linecolor = "white")
+        self._pause_message = self._messages[text]
 
     def STATE_PAUSED_Helper(self):
         """
@@ -333,18 +449,14 @@ class Invaders(GameApp):
         If the player is paused and has 0 lives, passes the _state to STATE_CONTINUE
         """
         if self._state == STATE_PAUSED and self._lives > 0:
-            self._pause_message =  GLabel(text="Ship hit: Press 'S' to continue",\
-            halign='right',valign='top',x=GAME_WIDTH/2,y=GAME_HEIGHT/2,\
-            fillcolor=None,font_name='Arcade',font_size=40, linecolor = "white")
+            self.show_message("Ship hit: Press 'S' to continue")
 
             if self.input.is_key_down('s') and self._state == STATE_PAUSED:
                 self._state = STATE_CONTINUE
                 self._wave.set_ship_alive()
 
         if self._state == STATE_PAUSED and self._pause == 1:
-            self._pause_message =  GLabel(text="Paused: Press 'S' to continue",\
-            halign='right',valign='top',x=GAME_WIDTH/2,y=GAME_HEIGHT/2,\
-            fillcolor=None,font_name='Arcade',font_size=40, linecolor = "white")
+            self.show_message("Paused: Press 'S' to continue")
 
             if self.input.is_key_down('s') and self._state == STATE_PAUSED:
                 self._state = STATE_CONTINUE
@@ -375,18 +487,12 @@ class Invaders(GameApp):
         that the aliens have breached the defensive life
         """
         if self._state == STATE_COMPLETE and self._lives == 0:
-            self._pause_message =  GLabel(text="YOU RAN OUT OF LIVES!",\
-            halign='right',valign='top',x=GAME_WIDTH/2,y=GAME_HEIGHT/2,\
-            fillcolor=None,font_name='Arcade',font_size=40, linecolor = "white")
+            self.show_message("YOU RAN OUT OF LIVES!")
 
         if self._state == STATE_COMPLETE and self._lives > 0:
-            self._pause_message =  GLabel(text="YOU WIN!",\
-            halign='right',valign='top',x=GAME_WIDTH/2,y=GAME_HEIGHT/2,\
-            fillcolor=None,font_name='Arcade',font_size=40, linecolor = "white")
+            self.show_message("YOU WIN!")
             if self.input.is_key_down('s') and self._state == STATE_COMPLETE:
                 self._state == STATE_NEWWAVE
 
         if self._state == STATE_COMPLETE and self._wave.get_dline_breached() == True:
-            self._pause_message =  GLabel(text="THE ALIENS HAVE INVADED!",\
-            halign='right',valign='top',x=GAME_WIDTH/2,y=GAME_HEIGHT/2,\
-            fillcolor=None,font_name='Arcade',font_size=40,linecolor = "white")
+            self.show_message("THE ALIENS HAVE INVADED!")
@@ -0,0 +1,227 @@
+"""
+Setter and startup benchmarks for Alien Invaders
+
+Every assignment to an attribute of a game2d object is checked (see gobject.py).  By
+default, this script measures what one assignment costs, for the attributes that the
+game sets most often, both in the normal mode and in the fast mode (Python started with
+-O, which compiles the checks out).  It runs itself once in each mode and prints a table
+of the cost of one set in nanoseconds.  The objects are created headless (see
+game2d/headless.py), so Kivy is never imported and the numbers measure game2d alone.
+
+With --startup, this script instead measures how long the game takes to cold start: the
+time from launching Python until the first frame has been drawn, split into the phases
+of the launch, followed by the time spent importing each top-level package.  The game
+runs in a real window (set SDL_VIDEODRIVER=offscreen on a machine with no display), and
+closes itself after its first frame.  You may give
+
+    --number N   (the number of assignments to time for each attribute, default 200000)
+    --startup    (measure the startup of the game instead)
+    --repeat N   (the number of cold starts to take the fastest of, default 3)
+
+For example
+
+    python benchmark.py --number 1000000
+    python benchmark.py --startup
+
+# John O'Donnel (jro79) and Anthony Nguyen (an523)
+# 4/27/2019
+"""
+import os
+import sys
+if not '--first-frame' in sys.argv:
+    os.environ['GAME2D_HEADLESS'] = '1'
+
+import time
+import subprocess
+import timeit
+
+
+# The attributes to time, with the object to set them on and the values to alternate
+SETTERS = (('x',         'GImage',     '10',      '20.5'),
+           ('y',         'GImage',     '10',      '20.5'),
+           ('width',     'GRectangle', '10',      '20.5'),
+           ('fillcolor', 'GRectangle', "'red'",   '(0,0,1)'),
+           ('scale',     'GImage',     '(1,2)',   '0.5'))
+
+
+def option(name,default):
+    """
+    Returns the value given after the command line flag name, or default if the
+    flag is missing
+
+    Parameter name: the flag to look for
+    Precondition: name is a string starting with '--'
+
+    Parameter default: the value to use if the flag is missing
+    Precondition: default is a number
+    """
+    if name in sys.argv:
+        pos = sys.argv.index(name)
+        if pos+1 < len(sys.argv):
+            return type(default)(sys.argv[pos+1])
+    return default
+
+
+def measure(number):
+    """
+    Returns a list of the cost of one set of each attribute in SETTERS, in
+    nanoseconds, in the mode that this Python is running in
+
+    Parameter number: the number of assignments to time for each attribute
+    Precondition: number is an even int > 0
+    """
+    from game2d import GameApp
+    GameApp.set_paths(os.path.dirname(os.path.abspath(__file__)))
+    result = []
+    for (name, kind, first, second) in SETTERS:
+        setup = 'from game2d import %s\nshape = %s(width=10,height=10%s)' % \
+                (kind,kind,",source='ship.png'" if kind == 'GImage' else '')
+        code = 'shape.%s = %s\nshape.%s = %s' % (name,first,name,second)
+        time = min(timeit.repeat(code,setup,number=number//2,repeat=3))
+        result.append(1e9*time/number)
+    return result
+
+
+def run(number,fast):
+    """
+    Returns the costs measured (see measure) by a new Python process, in fast
+    mode if fast is True and in the normal mode otherwise
+
+    Parameter number: the number of assignments to time for each attribute
+    Precondition: number is an even int > 0
+
+    Parameter fast: whether to run the process with -O
+    Precondition: fast is a bool
+    """
+    command = [sys.executable]+(['-O'] if fast else [])
+    command += [os.path.abspath(__file__),'--measure','--number',str(number)]
+    output = subprocess.check_output(command,universal_newlines=True)
+    return [float(value) for value in output.split()]
+
+
+def first_frame():
+    """
+    Starts the game and prints the wall clock time at the end of each phase of its
+    launch, one 'phase time' pair per line, stopping the game after its first frame
+
+    The phases are the imports, the creation of the game, the window (build), the
+    sprite atlas (see GameApp.load_atlas), the start method and the first frame.
+    """
+    def mark(phase):
+        print(phase,repr(time.time()))
+
+    from consts import GAME_WIDTH, GAME_HEIGHT, SPRITE_ATLAS, GAME_STEP
+    from app import Invaders
+    mark('import')
+
+    class Timed(Invaders):
+        # Invaders with a mark after each phase, closing after the first frame
+        def build(self):
+            result = Invaders.build(self)
+            mark('window')
+            return result
+
+        def start(self):
+            mark('atlas')
+            Invaders.start(self)
+            mark('start')
+
+        def _refresh(self,dt):
+            Invaders._refresh(self,dt)
+            mark('frame')
+            sys.stdout.flush()
+            self.stop()
+
+    game = Timed(width=GAME_WIDTH,height=GAME_HEIGHT,atlas=SPRITE_ATLAS,step=GAME_STEP)
+    mark('create')
+    game.run()
+
+
+def launch(importtime=False):
+    """
+    Returns the phases of a cold start of the game (see first_frame) as a list of
+    (phase, seconds since launch) pairs, and the import times if importtime is True
+
+    The import times are a dictionary from each top-level package (or module) to the
+    seconds spent importing it and its submodules, as reported by python -X importtime.
+    If importtime is False, this dictionary is empty.
+
+    Parameter importtime: whether to report the import times
+    Precondition: importtime is a bool
+    """
+    command = [sys.executable]+(['-X','importtime'] if importtime else [])
+    command += [os.path.abspath(__file__),'--first-frame']
+    env = dict(os.environ)
+    env.pop('GAME2D_HEADLESS',None)
+    env['KIVY_NO_ARGS'] = '1'
+    env['KIVY_NO_CONSOLELOG'] = '1'
+    start = time.time()
+    result = subprocess.run(command,env=env,universal_newlines=True,
+                            stdout=subprocess.PIPE,stderr=subprocess.PIPE)
+    phases = []
+    for line in result.stdout.split('\n'):
+        if line.count(' ') == 1:
+            (phase, stamp) = line.split(' ')
+            phases.append((phase,float(stamp)-start))
+    imports = {}
+    for line in result.stderr.split('\n'):
+        if line.startswith('import time:') and not 'self [us]' in line:
+            (own, total, name) = line[12:].split('|')
+            package = name.strip().split('.')[0]
+            imports[package] = imports.get(package,0.0)+int(own)/1e6
+    return (phases, imports)
+
+
+def startup(repeat):
+    """
+    Prints the time to the first frame of the fastest of repeat cold starts, split
+    into the phases of the launch, and then the import time of each package
+
+    Parameter repeat: the number of cold starts to make
+    Precondition: repeat is an int > 0
+    """
+    best = None
+    for count in range(repeat):
+        (phases, imports) = launch()
+        if len(phases) == 0:
+            print('The game did not draw a frame (is there a display?)')
+            sys.exit(1)
+        if best is None or phases[-1][1] < best[-1][1]:
+            best = phases
+    print('%-10s %10s %10s' % ('phase','at (ms)','took (ms)'))
+    previous = 0.0
+    for (phase, stamp) in best:
+        print('%-10s %10.1f %10.1f' % (phase,1000*stamp,1000*(stamp-previous)))
+        previous = stamp
+    print('first frame after %.1f ms' % (1000*best[-1][1]))
+
+    (phases, imports) = launch(True)
+    print()
+    print('%-20s %10s' % ('package','import (ms)'))
+    packages = sorted(imports,key=lambda package: -imports[package])
+    for package in packages[:15]:
+        print('%-20s %10.1f' % (package,1000*imports[package]))
+    print('%-20s %10.1f' % ('(total)',1000*sum(imports.values())))
+
+
+# Application code
+if __name__ == '__main__':
+    if '--first-frame' in sys.argv:
+        first_frame()
+        sys.exit(0)
+    if '--startup' in sys.argv:
+        startup(option('--repeat',3))
+        sys.exit(0)
+
+    number = option('--number',200000)
+    number += number % 2
+    if '--measure' in sys.argv:
+        print(' '.join(repr(value) for value in measure(number)))
+        sys.exit(0)
+
+    normal = run(number,False)
+    fast = run(number,True)
+    print('%-10s %-10s %12s %12s %8s' % ('attribute','object','normal (ns)','fast (ns)','speedup'))
+    for pos in range(len(SETTERS)):
+        print('%-10s %-10s %12.1f %12.1f %7.2fx' % (SETTERS[pos][0],SETTERS[pos][1],
+              normal[pos],fast[pos],normal[pos]/fast[pos]))
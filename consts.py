@@ -8,7 +8,6 @@ we separate the constants into their own module. This allows all modules to acce
 # John O'Donnel (jro79) and Anthony Nguyen (an523)
 # 4/27/2019
 """
-import introcs
 import sys
 
 ### WINDOW CONSTANTS (all coordinates are in pixels) ###
@@ -58,6 +57,12 @@ ALIEN_ROWS     = 5
 ALIENS_IN_ROW  = 12
 # the image files for the aliens (bottom to top)
 ALIEN_IMAGES   = ('alien1.png','alien2.png','alien3.png')
+# the filmstrips of the aliens, in the same order as ALIEN_IMAGES
+ALIEN_STRIPS   = ('alien-strip1.png','alien-strip2.png','alien-strip3.png')
+# the grid size (rows, columns) of an alien filmstrip
+ALIEN_FORMAT   = (3,2)
+# the filmstrip frames that the aliens walk through, one per step
+ALIEN_WALK     = (0,1)
 # the number of seconds (0 < float <= 1) between alien steps
 ALIEN_SPEED = 1.0
 
@@ -104,6 +109,8 @@ STATE_PAUSED   = 3
 STATE_CONTINUE = 4
 #: state when the game is complete (won or lost)
 STATE_COMPLETE = 5
+# state when the images, fonts and sounds are loading, before STATE_INACTIVE
+STATE_LOADING  = 6
 
 
 ### USE COMMAND LINE ARGUMENTS TO CHANGE NUMBER OF ALIENS IN A ROW"""
@@ -153,3 +160,48 @@ MISS_PENALTY = 25
 HEAT_SEEKING_DIFFICULTY = 5
 #Durability of the asteroid
 ASTEROID_LIFE = 20
+#Whether Wave keeps the alien formation in NumPy arrays (see Formation in models.py)
+#The formation then marches and is drawn from the arrays, and the Alien objects are
+#never moved; otherwise every Alien is moved and drawn on its own
+FORMATION_ARRAYS = True
+#The number of random numbers generated at a time by each random stream of a
+#seeded Wave (see RandomStream in wave.py)
+RANDOM_BLOCK = 1024
+#The seed of every wave while the keyboard is recorded or replayed, so that a
+#replay plays exactly the same game as its recording
+INPUT_SEED = 0
+#The largest number of laser bolts on screen at once (see BoltPool in models.py)
+BOLT_CAPACITY = 64
+#The texture atlas that the sprites are packed into (see GameApp.load_atlas)
+SPRITE_ATLAS = 'sprites'
+#The fixed time in seconds of a game update (see GameApp.step).  The ship and the
+#bolts move a fixed distance per update, so this keeps the game speed the same at
+#any frame rate
+GAME_STEP = 1/60
+#The bounds of the frame rate, which drops when the frames use too much of their
+#budget (see GGovernor)
+MIN_FPS = 30
+MAX_FPS = 60
+#The key that shows and hides the frame profiler (see GameApp.profiler)
+PROFILE_KEY = 'f3'
+#The sound effects of a wave, each mapped to the files it takes turns among
+#(see SoundEffects).  A pew is a player shot, a blast is a kill and a pop is a
+#bolt hitting a barrier
+SOUND_EFFECTS = {'pew':('pew1.wav','pew2.wav'),
+                 'blast':('blast1.wav','blast2.wav','blast3.wav'),
+                 'pop':('pop1.wav','pop2.wav')}
+#The number of voices of each sound effect file, so an effect can overlap itself
+SOUND_VOICES = 2
+#The most sound effects playing at once (the oldest is cut off beyond this)
+SOUND_LIMIT = 8
+#The files loaded in STATE_LOADING, before the game needs them (see GPreloader).
+#Images in SPRITE_ATLAS are loaded with the atlas and skipped.  The fonts are the
+#(font name, font size) pairs of the GText labels.  Each sound effect file is
+#listed once per voice
+PRELOAD_IMAGES = ('space.png',)
+PRELOAD_FONTS  = (('Arcade',40),('Arcade',20))
+PRELOAD_SOUNDS = tuple(name for files in SOUND_EFFECTS.values() for name in files
+                       for voice in range(SOUND_VOICES))
+#The size of the progress bar shown in STATE_LOADING
+LOADING_WIDTH  = 400
+LOADING_HEIGHT = 20
@@ -9,8 +9,14 @@ Date:   August 1, 2017 (Python 3 version)
 """
 from .gobject import GObject, GScene
 from .grectangle import GRectangle, GEllipse, GImage, GLabel
-from .gsprite import GSprite
+from .gsprite import GSprite, GAnimator
+from .gtext import GText, GlyphAtlas
+from .gbatch import GSpriteBatch
 from .gpath import GPath, GTriangle, GPolygon
-from .gview import GInput, GView
-from .sound import Sound, SoundLibrary
+from .gview import GInput, GView, ScriptedInput, NullView
+from .gprofile import GProfiler
+from .ggovernor import GGovernor
+from .gloader import GPreloader
+from .gtimestep import GTimestep
+from .sound import Sound, SoundLibrary, SoundEffects
 from .app import GameApp
\ No newline at end of file
@@ -7,17 +7,22 @@ The primary class for 2D game support.
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
-# Basic Kivy Modules
-import kivy
-import kivy.app
+from .headless import ENABLED as HEADLESS
+if HEADLESS:
+    from .headless import App, Config, Clock
+else:
+    # Basic Kivy Modules
+    import kivy
+    from kivy.app import App
 
-# Lower-level kivy modules to support animation
-from kivy.config import Config
-from kivy.clock  import Clock
+    # Lower-level kivy modules to support animation
+    from kivy.config import Config
+    from kivy.clock  import Clock
 
 import os.path
+import time
 
-class GameApp(kivy.app.App):
+class GameApp(App):
     """
     A controller class for a simple game application.
     
@@ -39,6 +44,9 @@ class GameApp(kivy.app.App):
     # Class attribute for tracking textures (to reduce memory footprint)
     TEXTURE_CACHE = {}
     
+    # Class attribute for the texture atlas of the images (see load_atlas)
+    ATLAS = None
+    
     
     # MUTABLE ATTRIBUTES
     @property
@@ -58,9 +66,111 @@ class GameApp(kivy.app.App):
     def fps(self,value):
         assert type(value) in [int,float], 'value %s is not a number' % repr(value)
         assert value > 0, 'value %s is not positive' % repr(value)
-        Clock.unschedule(self._refresh)
         self._fps = value
-        Clock.schedule_interval(self._refresh,1.0/self._fps)
+        self._schedule()
+    
+    @property
+    def idle(self):
+        """
+        Whether nothing on the screen is changing.
+        
+        Set this attribute in :meth:`update` to say that the game is waiting (on a 
+        title screen, or paused) and that the frame looks the same as the last one.  
+        While the game is idle, :meth:`draw` is not called and the window keeps showing
+        the last frame, and :meth:`update` is only called `idle_fps` times a second.
+        The first frame of an idle spell is still drawn.
+        
+        Any key or mouse event wakes the game up immediately (setting this attribute
+        to False), so that :meth:`update` can react to it at once.  The game is never
+        slowed down while it plays back a recording.
+        
+        **Invariant**: Must be a bool.
+        """
+        return self._idle
+    
+    @idle.setter
+    def idle(self,value):
+        assert type(value) == bool, 'value %s is not a bool' % repr(value)
+        if value != self._idle:
+            self._idle = value
+            self._schedule()
+    
+    @property
+    def idle_fps(self):
+        """
+        The number of frames-per-second to animate while the game is `idle`.
+        
+        By default this value is 4 FPS.
+        
+        **Invariant**: Must be an int or float > 0.
+        """
+        return self._idle_fps
+    
+    @idle_fps.setter
+    def idle_fps(self,value):
+        assert type(value) in [int,float], 'value %s is not a number' % repr(value)
+        assert value > 0, 'value %s is not positive' % repr(value)
+        self._idle_fps = value
+        if self._idle:
+            self._schedule()
+    
+    @property
+    def governor(self):
+        """
+        The governor that adapts `fps` to the load of the game, or None.
+        
+        If this value is None (the default), `fps` only changes when you set it. 
+        Otherwise, at the end of every frame that is drawn, the time spent in the frame 
+        is given to the governor, which may change `fps` within its bounds (and then 
+        calls its callback).  See the class :class:`GGovernor` for more information.
+        Use it together with a fixed `step`, so that the game speed does not change
+        with the frame rate.
+        
+        **Invariant**: Must be None or an instance of :class:`GGovernor`.
+        """
+        return self._governor
+    
+    @governor.setter
+    def governor(self,value):
+        from .ggovernor import GGovernor
+        assert value is None or isinstance(value,GGovernor), 'value %s is not a GGovernor' % repr(value)
+        self._governor = value
+        if not value is None:
+            value.reset()
+    
+    @property
+    def step(self):
+        """
+        The fixed time in seconds of a call to :meth:`update`, or None.
+        
+        If this value is None (the default), :meth:`update` is called once per animation
+        frame with the time since the last frame, so a game that moves its objects a 
+        fixed distance per update runs slower when the frame rate drops.
+        
+        Otherwise the game is simulated at a fixed rate.  The time of every frame is 
+        added to the time not yet simulated, and :meth:`update` is called with exactly
+        this value as many times as fit in it (possibly none, and at most 
+        ``GTimestep.MAX_STEPS`` times, so that a slow frame cannot snowball).  See the 
+        class :class:`GTimestep`.  Each call starts a new input frame, so a recording
+        has one entry per update.  The time left over is given by `blend`, for 
+        :meth:`draw` to interpolate the positions of moving objects.
+        
+        While a recording plays back, :meth:`update` is called once per frame with the
+        recorded time, as it was recorded.
+        
+        **Invariant**: Must be None or an int or float > 0.
+        """
+        return None if self._timestep is None else self._timestep.step
+    
+    @step.setter
+    def step(self,value):
+        assert value is None or type(value) in [int,float], 'value %s is not a number' % repr(value)
+        assert value is None or value > 0, 'value %s is not positive' % repr(value)
+        if value is None:
+            self._timestep = None
+        else:
+            from .gtimestep import GTimestep
+            self._timestep = GTimestep(value)
     
     
     # IMMUTABLE PROPERTIES
@@ -106,6 +216,35 @@ class GameApp(kivy.app.App):
         """
         return self._input
     
+    @property
+    def profiler(self):
+        """
+        The frame profiler.
+        
+        It is disabled by default.  Enable it to time the phases of every frame and
+        to show the times on top of the game.  See the class :class:`GProfiler` for 
+        more information.
+        
+        **Invariant**: Must be instance of :class:`GProfiler`
+        """
+        return self._profiler
+    
+    @property
+    def blend(self):
+        """
+        The fraction of a `step` that has passed since the last call to :meth:`update`.
+        
+        Use this value in :meth:`draw` to place a moving object between its position
+        before the last update (at 0.0) and its position now (at 1.0), so that objects 
+        move smoothly whatever the frame rate.  The value is always 1.0 if there is no 
+        fixed `step`, or while a recording plays back.
+        
+        **Invariant**: Must be a float in 0..1.
+        """
+        if self._timestep is None or self.input.replaying:
+            return 1.0
+        return self._timestep.blend
+    
     # CLASS METHODS
     @classmethod
     def is_image(cls,name):
@@ -170,7 +309,11 @@ class GameApp(kivy.app.App):
         has already been loaded, it will return the cached texture.  Otherwise, it will
         load the texture and cache it before returning it.
         
-        This method will crash if name is not a valid file.
+        If the image was packed into the atlas (see :meth:`load_atlas`), the texture is
+        a region of the atlas texture instead of a texture of its own.
+        
+        This method will crash if name is not a valid file.  When game2d is running
+        headless (see :mod:`game2d.headless`), nothing is loaded and it returns None.
         
         :param name: The file name
         :type name:  ``str``
@@ -178,6 +321,14 @@ class GameApp(kivy.app.App):
         assert cls.is_image(name), '%s is not an image file' % repr(name)
         if name in cls.TEXTURE_CACHE:
             return cls.TEXTURE_CACHE[name]
+        if HEADLESS:
+            return None
+        
+        key = os.path.splitext(name)[0]
+        if cls.ATLAS and key in cls.ATLAS.textures:
+            texture = cls.ATLAS[key]
+            cls.TEXTURE_CACHE[name] = texture
+            return texture
         
         try:
             from kivy.core.image import Image
@@ -188,6 +339,94 @@ class GameApp(kivy.app.App):
         
         return texture
     
+    @classmethod
+    def load_atlas(cls,name,size=1024):
+        """
+        Returns: The texture atlas packing the images in the **Images** folder, or None
+        if it cannot be built
+        
+        An atlas is a single texture holding many images.  Once the atlas is loaded,
+        :meth:`load_texture` returns regions of the atlas texture for the packed images,
+        so that sprites drawn with them never switch textures.  Only the images that fit
+        in a ``size`` x ``size`` texture are packed.  The others are still loaded as
+        textures of their own.
+        
+        The atlas is a Kivy atlas, saved in the folder **Images/atlas** as the file
+        ``name.atlas`` and its pages.  It is only packed again if an image is newer than
+        the saved atlas.  Packing requires PIL (Pillow), but loading a saved atlas does
+        not.  Textures loaded before the atlas are not replaced.  When game2d is running
+        headless, nothing is loaded and it returns None.
+        
+        :param name: The name of the atlas
+        :type name:  ``str``
+        
+        :param size: The width and height of an atlas page
+        :type size:  ``int`` > 0
+        """
+        assert type(name) == str, '%s is not a valid atlas name' % repr(name)
+        assert type(size) == int and size > 0, '%s is not a valid atlas size' % repr(size)
+        if HEADLESS:
+            return None
+        
+        folder = os.path.join(cls.images,'atlas')
+        path = os.path.join(folder,name+'.atlas')
+        files = [os.path.join(cls.images,file) for file in sorted(os.listdir(cls.images))]
+        files = [file for file in files if os.path.isfile(file) and cls.is_image(os.path.basename(file))]
+        
+        stale = not os.path.exists(path)
+        if not stale:
+            built = os.path.getmtime(path)
+            stale = any(os.path.getmtime(file) > built for file in files)
+        
+        from kivy.atlas import Atlas
+        if stale:
+            try:
+                from PIL import Image
+            except ImportError:
+                Image = None
+            if Image is None and not os.path.exists(path):
+                return None
+            if not Image is None:
+                fits = []
+                for file in files:
+                    try:
+                        with Image.open(file) as image:
+                            (w, h) = image.size
+                    except IOError:
+                        continue
+                    # Kivy pads every image by 2 pixels on each side
+                    if w+4 <= size and h+4 <= size:
+                        fits.append(file)
+                if not os.path.isdir(folder):
+                    os.makedirs(folder)
+                Atlas.create(os.path.join(folder,name),fits,size)
+        
+        cls.ATLAS = Atlas(path)
+        return cls.ATLAS
+    
+    @classmethod
+    def set_paths(cls,path):
+        """
+        Sets the resource folders to the **Fonts**, **Sounds** and **Images** folders
+        inside of ``path``.
+        
+        This is done for you when the game is created, using the folder containing
+        your subclass of ``GameApp``.  You only need to call it yourself to use the 
+        drawables without a game application (e.g. in a headless simulation).
+        
+        :param path: The directory containing the resource folders
+        :type path:  ``str``
+        """
+        GameApp.fonts  = str(os.path.join(path, 'Fonts'))
+        GameApp.sounds = str(os.path.join(path, 'Sounds'))
+        GameApp.images = str(os.path.join(path, 'Images'))
+        
+        if not HEADLESS:
+            import kivy.resources
+            kivy.resources.resource_add_path(GameApp.fonts)
+            kivy.resources.resource_add_path(GameApp.sounds)
+            kivy.resources.resource_add_path(GameApp.images)
+    
     @classmethod
     def unload_texture(cls,name):
         """
@@ -226,12 +465,25 @@ class GameApp(kivy.app.App):
         **You will never call the constructor or run yourself**.  That is handled for 
         you in the provided code.
         
+        The keyword ``record`` names a file to record the keyboard to, and the keyword
+        ``replay`` names a recording to play back instead of using the keyboard.  See
+        the methods :meth:`GInput.start_recording` and :meth:`GInput.start_replay`.
+        The keyword ``atlas`` names a texture atlas to pack the images into before the
+        game starts.  See the method :meth:`load_atlas`.  The keyword ``step`` is the 
+        fixed time of an update (see the attribute `step`), and the keyword ``governor``
+        adapts the frame rate (see the attribute `governor`).
+        
         :param keywords: dictionary of keyword arguments 
         :type keywords:  keys are attribute names
         """
         w = keywords.pop('width', 0.0)
         h = keywords.pop('height', 0.0)
         f = keywords.pop('fps', 60.0)
+        s = keywords.pop('step', None)
+        g = keywords.pop('governor', None)
+        self._record = keywords.pop('record', None)
+        self._replay = keywords.pop('replay', None)
+        self._atlas  = keywords.pop('atlas', None)
 
         assert type(w) in [int,float], 'width %s is not a number' % repr(w)
         assert type(h) in [int,float], 'height %s is not a number' % repr(h)
@@ -241,13 +493,20 @@ class GameApp(kivy.app.App):
         self._gwidth = w
         self._gheight = h
         self._fps = f
+        self._idle = False
+        self._idle_fps = 4
+        self._running = False
+        from .gprofile import GProfiler
+        self._profiler = GProfiler(top=self.height-5)
+        self.step = s
+        self.governor = g
         
         Config.set('graphics', 'width', str(self.width))
         Config.set('graphics', 'height', str(self.height))
         self._setpaths()
         
         # Tell Kivy to build the application
-        kivy.app.App.__init__(self,**keywords)
+        App.__init__(self,**keywords)
     
     
     # PUBLIC METHODS
@@ -257,12 +516,25 @@ class GameApp(kivy.app.App):
         
         This is a Kivy reserved method.  It is part of the Kivy application process.  
         It should **never** be overridden.
+        
+        When game2d is running headless, the view is a :class:`NullView` and the input
+        is a :class:`ScriptedInput`, and you must call this method yourself.
         """
-        from .gview import GInput, GView
-        self._view = GView()
-        self._view.size_hint = (1,1)
-        self._input = GInput()
-        self._input._register(self._view)
+        from .gview import GInput, GView, NullView, ScriptedInput
+        if HEADLESS:
+            self._view = NullView()
+            self._input = ScriptedInput()
+        else:
+            self._view = GView()
+            self._view.size_hint = (1,1)
+            self._input = GInput()
+            self._input._register(self._view)
+            self._input._wake = self._wake
+        
+        if self._record:
+            self._input.start_recording(self._record)
+        if self._replay:
+            self._input.start_replay(self._replay)
         return self.view
     
     def run(self):
@@ -273,7 +545,7 @@ class GameApp(kivy.app.App):
         It should **never** be overridden.
         """
         Clock.schedule_once(self._bootstrap,-1)
-        kivy.app.App.run(self)
+        App.run(self)
     
     def stop(self):
         """
@@ -283,9 +555,18 @@ class GameApp(kivy.app.App):
         It should **never** be overridden.
         """
         import sys
-        kivy.app.App.stop(self)
+        App.stop(self)
         sys.exit(0)
     
+    def on_stop(self):
+        """
+        Finishes any keyboard recording as the game window closes.
+        
+        This is a Kivy reserved method.  It is part of the Kivy application process.  
+        It should **never** be overridden.
+        """
+        self.input.stop_recording()
+    
     def start(self):
         """
         Initializes the game state, creating a new game.
@@ -333,10 +614,10 @@ class GameApp(kivy.app.App):
         This method is a callback-proxy for method `start`.  It handles important issues 
         behind the scenes, particularly with setting the FPS
         """
-        if (self.fps < 60):
-            Clock.schedule_interval(self._refresh,1.0/self.fps)
-        else:
-            Clock.schedule_interval(self._refresh,0)
+        self._running = True
+        self._schedule()
+        if self._atlas:
+            GameApp.load_atlas(self._atlas)
         self.start()
     
     def _refresh(self,dt):
@@ -346,12 +627,88 @@ class GameApp(kivy.app.App):
         This method a callback-proxy for the methods `update` and `draw`.  It handles
         important issues behind the scenes, particularly with clearing the window.
         
+        If the game has a fixed `step`, this method calls :meth:`update` as many times as
+        the time allows instead (see `step`).  While the game is `idle` (before and 
+        after the updates), the window is not redrawn at all.  The times of every frame 
+        that is drawn (the whole frame, its updates, and the interval since the frame 
+        before) are given to the `governor`, if there is one.
+        
         :param dt: time in seconds since last update
         :type dt:  ``int`` or ``float``
         """
-        self.view.clear()
-        self.update(dt)
-        self.draw()
+        start = time.perf_counter()
+        profiler = self._profiler
+        profiler.begin_frame()
+        idle = self._idle
+        with profiler.phase('update'):
+            if self._timestep is None or self.input.replaying:
+                self.update(self.input._advance(dt))
+            else:
+                step = self._timestep.step
+                for count in range(self._timestep.advance(dt)):
+                    self.update(self.input._advance(step))
+        updated = time.perf_counter()
+        if idle and self._idle:
+            return
+        with profiler.phase('clear'):
+            self.view.clear()
+        with profiler.phase('draw'):
+            self.draw()
+        profiler.draw(self.view)
+        with profiler.phase('commit'):
+            self.view._commit()
+        profiler.end_frame()
+        if not self._governor is None:
+            # An idle frame was scheduled at a lower rate, so its interval says nothing
+            interval = None if idle or dt <= 0 else dt
+            # Only updates at a fixed step cost the same at any frame rate
+            fixed = 0.0 if self._timestep is None else updated-start
+            self._govern(time.perf_counter()-start,interval,fixed)
+    
+    def _schedule(self):
+        """
+        Schedules the animation frames at the rate for the current state.
+        
+        The rate is `idle_fps` while the game is idle (and not playing back a recording).
+        Otherwise it is `fps`, except that 60 FPS or more means every Kivy frame.  Nothing
+        is scheduled before the game is running.
+        """
+        if not self._running:
+            return
+        Clock.unschedule(self._refresh)
+        if self._idle and not self.input.replaying:
+            Clock.schedule_interval(self._refresh,1.0/self._idle_fps)
+        elif self.fps < 60:
+            Clock.schedule_interval(self._refresh,1.0/self.fps)
+        else:
+            Clock.schedule_interval(self._refresh,0)
+    
+    def _govern(self,busy,interval,update):
+        """
+        Gives the times of a frame to the `governor`, changing `fps` if it says so.
+        
+        :param busy: the time in seconds spent in the frame
+        :type busy:  ``float``
+        
+        :param interval: the time in seconds since the frame before, or None if unknown
+        :type interval:  ``float`` or ``None``
+        
+        :param update: the part of busy spent on updates at a fixed step
+        :type update:  ``float``
+        """
+        fps = self._governor.observe(busy,self._fps,interval,update)
+        if fps != self._fps:
+            self.fps = fps
+            if not self._governor.callback is None:
+                self._governor.callback(fps)
+    
+    def _wake(self):
+        """
+        Ends an idle spell at once, because of new input.
+        
+        This method is called by the input handler for every key and mouse event.
+        """
+        self.idle = False
     
     def _setpaths(self):
         """
@@ -364,13 +721,5 @@ class GameApp(kivy.app.App):
         
         path = os.path.abspath(inspect.getfile(self.__class__))
         path = os.path.dirname(path)
-        
-        GameApp.fonts  = str(os.path.join(path, 'Fonts'))
-        GameApp.sounds = str(os.path.join(path, 'Sounds'))
-        GameApp.images = str(os.path.join(path, 'Images'))
-        
-        import kivy.resources
-        kivy.resources.resource_add_path(GameApp.fonts)
-        kivy.resources.resource_add_path(GameApp.sounds)
-        kivy.resources.resource_add_path(GameApp.images)
+        GameApp.set_paths(path)
 
@@ -0,0 +1,233 @@
+"""
+A module to support batched drawing of many sprites with the same texture.
+
+Every :class:`GImage` is its own group of Kivy instructions (a matrix push, a transform,
+a color and a rectangle), so a hundred images are a hundred draw calls.  A sprite batch
+draws any number of axis-aligned rectangles with the same texture as a single ``Mesh``,
+whose vertices are rebuilt from the positions of the sprites.
+
+# John O'Donnel (jro79) and Anthony Nguyen (an523)
+# 4/27/2019
+"""
+from .headless import ENABLED as HEADLESS
+if HEADLESS:
+    from .headless import *
+else:
+    from kivy.graphics import *
+    from kivy.graphics.instructions import *
+from .gobject import GObject, FAST
+from .gsprite import GSprite
+from .app import GameApp
+
+
+# #mark -
+class GSpriteBatch(GObject):
+    """
+    A class representing many copies of one image, drawn in a single draw call.
+
+    The image is given by a JPEG, PNG, or GIF file whose name is stored in the attribute
+    `source`, just like :class:`GImage`.  If `source` is None, the sprites are solid
+    rectangles.  The sprites are tinted (or, without an image, colored) by `fillcolor`.
+
+    The sprites themselves are not objects.  Set them all at once, every time they move,
+    with either :meth:`set_images` (to copy the position and size of some images) or
+    :meth:`set_centers` (to give the centers of sprites that are all the size of this
+    batch).  Drawing the batch draws every sprite, in order.
+
+    If the image is a filmstrip, give its grid size with the keyword ``format``, just
+    like :class:`GSprite`.  Every sprite shows the same `frame`, so one :class:`GAnimator`
+    step animates the whole batch.
+
+    The attributes `width` and `height` are the size of each sprite for
+    :meth:`set_centers`.  The attributes `x`, `y`, `angle` and `scale` transform the
+    whole batch, so leave them alone to place the sprites in window coordinates.
+    Sprites are never rotated individually, and :meth:`contains` is meaningless.
+    """
+
+    # FAST MODE SLOTS
+    if FAST:
+        __slots__ = ('_source','_format','_frame','_frames','_rects','_count',
+                     '_vertices','_indices','_mesh','_uvs')
+
+    # MUTABLE PROPERTIES
+    @property
+    def source(self):
+        """
+        The source file for the image of every sprite, or None for solid rectangles.
+
+        **invariant**. Value must be None or a string refering to a valid file.
+        """
+        return self._source
+
+    @source.setter
+    def source(self,value):
+        assert value is None or GameApp.is_image(value), '%s is not an image file' % repr(value)
+        self._source = value
+        if self._defined:
+            self._reset()
+
+    @property
+    def frame(self):
+        """
+        The animation frame shown by every sprite, if the image is a filmstrip.
+
+        **invariant**. Value is an int 0..(rows*columns of the format)-1.
+        """
+        return self._frame
+
+    @frame.setter
+    def frame(self,value):
+        assert type(value) == int, '%s is not an int' % repr(value)
+        assert value >= 0 and value < self._format[0]*self._format[1], '%s is out of range' % repr(value)
+        if value == self._frame:
+            return
+        self._frame = value
+        if self._defined:
+            self._set_frame()
+
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def count(self):
+        """
+        The number of sprites in this batch.
+
+        **Immutable**: This value cannot be altered.  Use the methods
+        :meth:`set_images` and :meth:`set_centers` instead.
+
+        **invariant**. Value is an int >= 0.
+        """
+        return self._count
+
+
+    # BUILT-IN METHODS
+    def __init__(self,**keywords):
+        """
+        Creates a new, empty sprite batch.
+
+        To use the constructor for this class, you should provide it with a list of
+        keyword arguments that initialize various attributes. For example, to draw many
+        copies of ``alien1.png`` at size 33x33, use the constructor::
+
+            GSpriteBatch(width=33,height=33,source='alien1.png')
+
+        This class supports the all same keywords as :class:`GObject`, plus ``source``
+        and ``format``.
+
+        :param keywords: dictionary of keyword arguments
+        :type keywords:  keys are attribute names
+        """
+        self._defined = False
+        self.source = keywords['source'] if 'source' in keywords else None
+        self._format = keywords['format'] if 'format' in keywords else (1,1)
+        assert type(self._format) == tuple and len(self._format) == 2, '%s is not a tuple pair' % repr(self._format)
+        self._frame = 0
+        self._frames = None
+        self._rects = []
+        self._count = 0
+        self._vertices = []
+        self._indices  = []
+        self._mesh = None
+        self._uvs  = (0.0,0.0,1.0,0.0,1.0,1.0,0.0,1.0)
+        GObject.__init__(self,**keywords)
+        self._reset()
+        self._defined = True
+
+
+    # PUBLIC METHODS
+    def set_images(self,images):
+        """
+        Makes the sprites of this batch the bounding boxes of the given images.
+
+        Only the position and size of each image are used.  Its own image, color and
+        angle are ignored.
+
+        :param images: The images to copy, in drawing order
+        :type images:  ``list`` of :class:`GObject`
+        """
+        self._set_rects([(image.x,image.y,image.width,image.height) for image in images])
+
+    def set_centers(self,xs,ys):
+        """
+        Makes the sprites of this batch rectangles of size `width` x `height` with the
+        given centers.
+
+        :param xs: The x coordinates of the sprite centers, in drawing order
+        :type xs:  ``list`` of ``int`` or ``float``
+
+        :param ys: The y coordinates of the sprite centers, in the same order
+        :type ys:  ``list`` of ``int`` or ``float``, as long as ``xs``
+        """
+        assert len(xs) == len(ys), 'there are %d x coordinates but %d y coordinates' % (len(xs),len(ys))
+        w = self.width
+        h = self.height
+        self._set_rects([(xs[pos],ys[pos],w,h) for pos in range(len(xs))])
+
+
+    # HIDDEN METHODS
+    def _set_rects(self,rects):
+        """
+        Rebuilds the mesh from a list of rectangles (x, y, width, height), each given
+        by its center and size.
+
+        Nothing is changed if the sprites did not move, so that Kivy does not redraw
+        the window for nothing.
+
+        :param rects: The rectangles, in drawing order
+        :type rects:  ``list`` of 4-element tuples of numbers
+        """
+        self._rects = rects
+        uvs = self._uvs
+        vertices = []
+        for (x,y,w,h) in rects:
+            l = x-w/2.0
+            r = x+w/2.0
+            b = y-h/2.0
+            t = y+h/2.0
+            vertices.extend((l, b, uvs[0], uvs[1],
+                             r, b, uvs[2], uvs[3],
+                             r, t, uvs[4], uvs[5],
+                             l, t, uvs[6], uvs[7]))
+        if vertices == self._vertices:
+            return
+        self._vertices = vertices
+
+        count = len(rects)
+        while len(self._indices) < 6*count:
+            n = len(self._indices)//6*4
+            self._indices.extend((n, n+1, n+2, n, n+2, n+3))
+        if count != self._count:
+            self._count = count
+            self._mesh.indices = self._indices[:6*count]
+        self._mesh.vertices = vertices
+
+    def _set_frame(self):
+        """
+        Moves the texture coordinates of every sprite to the current frame.
+        """
+        if self._frames:
+            self._uvs = tuple(self._frames[self._frame].tex_coords)
+            self._set_rects(self._rects)
+
+    def _reset(self):
+        """
+        Resets the drawing cache.
+        """
+        GObject._reset(self)
+        texture = None
+        self._frames = None
+        if not self._source is None:
+            self._frames = GSprite.load_frames(self._source,self._format)
+            texture = self._frames[self._frame] if self._frames else None
+        if texture:
+            self._uvs = tuple(texture.tex_coords)
+
+        self._mesh = Mesh(mode='triangles',texture=texture)
+        self._mesh.vertices = self._vertices
+        self._mesh.indices = self._indices[:6*self._count]
+        if not self._fillcolor is None:
+            self._cache.add(self._fillcolor)
+        else:
+            self._cache.add(Color(1,1,1))
+        self._cache.add(self._mesh)
+        self._cache.add(PopMatrix())
@@ -0,0 +1,245 @@
+"""
+A module to support adapting the frame rate of a game to the machine it runs on.
+
+A game that cannot finish its frames within the frame budget does not run at a lower
+rate; it stutters, finishing some frames on time and missing others.  A steady lower
+rate looks better.  A :class:`GGovernor` watches how much time each frame costs, and
+how late the frames arrive, and picks the `fps` of :class:`GameApp` within configured
+bounds.
+
+# John O'Donnel (jro79) and Anthony Nguyen (an523)
+# 4/27/2019
+"""
+
+
+# #mark -
+class GGovernor(object):
+    """
+    A class to lower or raise the frame rate of a game with its load.
+
+    The governor keeps a model of what a second of the game costs, smoothed over many
+    frames.  The cost has two parts:
+
+    * The updates of a game with a fixed step (see :attr:`GameApp.step`).  The same
+      number of updates run every second at any frame rate, so this part is measured
+      in seconds per second and does not change with the rate.
+    * The drawing of a frame, which is paid once per frame.  This is the time that
+      :class:`GameApp` spends clearing, drawing and committing the view, but Kivy
+      renders and swaps the frame after that, where it cannot be timed.  So the
+      governor also smooths the interval between frames.  When the frames arrive late
+      (the smoothed interval is more than `LATE` times the frame budget), each frame
+      must cost the whole interval, and the drawing is taken to cost the rest of it.
+
+    The load is the predicted fraction of each second that the game is busy at the
+    current rate.  The rate only changes when the load leaves a band:
+
+    * Above `LOWER`, the rate drops to the highest rate that the model predicts has a
+      load of `LOWER`.  If the updates alone are over budget, no rate helps, and the
+      rate drops to `low` so that the drawing at least takes as little as it can.
+    * Below `RAISE`, the rate goes up by `STEP` frames per second.
+
+    The new rate is always a multiple of `STEP` between `low` and `high`.  After every
+    change the governor waits `HOLD` frames before it changes the rate again, so that
+    the rate settles instead of oscillating.  A rate that made the frames late is not
+    tried again for `PROBE` frames, as the model cannot see the rendering time once
+    the frames are on time.
+
+    To use a governor, assign it to the attribute `governor` of :class:`GameApp`.  The
+    function `callback`, if any, is called with the new rate every time it changes.
+    """
+    # The predicted load above which the rate drops
+    LOWER = 0.85
+
+    # The predicted load below which the rate goes up
+    RAISE = 0.5
+
+    # The weight of each new frame in the smoothed costs
+    SMOOTHING = 0.05
+
+    # The number of frames to wait after a change
+    HOLD = 60
+
+    # The number of frames before a rate that made the frames late is tried again
+    PROBE = 600
+
+    # The smoothed interval, as a multiple of the frame budget, above which frames are late
+    LATE = 1.25
+
+    # The most frame budgets that one frame counts as, so that a single hitch (such as
+    # loading a file) does not change the rate
+    SPIKE = 2.0
+
+    # The granularity of the rate
+    STEP = 5
+
+
+    # MUTABLE PROPERTIES
+    @property
+    def low(self):
+        """
+        The lowest frame rate allowed.
+
+        **invariant**. Value must be an int or float > 0 and <= `high`.
+        """
+        return self._low
+
+    @low.setter
+    def low(self,value):
+        assert type(value) in [int,float], '%s is not a number' % repr(value)
+        assert value > 0, '%s is not positive' % repr(value)
+        assert self._high is None or value <= self._high, '%s is above high' % repr(value)
+        self._low = value
+
+    @property
+    def high(self):
+        """
+        The highest frame rate allowed.
+
+        **invariant**. Value must be an int or float >= `low`.
+        """
+        return self._high
+
+    @high.setter
+    def high(self,value):
+        assert type(value) in [int,float], '%s is not a number' % repr(value)
+        assert value >= self._low, '%s is below low' % repr(value)
+        self._high = value
+
+    @property
+    def callback(self):
+        """
+        The function to call with the new rate whenever it changes.
+
+        **invariant**. Value must be None or a callable taking one number.
+        """
+        return self._callback
+
+    @callback.setter
+    def callback(self,value):
+        assert value is None or callable(value), '%s is not callable' % repr(value)
+        self._callback = value
+
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def load(self):
+        """
+        The predicted fraction of each second that the game is busy at the current rate.
+
+        **Immutable**: This value cannot be altered.
+
+        **invariant**. Value is a float >= 0.
+        """
+        return self._update+self._draw*self._fps
+
+
+    # BUILT-IN METHODS
+    def __init__(self,low=30,high=60,callback=None):
+        """
+        Creates a new governor with the given bounds.
+
+        :param low: The lowest frame rate allowed
+        :type low:  ``int`` or ``float`` > 0
+
+        :param high: The highest frame rate allowed
+        :type high:  ``int`` or ``float`` >= low
+
+        :param callback: The function to call with the new rate when it changes
+        :type callback:  ``None`` or a callable taking one number
+        """
+        self._high = None
+        self.low = low
+        self.high = high
+        self.callback = callback
+        self.reset()
+
+
+    # PUBLIC METHODS
+    def reset(self):
+        """
+        Forgets the costs of the frames so far.
+        """
+        self._update = 0.0
+        self._draw = 0.0
+        self._late = 1.0
+        self._fps = self._high
+        self._frames = 0
+        self._hold = self.HOLD
+        self._ceiling = None
+        self._probe = 0
+
+    def observe(self,busy,fps,interval=None,update=0.0):
+        """
+        Returns the frame rate to use after a frame with the given times.
+
+        The result is fps itself unless the rate must change.  This method is called
+        for you by :class:`GameApp` at the end of every frame that is drawn.
+
+        :param busy: The time in seconds spent in the frame, including the updates
+        :type busy:  ``int`` or ``float`` >= 0
+
+        :param fps: The current frame rate
+        :type fps:  ``int`` or ``float`` > 0
+
+        :param interval: The time in seconds since the frame before, or None if unknown
+        :type interval:  ``None`` or ``int`` or ``float`` >= 0
+
+        :param update: The part of busy spent on updates at a fixed step
+        :type update:  ``int`` or ``float`` in 0..busy
+        """
+        share = min(update*fps,self.SPIKE)
+        draw = min(busy-update,self.SPIKE/fps)
+        self._fps = fps
+        if self._frames == 0:
+            self._update = share
+            self._draw = draw
+        else:
+            self._update += self.SMOOTHING*(share-self._update)
+            self._draw += self.SMOOTHING*(draw-self._draw)
+        self._frames += 1
+        if not interval is None:
+            self._late += self.SMOOTHING*(min(interval*fps,self.SPIKE)-self._late)
+            if self._late > self.LATE:
+                # Each frame takes the whole interval, so the drawing costs the rest
+                self._draw = max(self._draw,(self._late-self._update)/fps)
+                if self._ceiling is None or fps < self._ceiling:
+                    self._ceiling = fps
+                self._probe = self.PROBE
+        if self._probe > 0:
+            self._probe -= 1
+            if self._probe == 0:
+                self._ceiling = None
+        if self._hold > 0:
+            self._hold -= 1
+            return self._clamp(fps)
+
+        result = fps
+        load = self.load
+        if load > self.LOWER:
+            if self._draw > 0 and self._update < self.LOWER:
+                result = self.STEP*int((self.LOWER-self._update)/self._draw/self.STEP)
+            else:
+                result = self._low
+            result = min(result,fps-self.STEP)
+        elif load < self.RAISE:
+            result = fps+self.STEP
+            if not self._ceiling is None and result >= self._ceiling:
+                result = fps
+        result = self._clamp(result)
+        if result != fps:
+            # The intervals at the old rate say nothing about the new one
+            self._fps = result
+            self._late = 1.0
+            self._hold = self.HOLD
+        return result
+
+
+    # HIDDEN METHODS
+    def _clamp(self,fps):
+        """
+        Returns the frame rate moved into the bounds `low` to `high`.
+
+        :param fps: The frame rate
+        :type fps:  ``int`` or ``float``
+        """
+        return max(self._low,min(self._high,fps))
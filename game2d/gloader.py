@@ -0,0 +1,224 @@
+"""
+A module to support loading the assets of a game in the background.
+
+The first time an image is used, :meth:`GameApp.load_texture` decodes the file in the
+middle of a frame, and a large image stalls the game for a visible moment.  A
+:class:`GPreloader` decodes the images in a worker thread instead, while the game
+shows a loading screen.  Only the work that Kivy must do on the main thread (uploading
+each decoded image to the graphics card, rendering text and loading sounds) is left to
+the frames of the game, and it is spread over them.
+
+# John O'Donnel (jro79) and Anthony Nguyen (an523)
+# 4/27/2019
+"""
+from .headless import ENABLED as HEADLESS
+import os
+import time
+import threading
+import queue
+
+
+# #mark -
+class GPreloader(object):
+    """
+    A class to load images, glyph atlases and sounds before the game needs them.
+
+    Give the preloader the files to load, and call :meth:`start` to begin decoding the
+    images in a worker thread.  Then call :meth:`update` once every frame
+    (typically while the game is in a loading state) until `done` is True.  Each call
+    finishes as many of the decoded files as fit in `BUDGET` seconds:
+
+    * An image is uploaded to a texture, and added to ``GameApp.TEXTURE_CACHE``, so that
+      :meth:`GameApp.load_texture` returns it at once.  Images that were packed into the
+      atlas (see :meth:`GameApp.load_atlas`) are skipped, as they are loaded already.
+    * A font and size pair is made into a :class:`GlyphAtlas`.  Kivy renders text on
+      the main thread, so the glyphs are rasterized there, one atlas per call.
+    * A sound is loaded, and kept until a :class:`Sound` is made from that file, which
+      then uses it instead of loading the file again.  List a file several times to
+      preload several sounds from it.  The audio providers of Kivy are not safe to use
+      from another thread, so the sounds are loaded on the main thread, one per call.
+
+    The attribute `progress` is the fraction of the files that are finished, for a
+    progress bar.  If a file cannot be loaded, :meth:`update` raises an ``IOError``.
+
+    When game2d is running headless, nothing is decoded, but the files are still
+    finished over several calls to :meth:`update`, as the fonts and sounds take one
+    call each.
+    """
+    # The most time in seconds that update spends finishing files (it finishes at least one)
+    BUDGET = 0.004
+
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def progress(self):
+        """
+        The fraction of the files that are finished.
+
+        **Immutable**: This value cannot be altered.
+
+        **invariant**. Value is a float in 0..1.
+        """
+        if self._total == 0:
+            return 1.0
+        return self._finished/float(self._total)
+
+    @property
+    def done(self):
+        """
+        Whether every file is finished.
+
+        **Immutable**: This value cannot be altered.
+
+        **invariant**. Value is a bool.
+        """
+        return self._finished == self._total
+
+
+    # BUILT-IN METHODS
+    def __init__(self,images=(),fonts=(),sounds=()):
+        """
+        Creates a new preloader for the given files.
+
+        The preloader does nothing until :meth:`start` is called.
+
+        :param images: The image files, in the **Images** folder
+        :type images:  ``list`` of ``str``
+
+        :param fonts: The fonts of the glyph atlases, as (font name, font size) pairs
+        :type fonts:  ``list`` of 2-element ``tuple``
+
+        :param sounds: The sound files, in the **Sounds** folder
+        :type sounds:  ``list`` of ``str``
+        """
+        from .app import GameApp
+        for name in images:
+            assert GameApp.is_image(name), '%s is not an image file' % repr(name)
+        for name in sounds:
+            assert GameApp.is_sound(name), '%s is not a sound file' % repr(name)
+        self._images = list(images)
+        self._others = [('font',pair) for pair in fonts]+[('sound',name) for name in sounds]
+        self._total = len(self._images)+len(self._others)
+        self._finished = 0
+        self._queue = queue.Queue()
+        self._started = False
+
+
+    # PUBLIC METHODS
+    def start(self):
+        """
+        Starts decoding the images in a worker thread.
+
+        This method does nothing if the preloader was already started.  When game2d
+        is running headless, there is nothing to decode and no thread is started.
+        """
+        if self._started:
+            return
+        self._started = True
+        if HEADLESS:
+            self._decode()
+            return
+        thread = threading.Thread(target=self._decode,name='GPreloader')
+        thread.daemon = True
+        thread.start()
+
+    def update(self):
+        """
+        Finishes the files that are ready, for at most `BUDGET` seconds.
+
+        This method must be called on the main thread, after :meth:`start`.
+        """
+        assert self._started, 'the preloader was not started'
+        deadline = time.perf_counter()+self.BUDGET
+        while not self.done:
+            try:
+                (kind, name, data) = self._queue.get_nowait()
+            except queue.Empty:
+                if not self._others:
+                    return
+                (kind, name) = self._others.pop(0)
+                data = None
+            self._finish(kind,name,data)
+            self._finished += 1
+            if kind != 'image' or time.perf_counter() > deadline:
+                return
+
+    def finish(self):
+        """
+        Finishes every file, waiting for the worker thread as needed.
+
+        Use this method instead of :meth:`update` when the number of frames spent
+        loading must not depend on the machine, such as when the input is recorded
+        or replayed.  This method must be called on the main thread, after :meth:`start`.
+        """
+        assert self._started, 'the preloader was not started'
+        while not self.done:
+            if self._queue.empty() and self._others:
+                (kind, name) = self._others.pop(0)
+                data = None
+            else:
+                (kind, name, data) = self._queue.get()
+            self._finish(kind,name,data)
+            self._finished += 1
+
+
+    # HIDDEN METHODS
+    def _decode(self):
+        """
+        Decodes every image, putting the results on the queue.
+
+        This method runs in the worker thread.  It never touches the graphics card.
+        """
+        from .app import GameApp
+        for name in self._images:
+            data = None
+            if not HEADLESS and not self._in_atlas(name):
+                try:
+                    from kivy.core.image import ImageLoader
+                    data = ImageLoader.load(os.path.join(GameApp.images,name),keep_data=True)
+                except Exception as e:
+                    data = e
+            self._queue.put(('image',name,data))
+
+    def _finish(self,kind,name,data):
+        """
+        Finishes one file on the main thread.
+
+        :param kind: The kind of file
+        :type kind:  one of ``'image'``, ``'font'`` or ``'sound'``
+
+        :param name: The file name (or font pair)
+        :type name:  ``str`` or ``tuple``
+
+        :param data: The decoded image, an exception if it failed, or None
+        :type data:  any value
+        """
+        from .app import GameApp
+        from .gtext import GlyphAtlas
+        from .sound import Sound, SoundLoader
+        if isinstance(data,Exception):
+            raise IOError('Module game2d cannot read the file %s' % repr(name)) from data
+        if kind == 'image' and not data is None:
+            from kivy.core.image import Image
+            GameApp.TEXTURE_CACHE[name] = Image(data).texture
+        elif kind == 'font':
+            GlyphAtlas.load(name[0],name[1])
+        elif kind == 'sound':
+            try:
+                sound = SoundLoader.load(name)
+            except Exception as e:
+                raise IOError('Module game2d cannot read the file %s' % repr(name)) from e
+            if sound is None:
+                raise IOError('Module game2d cannot read the file %s' % repr(name))
+            Sound.PRELOADED.setdefault(name,[]).append(sound)
+
+    def _in_atlas(self,name):
+        """
+        Returns True if the image was packed into the atlas of the game.
+
+        :param name: The image file name
+        :type name:  ``str``
+        """
+        from .app import GameApp
+        key = os.path.splitext(name)[0]
+        return name in GameApp.TEXTURE_CACHE or (GameApp.ATLAS and key in GameApp.ATLAS.textures)
@@ -4,13 +4,41 @@ The base classes for 2D game support.
 This module provides the base drawable class, as well as simple scene graph support.
 These classes will not work unless you adhere to proper subclassing practices.
 
+Every attribute of these classes is checked when it is set.  That is what you want while
+writing a game, but the checks cost time on every assignment.  Running Python with the
+``-O`` flag (or with the environment variable ``PYTHONOPTIMIZE`` set) turns on fast mode.
+Python compiles out every ``assert`` in that mode, and with them all of the validation.
+Fast mode also stores the hidden attributes of the drawables in ``__slots__``, and
+stores numbers without converting them to floats.  A game that is correct in the normal
+mode behaves the same in fast mode, except that subclasses of the drawables should not
+add attributes with the same names as hidden attributes of game2d.
+
+Fast mode only removes the cost of checking a value.  It does not speed up the work that
+a setter must do anyway: changing the `width`, `height` or `linecolor` of a drawable
+rebuilds its drawing instructions, and that costs the same in both modes.  Moving,
+rotating and scaling a drawable (or changing one fill color to another, which updates
+the existing color in place) never rebuild them, and are the setters to use in a hot
+loop.
 
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
-from kivy.graphics import *
-from kivy.graphics.instructions import *
+from .headless import ENABLED as HEADLESS
+if HEADLESS:
+    from .headless import *
+else:
+    from kivy.graphics import *
+    from kivy.graphics.instructions import *
 from introcs.geom import Point2, Matrix
+import introcs
+import math
+import numpy as np
+
+#: Whether game2d is running in fast mode, with no validation
+FAST = not __debug__
+
+# The colors named so far, as 4-element tuples (see to_rgba)
+_NAMED_COLORS = {}
 
 def is_color(c):
     """
@@ -26,17 +54,44 @@ def is_color(c):
     :param c: The value to test
     :type c:  any
     """
-    import introcs
     if type(c) in [introcs.RGB, introcs.HSV]:
         return True
 
     if type(c) in [tuple, list] and 3 <= len(c) <= 4:
-        from functools import reduce
-        return reduce(lambda x, y: x and y, map(lambda z: type(z) in [int, float] and 0 <= z <= 1, c))
+        return all(type(z) in [int, float] and 0 <= z <= 1 for z in c)
 
     return type(c) == str and (introcs.is_tkcolor(c) or introcs.is_webcolor(c))
 
 
+def to_rgba(c):
+    """
+    Converts a color to its 4-element (r, g, b, a) representation.
+
+    A color name is only looked up the first time it is seen; after that, the result is
+    remembered.
+
+    :return: The color as 4 floats between 0 and 1, or None if c is None
+    :rtype:  ``tuple``, ``list`` or ``None``
+
+    :param c: The color to convert
+    :type c:  ``None`` or any value for which :func:`is_color` is True
+    """
+    if type(c) == str:
+        rgba = _NAMED_COLORS.get(c)
+        if rgba is None:
+            if c[0] == '#':
+                rgba = tuple(introcs.RGB.CreateWebColor(c).glColor())
+            else:
+                rgba = tuple(introcs.RGB.CreateName(c).glColor())
+            _NAMED_COLORS[c] = rgba
+        return rgba
+    elif type(c) in [introcs.RGB, introcs.HSV]:
+        return c.glColor()
+    elif type(c) in [tuple, list] and len(c) == 3:
+        return list(c)+[1.0]
+    return c
+
+
 def is_num_tuple(t,size):
     """
     Checks whether a value is a sequence of numbers.
@@ -53,8 +108,7 @@ def is_num_tuple(t,size):
     :type size:  ``int`` >= 0
     """
     try:
-        from functools import reduce
-        return len(t) == size and reduce(lambda x, y: x and y, map(lambda z: type(z) in [int, float], t))
+        return len(t) == size and all(type(z) in [int, float] for z in t)
     except:
         return False
 
@@ -70,8 +124,7 @@ def is_gobject_list(g):
     :type g:  any
     """
     try:
-        from functools import reduce
-        return len(g) >= 0 and reduce(lambda x, y: x and y, map(lambda z: isinstance(z,GObject), g))
+        return len(g) >= 0 and all(isinstance(z,GObject) for z in g)
     except:
         return False
 
@@ -90,6 +143,12 @@ class GObject(object):
     :class:`GTriangle`, :class:`GPolygon`, or :class:`GPath`.
     """
 
+    # FAST MODE SLOTS
+    if FAST:
+        __slots__ = ('_defined','_trans','_rotate','_scale','_width','_height',
+                     '_fillcolor','_linecolor','_name','_cache','_matrix','_invrse',
+                     '_mtrue','__weakref__')
+
     # MUTABLE PROPERTIES
     @property
     def x(self):
@@ -103,7 +162,7 @@ class GObject(object):
     @x.setter
     def x(self,value):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
-        self._trans.x = float(value)
+        self._trans.x = value if FAST else float(value)
         self._mtrue = False
 
     @property
@@ -118,7 +177,7 @@ class GObject(object):
     @y.setter
     def y(self,value):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
-        self._trans.y = float(value)
+        self._trans.y = value if FAST else float(value)
         self._mtrue = False
 
     @property
@@ -126,7 +185,8 @@ class GObject(object):
         """
         The horizontal width of this shape.
 
-        Positive values go to the right.
+        Positive values go to the right.  Changing this value rebuilds the drawing
+        instructions of the shape, which is slow even in fast mode.
 
         **invariant**: Value must be an ``int`` or ``float`` > 0
         """
@@ -136,7 +196,7 @@ class GObject(object):
     def width(self,value):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
         assert value > 0, '%s is not positive' % repr(value)
-        self._width = float(value)
+        self._width = value if FAST else float(value)
         if self._defined:
             self._reset()
 
@@ -145,7 +205,8 @@ class GObject(object):
         """
         The vertical height of this shape.
 
-        Positive values go up.
+        Positive values go up.  Changing this value rebuilds the drawing instructions
+        of the shape, which is slow even in fast mode.
 
         **invariant**: Value must be an ``int`` or ``float`` > 0
         """
@@ -155,7 +216,7 @@ class GObject(object):
     def height(self,value):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
         assert value > 0, '%s is not positive' % repr(value)
-        self._height = float(value)
+        self._height = value if FAST else float(value)
         if self._defined:
             self._reset()
 
@@ -203,7 +264,7 @@ class GObject(object):
     @angle.setter
     def angle(self,value):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
-        diff = np.allclose([self._rotate.angle],[value])
+        diff = math.isclose(self._rotate.angle,value,rel_tol=1e-05,abs_tol=1e-08)
         self._rotate.angle = float(value)
         if not diff:
             self._mtrue = False
@@ -229,18 +290,8 @@ class GObject(object):
 
     @linecolor.setter
     def linecolor(self,value):
-        import introcs
         assert value is None or is_color(value), '%s is not a valid color' % repr(value)
-        if type(value) in [tuple, list] and len(value) == 3:
-            value = list(value)+[1.0]
-        elif type(value) in [introcs.RGB, introcs.HSV]:
-            value = value.glColor()
-        elif type(value) == str:
-            if value[0] == '#':
-                value = introcs.RGB.CreateWebColor(value).glColor()
-            else:
-                value = introcs.RGB.CreateName(value).glColor()
-
+        value = to_rgba(value)
         self._linecolor = None if value is None else Color(value[0],value[1],value[2],value[3])
         if self._defined:
             self._reset()
@@ -267,18 +318,12 @@ class GObject(object):
 
     @fillcolor.setter
     def fillcolor(self,value):
-        import introcs
         assert value is None or is_color(value), '%s is not a valid color' % repr(value)
-        if type(value) in [tuple, list] and len(value) == 3:
-            value = list(value)+[1.0]
-        elif type(value) in [introcs.RGB, introcs.HSV]:
-            value = value.glColor()
-        elif type(value) == str:
-            if value[0] == '#':
-                value = introcs.RGB.CreateWebColor(value).glColor()
-            else:
-                value = introcs.RGB.CreateName(value).glColor()
-
+        value = to_rgba(value)
+        if self._defined and not value is None and not self._fillcolor is None:
+            # The color is already in the drawing instructions, so change it there
+            self._fillcolor.rgba = list(value)
+            return
         self._fillcolor = None if value is None else Color(value[0],value[1],value[2],value[3])
         if self._defined:
             self._reset()
@@ -320,11 +365,7 @@ class GObject(object):
         if self._rotate.angle == 0.0:
             return self.x-self.width/2.0
 
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[0]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[0]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[0]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[0]
-        return min(p0,p1,p2,p3)
+        return self.bounds[0]
 
     @left.setter
     def left(self,value):
@@ -350,11 +391,7 @@ class GObject(object):
         if self._rotate.angle == 0.0:
             return self.x+self.width/2.0
 
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[0]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[0]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[0]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[0]
-        return max(p0,p1,p2,p3)
+        return self.bounds[2]
 
     @right.setter
     def right(self,value):
@@ -380,11 +417,7 @@ class GObject(object):
         if self._rotate.angle == 0.0:
             return self.y+self.height/2.0
 
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[1]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[1]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[1]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[1]
-        return max(p0,p1,p2,p3)
+        return self.bounds[3]
 
     @top.setter
     def top(self,value):
@@ -411,11 +444,7 @@ class GObject(object):
         if self._rotate.angle == 0.0:
             return self.y-self.height/2.0
 
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[1]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[1]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[1]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[1]
-        return min(p0,p1,p2,p3)
+        return self.bounds[1]
 
 
     @bottom.setter
@@ -426,6 +455,28 @@ class GObject(object):
 
 
     # IMMUTABLE PROPERTIES
+    @property
+    def bounds(self):
+        """
+        The axis-aligned bounding box of this shape.
+
+        The value is the tuple (left, bottom, right, top).  If the shape is rotated, it
+        is the smallest box (with horizontal and vertical sides) around the rotated shape.
+
+        **Warning**: Accessing this value on a rotated object may slow down your framerate.
+
+        **invariant**: Value is a 4-element tuple of floats
+        """
+        w = self.width/2.0
+        h = self.height/2.0
+        if self._rotate.angle == 0.0:
+            return (self.x-w, self.y-h, self.x+w, self.y+h)
+
+        m = self.matrix._data
+        xs = [float(m[0,0]*cx+m[0,1]*cy+m[0,3]) for (cx,cy) in ((-w,-h),(w,-h),(w,h),(-w,h))]
+        ys = [float(m[1,0]*cx+m[1,1]*cy+m[1,3]) for (cx,cy) in ((-w,-h),(w,-h),(w,h),(-w,h))]
+        return (min(xs), min(ys), max(xs), max(ys))
+
     @property
     def matrix(self):
         """
@@ -455,6 +506,54 @@ class GObject(object):
         return self._invrse
 
 
+    # CLASS METHODS
+    @classmethod
+    def overlap_pairs(cls,first,second=None):
+        """
+        Returns the index pairs of the overlapping boxes in two groups
+
+        Each group is either a sequence of :class:`GObject`, whose boxes are their 
+        `bounds`, or an n x 4 array of boxes given as (left, bottom, right, top) rows. 
+        Every box of the first group is compared to every box of the second group in one
+        vectorized operation, and the result has a row (i, j) for each box i of the first 
+        group that overlaps box j of the second, in order.  Boxes that only touch do not
+        overlap, just as with :meth:`intersects`.
+
+        If there is no second group, the boxes of the first group are compared to each 
+        other, and only the pairs with i < j are returned.
+
+        :param first: the first group of boxes
+        :type first:  ``list`` of :class:`GObject`, or an n x 4 array of numbers
+
+        :param second: the second group of boxes, or None
+        :type second:  ``list`` of :class:`GObject`, an m x 4 array of numbers, or ``None``
+
+        :return: The index pairs of the overlapping boxes
+        :rtype:  k x 2 NumPy array of ``int``
+        """
+        a = cls._box_array(first)
+        b = a if second is None else cls._box_array(second)
+        # Rows (left, bottom, right, top), broadcast to compare every i with every j
+        a = a.T[:,:,np.newaxis]
+        b = b.T[:,np.newaxis,:]
+        hit = (a[:2] < b[2:]).all(axis=0) & (b[:2] < a[2:]).all(axis=0)
+        if second is None:
+            hit = np.triu(hit,1)
+        return np.argwhere(hit)
+
+    @classmethod
+    def _box_array(cls,group):
+        """
+        Returns the boxes of a group (see :meth:`overlap_pairs`) as an n x 4 array
+
+        :param group: the group of boxes
+        :type group:  ``list`` of :class:`GObject`, or an n x 4 array of numbers
+        """
+        if len(group) > 0 and isinstance(group[0],GObject):
+            group = [shape.bounds for shape in group]
+        return np.asarray(group,dtype=float).reshape(-1,4)
+
+
     # BUILT-IN METHODS
     def __init__(self,**keywords):
         """
@@ -559,9 +658,47 @@ class GObject(object):
         if self._rotate.angle == 0.0:
             return abs(point[0]-self.x) < self.width/2.0 and abs(point[1]-self.y) < self.height/2.0
 
-        p = self.matrix.inverse()._transform(point[0],point[1])
+        p = list(self.inverse._transform(point[0],point[1]))
         return abs(p[0]) < self.width/2.0 and abs(p[1]) < self.height/2.0
 
+    def contains_points(self,points):
+        """
+        Checks which of many points this shape contains
+
+        This method is the same as calling :meth:`contains` on each point, but it tests
+        all of the points at once with NumPy.  The points are not checked one by one,
+        and the inverse matrix of a rotated shape is only computed once for all of them
+        (and reused until the shape moves).  To test whether shapes overlap, use
+        :meth:`intersects` or :meth:`overlap_pairs` instead.
+
+        :param points: the points to check
+        :type points:  a sequence of pairs of numbers, or an n x 2 NumPy array
+
+        :return: For each point, True if the shape contains it
+        :rtype:  NumPy array of ``bool``
+        """
+        (x, y) = self._local_points(points)
+        return (abs(x) < self.width/2.0) & (abs(y) < self.height/2.0)
+
+    def intersects(self,other):
+        """
+        Checks whether the bounding box of this shape overlaps that of another
+
+        The boxes are the `bounds` of the two shapes, so this is exact for unrotated
+        rectangles and images, and conservative for everything else.  Boxes that only
+        touch do not overlap.  To check many shapes at once, use :meth:`overlap_pairs`.
+
+        :param other: the shape to check
+        :type other: :class:`GObject`
+
+        :return: True if the bounding boxes of the two shapes overlap
+        :rtype:  ``bool``
+        """
+        assert isinstance(other,GObject), '%s is not a GObject' % repr(other)
+        (left, bottom, right, top) = self.bounds
+        (oleft, obottom, oright, otop) = other.bounds
+        return left < oright and oleft < right and bottom < otop and obottom < top
+
     def transform(self,point):
         """
         Transforms the point to the local coordinate system
@@ -599,6 +736,24 @@ class GObject(object):
             raise IOError('Cannot draw %s since it was not initialized properly' % repr(self))
 
     # HIDDEN METHODS
+    def _local_points(self,points):
+        """
+        Returns the pair (x, y) of NumPy arrays of the points relative to this shape
+
+        The points are relative to the center of an unrotated shape, and are in the
+        local coordinate system of a rotated one (see :meth:`contains`).
+
+        :param points: the points to transform
+        :type points:  a sequence of pairs of numbers, or an n x 2 NumPy array
+        """
+        points = np.asarray(points,dtype=float).reshape(-1,2)
+        if self._rotate.angle == 0.0:
+            return (points[:,0]-self.x, points[:,1]-self.y)
+
+        m = self.inverse._data
+        return (m[0,0]*points[:,0]+m[0,1]*points[:,1]+m[0,3],
+                m[1,0]*points[:,0]+m[1,1]*points[:,1]+m[1,3])
+
     def _reset(self):
         """
         Resets the drawing cache.
@@ -613,14 +768,15 @@ class GObject(object):
         """
         Builds the transform matrices after a settings change.
         """
+        # Matrix methods apply their transform after the ones already in the matrix
         self._matrix = Matrix()
-        self._matrix.translate(self._trans.x,self._trans.y)
-        self._matrix.rotate(self._rotate.angle)
         self._matrix.scale(self._scale.x,self._scale.y)
+        self._matrix.rotate(self._rotate.angle)
+        self._matrix.translate(self._trans.x,self._trans.y)
         self._invrse = Matrix()
-        self._invrse.scale(1.0/self._scale.x,1.0/self._scale.y)
-        self._invrse.rotate(-self._rotate.angle)
         self._invrse.translate(-self._trans.x,-self._trans.y)
+        self._invrse.rotate(-self._rotate.angle)
+        self._invrse.scale(1.0/self._scale.x,1.0/self._scale.y)
         self._mtrue = True
 
 
@@ -643,6 +799,10 @@ class GScene(GObject):
     All objects stored in a ``GScene`` are drawn as if the point (x,y) is the origin.
     """
 
+    # FAST MODE SLOTS
+    if FAST:
+        __slots__ = ('_children',)
+
     # MUTABLE PROPERTIES
     @property
     def children(self):
@@ -8,9 +8,13 @@ Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
 # Lower-level kivy modules to support animation
-from kivy.graphics import *
-from kivy.graphics.instructions import *
-from .gobject import GObject
+from .headless import ENABLED as HEADLESS
+if HEADLESS:
+    from .headless import *
+else:
+    from kivy.graphics import *
+    from kivy.graphics.instructions import *
+from .gobject import GObject, FAST
 
 
 def same_side(p1, p2, a, b):
@@ -104,6 +108,10 @@ class GPath(GObject):
     in the path, shifting the path accordingly.
     """
     
+    # FAST MODE SLOTS
+    if FAST:
+        __slots__ = ('_points','_linewidth')
+    
     # MUTABLE PROPERTIES
     @property
     def points(self):
@@ -213,6 +221,23 @@ class GPath(GObject):
         """
         return False
     
+    def contains_points(self,points):
+        """
+        Checks which of many points this shape contains
+        
+        Unlike the other shapes, paths are not tested all at once.  This method calls 
+        :meth:`contains` on each point, so it is no faster than doing that yourself.
+        
+        :param points: the points to check
+        :type points:  a sequence of pairs of numbers, or an n x 2 NumPy array
+        
+        :return: For each point, True if the shape contains it
+        :rtype:  NumPy array of ``bool``
+        """
+        import numpy as np
+        points = np.asarray(points,dtype=float).reshape(-1,2)
+        return np.array([self.contains(tuple(point)) for point in points.tolist()],dtype=bool)
+    
     def near(self,point):
         """
         Checks whether this path is near the given point
@@ -281,6 +306,10 @@ class GTriangle(GPath):
     `height` are immutable, and are computed directly from the points
     """
     
+    # FAST MODE SLOTS
+    if FAST:
+        __slots__ = ()
+    
     # MUTABLE PROPERTIES
     @property
     def points(self):
@@ -398,6 +427,10 @@ class GPolygon(GPath):
     are computed directly from the points
     """
     
+    # FAST MODE SLOTS
+    if FAST:
+        __slots__ = ('_source','_source_width','_source_height','_verts','_mesh')
+    
     # MUTABLE PROPERTIES
     @property
     def points(self):
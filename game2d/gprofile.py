@@ -0,0 +1,385 @@
+"""
+A module to support timing the phases of every animation frame.
+
+A frame is split into phases (clearing the view, updating the game, drawing it, and any
+phases that the game times itself).  A :class:`GProfiler` times each phase with
+``time.perf_counter`` and keeps the times of the last few hundred frames in a ring
+buffer, so that it can report the current, median and 99th percentile time of each
+phase without an external profiler.  It can also show these numbers (and any object
+counts that the game reports) in an overlay on top of the game.
+
+# John O'Donnel (jro79) and Anthony Nguyen (an523)
+# 4/27/2019
+"""
+import time
+from .grectangle import GRectangle
+from .gtext import GText
+
+
+# #mark -
+class GProfiler(object):
+    """
+    A class to time the phases of the animation frames of a game.
+
+    Time a phase by wrapping it in a ``with`` statement::
+
+        with profiler.phase('collisions'):
+            self.bolt_collisions()
+
+    Phases may be nested (the overlay indents them) and may run several times in one
+    frame, in which case their times are added up.  The frame itself is started and
+    ended by :class:`GameApp`, which also times its own phases ``clear``, ``update``,
+    ``draw`` and ``commit``.  Idle frames (see :attr:`GameApp.idle`) are not recorded.
+
+    The profiler does nothing until it is `enabled`.  Disabled, a phase is a shared
+    context that does nothing, so the game can leave its ``with`` statements in place.
+    Enabled, the profiler also draws its overlay: one line for the whole frame, one
+    for each phase, and one for each count given to :meth:`set_count`.  The text of
+    the overlay only changes every `REFRESH` frames, so that it can be read.  The
+    overlay is only created the first time it is drawn, once the window exists.
+    """
+    # The number of frames between changes to the overlay text
+    REFRESH = 15
+
+    # The time of the whole frame in the ring buffer
+    FRAME = 'frame'
+
+    # The widths of the columns of the overlay
+    COLUMNS = (175,50,50,50)
+
+
+    # MUTABLE PROPERTIES
+    @property
+    def enabled(self):
+        """
+        Whether this profiler times the frames and shows its overlay.
+
+        Enabling the profiler throws away any times from before.
+
+        **invariant**. Value must be a bool.
+        """
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self,value):
+        assert type(value) == bool, '%s is not a bool' % repr(value)
+        if value and not self._enabled:
+            self.reset()
+        if not value:
+            self._start = None
+        self._enabled = value
+
+    @property
+    def left(self):
+        """
+        The left edge of the overlay.
+
+        **invariant**. Value must be an int or float.
+        """
+        return self._left
+
+    @left.setter
+    def left(self,value):
+        assert type(value) in [int,float], '%s is not a number' % repr(value)
+        self._left = value
+        self._lines = []
+
+    @property
+    def top(self):
+        """
+        The top edge of the overlay.
+
+        **invariant**. Value must be an int or float.
+        """
+        return self._top
+
+    @top.setter
+    def top(self,value):
+        assert type(value) in [int,float], '%s is not a number' % repr(value)
+        self._top = value
+        self._lines = []
+
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def size(self):
+        """
+        The number of frames kept in the ring buffer.
+
+        **Immutable**: This value cannot be altered after creation.
+
+        **invariant**. Value is an int > 0.
+        """
+        return self._size
+
+    @property
+    def frames(self):
+        """
+        The number of frames recorded since the profiler was enabled.
+
+        Only the last `size` of them are in the ring buffer.
+
+        **Immutable**: This value cannot be altered.
+
+        **invariant**. Value is an int >= 0.
+        """
+        return self._frames
+
+    @property
+    def phases(self):
+        """
+        The names of the phases timed so far, in the order they were first timed.
+
+        **Immutable**: This value cannot be altered.
+
+        **invariant**. Value is a list of str.
+        """
+        return list(self._order)
+
+
+    # BUILT-IN METHODS
+    def __init__(self,size=240,left=5,top=0,enabled=False):
+        """
+        Creates a new profiler.
+
+        :param size: The number of frames to keep in the ring buffer
+        :type size:  ``int`` > 0
+
+        :param left: The left edge of the overlay
+        :type left:  ``int`` or ``float``
+
+        :param top: The top edge of the overlay
+        :type top:  ``int`` or ``float``
+
+        :param enabled: Whether to start timing the frames at once
+        :type enabled:  ``bool``
+        """
+        assert type(size) == int and size > 0, '%s is not a positive int' % repr(size)
+        self._size = size
+        self._enabled = False
+        self._null = _NullPhase()
+        self._names  = []
+        self._starts = []
+        self._depth  = {}
+        self._counts = {}
+        self.left = left
+        self.top = top
+        self._back = None
+        self.reset()
+        self.enabled = enabled
+
+    def __enter__(self):
+        """
+        Starts timing the phase named by the last call to :meth:`phase`.
+        """
+        self._starts.append(time.perf_counter())
+        return self
+
+    def __exit__(self,type,value,traceback):
+        """
+        Stops timing the innermost phase, adding its time to the current frame.
+        """
+        elapsed = time.perf_counter()-self._starts.pop()
+        name = self._names.pop()
+        self._current[name] = self._current.get(name,0.0)+elapsed
+        return False
+
+
+    # PUBLIC METHODS
+    def reset(self):
+        """
+        Throws away the times of every frame.
+        """
+        self._rings = {}
+        self._order = []
+        self._frames = 0
+        self._start = None
+        self._current = {}
+
+    def phase(self,name):
+        """
+        Returns a context to time the phase with the given name in a ``with`` statement.
+
+        Phases are only timed between :meth:`begin_frame` and :meth:`end_frame`.
+
+        :param name: The name of the phase
+        :type name:  ``str``
+        """
+        if self._start is None:
+            return self._null
+        if not name in self._rings:
+            self._add_ring(name)
+            self._order.append(name)
+            self._depth[name] = len(self._names)
+        self._names.append(name)
+        return self
+
+    def set_count(self,name,value):
+        """
+        Sets a number for the overlay to show, such as the number of objects on screen.
+
+        :param name: The name of the number
+        :type name:  ``str``
+
+        :param value: The number to show
+        :type value:  ``int`` or ``float``
+        """
+        self._counts[name] = value
+
+    def begin_frame(self):
+        """
+        Starts timing a new frame, discarding any frame that was not ended.
+        """
+        if self._enabled:
+            if not self.FRAME in self._rings:
+                self._add_ring(self.FRAME)
+            self._start = time.perf_counter()
+            self._current = {}
+
+    def end_frame(self):
+        """
+        Stops timing the current frame and stores its times in the ring buffer.
+
+        Every phase gets a time for this frame (0 if it did not run).
+        """
+        if not self._enabled or self._start is None:
+            return
+        index = self._frames % self._size
+        self._rings[self.FRAME][index] = time.perf_counter()-self._start
+        for name in self._order:
+            self._rings[name][index] = self._current.get(name,0.0)
+        self._frames += 1
+        self._start = None
+
+    def stats(self,name=FRAME):
+        """
+        Returns the times (current, median, 99th percentile) in seconds of a phase.
+
+        The current time is the time in the last frame.  The percentiles are over the
+        frames in the ring buffer.  All three are 0 if no frame has been recorded.
+
+        :param name: The name of the phase, or ``'frame'`` for the whole frame
+        :type name:  ``str``
+        """
+        import numpy as np
+        filled = min(self._frames,self._size)
+        if filled == 0 or not name in self._rings:
+            return (0.0, 0.0, 0.0)
+        ring = self._rings[name]
+        last = ring[(self._frames-1) % self._size]
+        (p50, p99) = np.percentile(ring[:filled],[50,99])
+        return (float(last), float(p50), float(p99))
+
+    def report(self):
+        """
+        Returns the rows of the overlay, each a tuple of four strings.
+
+        The first row is a header and the next row is the whole frame.  Then there is
+        a row for every phase (indented by its nesting), with its current, median and
+        99th percentile times in milliseconds, and a row for every count.
+
+        :return: The rows of the overlay
+        :rtype:  ``list`` of 4-element ``tuple`` of ``str``
+        """
+        rows = [('ms','now','p50','p99'),self._format(self.FRAME,0)]
+        for name in self._order:
+            rows.append(self._format(name,1+self._depth[name]))
+        for name in sorted(self._counts):
+            rows.append((name,str(self._counts[name]),'',''))
+        return rows
+
+    def draw(self,view):
+        """
+        Draws the overlay, if this profiler is enabled.
+
+        :param view: The view to draw to
+        :type view:  :class:`GView`
+        """
+        if not self._enabled:
+            return
+        if self._back is None:
+            self._back = GRectangle(width=sum(self.COLUMNS)+4,height=1,fillcolor=(0,0,0,0.6))
+        if self._frames % self.REFRESH == 0 or not self._lines:
+            rows = self.report()
+            while len(self._lines) < len(rows):
+                self._lines.append(self._make_row(len(self._lines)))
+            for pos in range(len(self._lines)):
+                row = rows[pos] if pos < len(rows) else ('','','','')
+                for (cell, text) in zip(self._lines[pos],row):
+                    cell.text = text
+            self._back.height = len(rows)*self._lines[0][0].height+4
+            self._back.left = self._left-2
+            self._back.top = self._top+2
+        self._back.draw(view)
+        for row in self._lines:
+            for cell in row:
+                if cell.text:
+                    cell.draw(view)
+
+
+    # HIDDEN METHODS
+    def _add_ring(self,name):
+        """
+        Adds an empty ring buffer for a phase.
+
+        The buffers are only made once the profiler is in use, so that a disabled
+        profiler does not import NumPy.
+
+        :param name: The name of the phase
+        :type name:  ``str``
+        """
+        import numpy as np
+        self._rings[name] = np.zeros(self._size)
+
+    def _format(self,name,depth):
+        """
+        Returns the row of the overlay for a phase.
+
+        :param name: The name of the phase
+        :type name:  ``str``
+
+        :param depth: The indentation of the phase
+        :type depth:  ``int`` >= 0
+        """
+        (last, p50, p99) = self.stats(name)
+        return ('  '*depth+name,'%.2f' % (1000*last),'%.2f' % (1000*p50),'%.2f' % (1000*p99))
+
+    def _make_row(self,pos):
+        """
+        Returns the cells of a new row of the overlay, one GText for each column.
+
+        The first column is aligned left and the others are aligned right.
+
+        :param pos: The position of the row, from the top
+        :type pos:  ``int`` >= 0
+        """
+        cells = []
+        left = self._left
+        for width in self.COLUMNS:
+            cell = GText(text='',font_name='RetroGame',font_size=12,width=width,
+                         halign='right' if cells else 'left',valign='top',
+                         linecolor=(1,1,0,1))
+            cell.left = left
+            cell.top = self._top-pos*cell.height
+            cells.append(cell)
+            left += width
+        return cells
+
+
+# #mark -
+class _NullPhase(object):
+    """
+    A context that times nothing, for the phases of a disabled profiler.
+    """
+
+    def __enter__(self):
+        """
+        Does nothing.
+        """
+        return self
+
+    def __exit__(self,type,value,traceback):
+        """
+        Does nothing.
+        """
+        return False
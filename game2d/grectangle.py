@@ -8,11 +8,14 @@ to draw shapes.
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
-from kivy.graphics import *
-from kivy.graphics.instructions import *
-from kivy.uix.label import Label
-from kivy.uix.image import Image
-from .gobject import GObject
+from .headless import ENABLED as HEADLESS
+if HEADLESS:
+    from .headless import *
+else:
+    from kivy.graphics import *
+    from kivy.graphics.instructions import *
+from .gobject import GObject, FAST, is_num_tuple
+from introcs.geom import Point2
 from .app import GameApp
 
 class GRectangle(GObject):
@@ -29,6 +32,10 @@ class GRectangle(GObject):
     the border around the rectangle.  For all other properties, see the documentation
     for :class:`GObject`."""
     
+    # FAST MODE SLOTS
+    if FAST:
+        __slots__ = ('_linewidth',)
+    
     # MUTABLE PROPERTIES 
     @property
     def linewidth(self):
@@ -112,6 +119,10 @@ class GEllipse(GRectangle):
     documentation of that class and :class:`GObject` for a complete list of attributes.
     """
     
+    # FAST MODE SLOTS
+    if FAST:
+        __slots__ = ()
+    
     # BUILT-IN METHODS
     def __init__(self,**keywords):
         """
@@ -142,9 +153,9 @@ class GEllipse(GRectangle):
         **Warning**: Using this method on a rotated object may slow down your framerate.
         
         :param point: the point to check
-        :type point: :class:`GPoint`` or a pair of numbers
+        :type point: :class:`Point2`` or a pair of numbers
         """
-        if isinstance(point,GPoint):
+        if isinstance(point,Point2):
             point = (point.x,point.y)
         assert is_num_tuple(point,2), "%s is not a valid point" % repr(point)
         
@@ -154,12 +165,30 @@ class GEllipse(GRectangle):
             dx = (point[0]-self.x)*(point[0]-self.x)/(rx*rx)
             dy = (point[1]-self.y)*(point[1]-self.y)/(ry*ry)
         else:
-            p = self.matrix.inverse()._transform(point[0],point[1])
+            p = list(self.inverse._transform(point[0],point[1]))
             dx = p[0]*p[0]/(rx*rx)
             dy = p[1]*p[1]/(ry*ry)
         
         return (dx+dy) <= 1.0
     
+    def contains_points(self,points):
+        """
+        Checks which of many points this shape contains
+        
+        This method is the same as calling :meth:`contains` on each point, but it tests
+        all of the points at once with NumPy (see :meth:`GObject.contains_points`).
+        
+        :param points: the points to check
+        :type points:  a sequence of pairs of numbers, or an n x 2 NumPy array
+        
+        :return: For each point, True if the shape contains it
+        :rtype:  NumPy array of ``bool``
+        """
+        (x, y) = self._local_points(points)
+        rx = self.width/2.0
+        ry = self.height/2.0
+        return x*x/(rx*rx)+y*y/(ry*ry) <= 1.0
+    
     
     # HIDDEN METHODS
     def _reset(self):
@@ -205,6 +234,10 @@ class GImage(GRectangle):
     shapes.  However, the :meth:`contains` method still treats this shape as a  rectangle.
     """
     
+    # FAST MODE SLOTS
+    if FAST:
+        __slots__ = ('_source','_texture')
+    
     # MUTABLE PROPERTIES
     @property
     def source(self):
@@ -298,6 +331,11 @@ class GLabel(GRectangle):
     other fonts you will need the .ttf file for the bold version of that font.  See the
     provided `ComicSans.ttf` and `ComicSansBold.ttf` for an example."""
     
+    # FAST MODE SLOTS
+    if FAST:
+        __slots__ = ('_label','_fsize','_halign','_valign','_hanchor','_vanchor','_ha',
+                     '_hv')
+    
     # MUTABLE PROPERTIES
     @property
     def font_size(self):
@@ -356,12 +394,17 @@ class GLabel(GRectangle):
         lines in the presence of the escape character '\\n'. The `width` and `height` of 
         this label will grow to ensure that the text will fit in the rectangle.
         
+        The text is only laid out and rendered again when it changes.  Setting it to
+        the text it already has does nothing, so it is cheap to set every frame.
+        
         **Invariant**: Must be a string"""
         return self._label.text
     
     @text.setter
     def text(self,value):
         assert type(value) == str, 'value %s is not a string' % repr(value)
+        if value == self._label.text:
+            return
         self._label.text = value
         self._label.texture_update()
     
@@ -426,7 +469,7 @@ class GLabel(GRectangle):
     @x.setter
     def x(self,value):
         assert type(value) in [int,float], 'value %s is not a number' % repr(value)
-        self._trans.x = float(value)
+        self._trans.x = value if FAST else float(value)
         self._mtrue = False
         self._hanchor = 'center'
         self._ha = value
@@ -442,7 +485,7 @@ class GLabel(GRectangle):
     @y.setter
     def y(self,value):
         assert type(value) in [int,float], 'value %s is not a number' % repr(value)
-        self._trans.y = float(value)
+        self._trans.y = value if FAST else float(value)
         self._mtrue = False
         self._vanchor = 'center'
         self._hv = value
@@ -600,6 +643,11 @@ class GLabel(GRectangle):
             if not key in excludes:
                 sanitized[key] = keywords[key]
         
+        # The Kivy widgets are only imported once a label is made
+        if HEADLESS:
+            from .headless import Label
+        else:
+            from kivy.uix.label import Label
         self._label = Label(**sanitized)
         self._label.size_hint = (None,None)
         
@@ -6,12 +6,20 @@ image divided into rectangles of equal size.  The number of rectangles is specif
 the rows and columns of the filmstrip.  Each rectangle is a frame.  You animate the image
 by changing the current frame.
 
+The frames of a filmstrip are cut from its texture once, and shared by every sprite
+with the same image and grid size.  A :class:`GAnimator` changes the frame of a whole
+group of sprites at once, such as every alien in a formation.
+
 Author: Walker M. White (wmw2)
 Date:   November 1, 2017 (Python 3 version)
 """
-from kivy.graphics import *
-from kivy.graphics.instructions import *
-from .grectangle import GRectangle, GObject
+from .headless import ENABLED as HEADLESS
+if HEADLESS:
+    from .headless import *
+else:
+    from kivy.graphics import *
+    from kivy.graphics.instructions import *
+from .grectangle import GRectangle, GObject, FAST
 from .app import GameApp
 
 # #mark -
@@ -33,8 +41,19 @@ class GSprite(GRectangle):
     
     If the image supports transparency, then this object can be used to represent irregular 
     shapes.  However, the :meth:`contains` method still treats this shape as a  rectangle.
+    
+    The frames are texture regions shared by every sprite with the same source and grid
+    size (see :meth:`load_frames`), so changing the frame only swaps a texture.
     """
     
+    # FAST MODE SLOTS
+    if FAST:
+        __slots__ = ('_source','_format','_frame','_images','_bounds','_texture')
+    
+    # Class attribute for tracking the frames of each filmstrip (to reduce memory footprint)
+    FRAME_CACHE = {}
+    
+    
     # MUTABLE PROPERTIES
     @property
     def source(self):
@@ -80,6 +99,46 @@ class GSprite(GRectangle):
             self._bounds.texture = self._texture
     
     
+    # CLASS METHODS
+    @classmethod
+    def load_frames(cls,source,format):
+        """
+        Returns: The list of frames of the given filmstrip, or None if it cannot be loaded
+        
+        The frames are texture regions, listed left-to-right, top-to-bottom.  They are 
+        cut from the texture of ``source`` the first time that they are needed, and then 
+        cached for every other sprite with the same source and grid size.  When game2d is
+        running headless (see :mod:`game2d.headless`), there is no texture and it returns
+        None.
+        
+        :param source: The image file of the filmstrip
+        :type source:  ``str``
+        
+        :param format: The filmstrip grid size (rows, columns)
+        :type format:  2-element ``tuple`` of ``int`` > 0
+        """
+        key = (source,format)
+        if key in cls.FRAME_CACHE:
+            return cls.FRAME_CACHE[key]
+        
+        texture = GameApp.load_texture(source)
+        if not texture:
+            return None
+        
+        width  = texture.width/format[1]
+        height = texture.height/format[0]
+        frames = []
+        ty = 0
+        for row in range(format[0]):
+            tx = 0
+            for col in range(format[1]):
+                frames.append(texture.get_region(int(tx),texture.height-int(ty)-int(height),int(width),int(height)))
+                tx += width
+            ty += height
+        cls.FRAME_CACHE[key] = frames
+        return frames
+    
+    
     # BUILT-IN METHODS
     def __init__(self,**keywords):
         """
@@ -89,10 +148,10 @@ class GSprite(GRectangle):
         keyword arguments that initialize various attributes. For example, to load the 
         filmstrip ``alien-strip1.png``, which has 3 rows and 2 columns, use the constructor::
             
-            GSprite(x=0,y=0,width=10,height=10,source='alien-strip1.png',frames=(3,2))
+            GSprite(x=0,y=0,width=10,height=10,source='alien-strip1.png',format=(3,2))
         
         This class supports the all same keywords as :class:`GImage`; the only new 
-        keyword is ``frames``. This keyword specifies the grid size of the animation
+        keyword is ``format``. This keyword specifies the grid size of the animation
         frames in the image.  See the documentation of :class:`GImage` and 
         :class:`GObject` for the other supported keywords.
         
@@ -130,19 +189,10 @@ class GSprite(GRectangle):
         x = -self.width/2.0
         y = -self.height/2.0
         
-        texture = GameApp.load_texture(self.source)
-        if texture:
-            width  = texture.width/self._format[1]
-            height = texture.height/self._format[0]
-            
-            ty = 0
-            for row in range(self._format[0]):
-                tx = 0
-                for col in range(self._format[1]):
-                    self._images[row*self._format[1]+col] = texture.get_region(int(tx),texture.height-int(ty)-int(height),int(width),int(height))
-                    tx += width
-                ty += width
-        else:
+        frames = GSprite.load_frames(self.source,self._format)
+        if frames:
+            self._images = frames
+        elif not HEADLESS:
             print('Failed to load',repr(self.source))
         
         self._texture = self._images[self._frame]
@@ -160,3 +210,134 @@ class GSprite(GRectangle):
         
         self._cache.add(PopMatrix())
 
+
+
+# #mark -
+class GAnimator(object):
+    """
+    A class to animate a group of filmstrips together.
+    
+    An animator steps through a sequence of frames, and sets the ``frame`` of every 
+    object in its group each time that the frame changes.  The group can hold any object 
+    with a ``frame`` attribute, such as :class:`GSprite` or :class:`GSpriteBatch`.  
+    Because the frames of a filmstrip are shared, each step is just a texture swap per 
+    object, and there is one clock for the whole group instead of one per sprite.
+    
+    The animator is driven either by time, with :meth:`update` (if it has an 
+    `interval`), or by the game, with :meth:`advance`.
+    """
+    
+    # MUTABLE PROPERTIES
+    @property
+    def interval(self):
+        """
+        The number of seconds to show each frame, or None to only step with :meth:`advance`
+        
+        **Invariant**: Must be None or an int or float > 0.
+        """
+        return self._interval
+    
+    @interval.setter
+    def interval(self,value):
+        assert value is None or type(value) in [int,float], '%s is not a number' % repr(value)
+        assert value is None or value > 0, '%s is not positive' % repr(value)
+        self._interval = value
+    
+    
+    # IMMUTABLE PROPERTIES
+    @property
+    def frames(self):
+        """
+        The sequence of frames to step through, repeating from the start at the end.
+        
+        **Immutable**: This value cannot be altered after creation.
+        
+        **Invariant**: Must be a nonempty tuple of ints >= 0.
+        """
+        return self._frames
+    
+    @property
+    def frame(self):
+        """
+        The current frame of every object in the group.
+        
+        **Immutable**: This value cannot be altered.  Use :meth:`advance` instead.
+        
+        **Invariant**: Must be an element of `frames`.
+        """
+        return self._frames[self._step]
+    
+    
+    # BUILT-IN METHODS
+    def __init__(self,frames,interval=None):
+        """
+        Creates a new animator with an empty group.
+        
+        :param frames: The sequence of frames to step through
+        :type frames:  nonempty ``list`` or ``tuple`` of ``int`` >= 0
+        
+        :param interval: The number of seconds to show each frame, or None
+        :type interval:  ``int`` or ``float`` > 0, or ``None``
+        """
+        assert len(frames) > 0, 'the animation %s has no frames' % repr(frames)
+        assert all(type(frame) == int and frame >= 0 for frame in frames), '%s is not a list of frames' % repr(frames)
+        self._frames = tuple(frames)
+        self._step = 0
+        self._time = 0
+        self._group = []
+        self.interval = interval
+    
+    
+    # PUBLIC METHODS
+    def add(self,item):
+        """
+        Adds an object to the group, showing the current frame.
+        
+        :param item: The object to animate
+        :type item:  any object with a ``frame`` attribute
+        """
+        item.frame = self.frame
+        self._group.append(item)
+    
+    def remove(self,item):
+        """
+        Removes an object from the group.
+        
+        The object keeps the frame that it is showing.
+        
+        :param item: The object to stop animating
+        :type item:  an object in the group
+        """
+        self._group.remove(item)
+    
+    def clear(self):
+        """
+        Removes every object from the group.
+        """
+        self._group = []
+    
+    def advance(self):
+        """
+        Steps every object in the group to the next frame.
+        """
+        self._step = (self._step+1) % len(self._frames)
+        frame = self._frames[self._step]
+        for item in self._group:
+            item.frame = frame
+    
+    def update(self,dt):
+        """
+        Steps the animation forward by ``dt`` seconds.
+        
+        The group changes frame at most once per call, no matter how much time has 
+        passed.  Nothing happens if the `interval` is None.
+        
+        :param dt: time in seconds since last update
+        :type dt:  ``int`` or ``float``
+        """
+        if self._interval is None:
+            return
+        self._time += dt
+        if self._time >= self._interval:
+            self._time %= self._interval
+            self.advance()
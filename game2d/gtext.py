@@ -0,0 +1,400 @@
+"""
+A module to support fast text from a glyph atlas.
+
+A :class:`GLabel` lays out its text with a Kivy label and uploads a new texture every
+time the text changes.  That is fine for a title, but expensive for a counter that
+changes every frame.  This module rasterizes the glyphs of a font once into a single
+texture (the atlas), and draws a string as a batch of textured quads cut from that
+atlas.  Changing the text of a :class:`GText` only changes the vertices of its mesh.
+
+# John O'Donnel (jro79) and Anthony Nguyen (an523)
+# 4/27/2019
+"""
+from .headless import ENABLED as HEADLESS
+if HEADLESS:
+    from .headless import *
+else:
+    from kivy.graphics import *
+    from kivy.graphics.instructions import *
+from .grectangle import GRectangle, GObject, FAST
+
+
+# #mark -
+class GlyphAtlas(object):
+    """
+    A class representing the glyphs of one font, at one size, in a single texture.
+
+    The glyphs are the printable ASCII characters, rasterized one at a time by Kivy and
+    copied side by side into the atlas texture.  Each glyph is as wide as the text of
+    that single character, so strings are laid out without kerning.  That is the right
+    trade-off for scores and other counters, and for monospaced fonts like ``Arcade``.
+
+    Atlases are shared: use :meth:`load` instead of the constructor, so that every
+    :class:`GText` with the same font and size uses the same texture.
+
+    When game2d is running headless, no texture is created, and the size of each glyph
+    is estimated from the font size (just like a headless label).
+    """
+    # Class attribute for tracking atlases (to reduce memory footprint)
+    ATLAS_CACHE = {}
+
+    # The characters in every atlas
+    CHARACTERS = ''.join(chr(code) for code in range(32,127))
+
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def texture(self):
+        """
+        The atlas texture, or None when game2d is running headless.
+
+        **Invariant**: Must be a Kivy texture or None
+        """
+        return self._texture
+
+    @property
+    def height(self):
+        """
+        The height of a line of text.
+
+        **Invariant**: Must be an int > 0
+        """
+        return self._height
+
+
+    # CLASS METHODS
+    @classmethod
+    def load(cls,font_name,font_size):
+        """
+        Returns the atlas for the given font and size, creating it if necessary.
+
+        :param font_name: The font name, or None for the default Kivy font
+        :type font_name:  ``str`` or ``None``
+
+        :param font_size: The size of the font in points
+        :type font_size:  ``int`` or ``float`` > 0
+        """
+        key = (font_name,font_size)
+        if not key in cls.ATLAS_CACHE:
+            cls.ATLAS_CACHE[key] = GlyphAtlas(font_name,font_size)
+        return cls.ATLAS_CACHE[key]
+
+
+    # BUILT-IN METHODS
+    def __init__(self,font_name,font_size):
+        """
+        Creates a new atlas, rasterizing every glyph.
+
+        :param font_name: The font name, or None for the default Kivy font
+        :type font_name:  ``str`` or ``None``
+
+        :param font_size: The size of the font in points
+        :type font_size:  ``int`` or ``float`` > 0
+        """
+        assert type(font_size) in [int,float], 'font_size %s is not a number' % repr(font_size)
+        assert font_size > 0, 'font_size %s is not positive' % repr(font_size)
+        self._glyphs = {}
+        self._texture = None
+
+        if HEADLESS:
+            self._height = max(int(font_size*1.2),1)
+            for c in self.CHARACTERS:
+                self._glyphs[c] = (0,max(int(font_size*0.6),1))
+            return
+
+        from kivy.core.text import Label as CoreLabel
+        from kivy.graphics.texture import Texture
+        from kivy.resources import resource_find
+        options = {'font_size':font_size}
+        if font_name:
+            # Kivy caches a font under its file name, so a name without the extension
+            # would be searched for again for every glyph.  Find the file once.
+            path = resource_find(font_name) or resource_find(font_name+'.ttf')
+            options['font_name'] = path if path else font_name
+
+        images = []
+        width  = 0
+        height = 1
+        for c in self.CHARACTERS:
+            label = CoreLabel(text=c,**options)
+            label.refresh()
+            image = label.texture
+            self._glyphs[c] = (width,image.width)
+            images.append((width,image))
+            # Leave a column between glyphs, so filtering never bleeds into a neighbor
+            width += image.width+1
+            height = max(height,image.height)
+        self._height = height
+
+        self._texture = Texture.create(size=(width,height),colorfmt='rgba')
+        self._texture.blit_buffer(bytes(width*height*4),colorfmt='rgba',bufferfmt='ubyte')
+        for (x,image) in images:
+            self._texture.blit_buffer(image.pixels,pos=(x,0),size=image.size,
+                                      colorfmt='rgba',bufferfmt='ubyte')
+
+
+    # PUBLIC METHODS
+    def measure(self,text):
+        """
+        Returns the width of the given text.
+
+        Characters that are not in the atlas take no space.
+
+        :param text: The text to measure
+        :type text:  ``str``
+        """
+        width = 0
+        for c in text:
+            if c in self._glyphs:
+                width += self._glyphs[c][1]
+        return width
+
+    def layout(self,text,x,y):
+        """
+        Returns the mesh (vertices, indices) for the text with its bottom left at (x,y)
+
+        The vertices have the format (x, y, u, v), four per glyph.  Characters that are
+        not in the atlas are skipped.
+
+        :param text: The text to lay out
+        :type text:  ``str``
+
+        :param x: The left edge of the text
+        :type x:  ``int`` or ``float``
+
+        :param y: The bottom edge of the text
+        :type y:  ``int`` or ``float``
+        """
+        vertices = []
+        indices  = []
+        if self._texture is None:
+            return (vertices, indices)
+
+        tw = float(self._texture.width)
+        top = self._height
+        vtop = self._height/float(self._texture.height)
+        for c in text:
+            if not c in self._glyphs:
+                continue
+            (u, w) = self._glyphs[c]
+            # The glyph rows are stored top to bottom, so v runs down the quad
+            u0 = u/tw
+            u1 = (u+w)/tw
+            n = len(vertices)//4
+            vertices.extend((x,   y,     u0, vtop,
+                             x+w, y,     u1, vtop,
+                             x+w, y+top, u1, 0.0,
+                             x,   y+top, u0, 0.0))
+            indices.extend((n, n+1, n+2, n, n+2, n+3))
+            x += w
+        return (vertices, indices)
+
+
+# #mark -
+class GText(GRectangle):
+    """
+    A class representing a text label drawn from a glyph atlas.
+
+    This object works like a single line :class:`GLabel`, and takes the same keywords
+    (``text``, ``font_name``, ``font_size``, ``halign`` and ``valign``).  As with a
+    label, the background color of this rectangle is `fillcolor`, while `linecolor`
+    is the color of the text.  The `width` and `height` of this object will grow to
+    ensure that the text fits in the rectangle.
+
+    Unlike a label, the text is not rendered by Kivy. It is drawn as a batch of quads
+    from the shared :class:`GlyphAtlas` of its font. Changing the text only updates
+    the vertices of one mesh, so this is the class to use for scores and other text
+    that changes often.  The font name and size cannot be changed after creation.
+    """
+
+    # FAST MODE SLOTS
+    if FAST:
+        __slots__ = ('_text','_halign','_valign','_font_name','_font_size','_atlas',
+                     '_mesh')
+
+    # MUTABLE PROPERTIES
+    @property
+    def text(self):
+        """
+        The text for this object.
+
+        The text is displayed as a single line.  Characters other than printable
+        ASCII are not displayed.  Setting the text to the text it already has does
+        nothing.
+
+        **Invariant**: Must be a string"""
+        return self._text
+
+    @text.setter
+    def text(self,value):
+        assert type(value) == str, 'value %s is not a string' % repr(value)
+        if value == self._text:
+            return
+        self._text = value
+        if self._defined:
+            self._relayout()
+
+    @property
+    def halign(self):
+        """
+        The horizontal alignment of the text inside of this rectangle.
+
+        *This attribute has no effect unless the rectangle is wider than the text*.
+
+        **Invariant**: Must be one of 'left', 'right', or 'center'"""
+        return self._halign
+
+    @halign.setter
+    def halign(self,value):
+        assert value in ('left','right','center'), 'value %s is not a valid horizontal alignment' % repr(value)
+        self._halign = value
+        if self._defined:
+            self._relayout()
+
+    @property
+    def valign(self):
+        """
+        The vertical alignment of the text inside of this rectangle.
+
+        *This attribute has no effect unless the rectangle is taller than the text*.
+
+        **Invariant**: Must be one of 'top', 'bottom', or 'middle'"""
+        return self._valign
+
+    @valign.setter
+    def valign(self,value):
+        assert value in ('top','middle','bottom'), 'value %s is not a valid vertical alignment' % repr(value)
+        self._valign = value
+        if self._defined:
+            self._relayout()
+
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def font_name(self):
+        """
+        The file name for the .ttf file to use as a font, or None for the default font.
+
+        **Immutable**: This value cannot be altered after creation."""
+        return self._font_name
+
+    @property
+    def font_size(self):
+        """
+        The size of the text font in points.
+
+        **Immutable**: This value cannot be altered after creation."""
+        return self._font_size
+
+
+    # BUILT-IN METHODS
+    def __init__(self,**keywords):
+        """
+        Creates a new text object.
+
+        To use the constructor for this class, you should provide it with a list of
+        keyword arguments that initialize various attributes.  For example, to show a
+        score in the font ``Arcade.ttf``, use the constructor call::
+
+            GText(text='Score: 0',font_name='Arcade',font_size=40)
+
+        This class supports the all same keywords as :class:`GRectangle`, as well as
+        the keywords ``text``, ``font_name``, ``font_size``, ``halign`` and ``valign``.
+
+        :param keywords: dictionary of keyword arguments
+        :type keywords:  keys are attribute names
+        """
+        self._defined = False
+        self._text = ''
+        self.text = keywords['text'] if 'text' in keywords else ''
+        self.halign = keywords['halign'] if 'halign' in keywords else 'center'
+        self.valign = keywords['valign'] if 'valign' in keywords else 'middle'
+        self._font_name = keywords['font_name'] if 'font_name' in keywords else None
+        self._font_size = keywords['font_size'] if 'font_size' in keywords else 15
+        self._atlas = GlyphAtlas.load(self._font_name,self._font_size)
+        self._mesh = None
+
+        sized = dict(keywords)
+        sized['width']  = max(keywords['width'] if 'width' in keywords else 1,
+                              self._atlas.measure(self._text),1)
+        sized['height'] = max(keywords['height'] if 'height' in keywords else 1,
+                              self._atlas.height)
+        GRectangle.__init__(self,**sized)
+        if not self.linecolor:
+            self.linecolor = (0,0,0,1)
+
+    def __str__(self):
+        """
+        :return: A readable string representation of this object.
+        :rtype:  ``str``
+        """
+        if self.name is None:
+            s = '['
+        else:
+            s = '[name=%s,' % self.name
+        return '%s,text=%s,center=(%s,%s),angle=%s]' \
+                % (s,repr(self.text),repr(self.x),repr(self.y),repr(self.angle))
+
+
+    # HIDDEN METHODS
+    def _relayout(self):
+        """
+        Updates the mesh for new text, growing the rectangle if the text no longer fits.
+        """
+        width = self._atlas.measure(self._text)
+        if width > self.width:
+            self.width = width
+        else:
+            self._layout()
+
+    def _layout(self):
+        """
+        Sets the vertices of the mesh from the text and alignment.
+        """
+        if self._mesh is None:
+            return
+        width = self._atlas.measure(self._text)
+        if self._halign == 'left':
+            x = -self.width/2.0
+        elif self._halign == 'right':
+            x = self.width/2.0-width
+        else:
+            x = -width/2.0
+        if self._valign == 'bottom':
+            y = -self.height/2.0
+        elif self._valign == 'top':
+            y = self.height/2.0-self._atlas.height
+        else:
+            y = -self._atlas.height/2.0
+
+        (vertices, indices) = self._atlas.layout(self._text,x,y)
+        self._mesh.vertices = vertices
+        self._mesh.indices = indices
+
+    def _reset(self):
+        """
+        Resets the drawing cache.
+        """
+        GObject._reset(self)
+        x = -self.width/2.0
+        y = -self.height/2.0
+
+        if not self._fillcolor is None:
+            fill = Rectangle(pos=(x,y), size=(self.width, self.height))
+            self._cache.add(self._fillcolor)
+            self._cache.add(fill)
+
+        self._mesh = Mesh(mode='triangles',texture=self._atlas.texture)
+        if not self._linecolor is None:
+            self._cache.add(self._linecolor)
+        else:
+            self._cache.add(Color(0,0,0,1))
+        self._cache.add(self._mesh)
+        self._layout()
+
+        if not self._linecolor is None and self.linewidth > 0:
+            line = Line(rectangle=(x,y,self.width,self.height),joint='miter',close=True,width=self.linewidth)
+            self._cache.add(self._linecolor)
+            self._cache.add(line)
+
+        self._cache.add(PopMatrix())
@@ -0,0 +1,110 @@
+"""
+A module to support simulating a game at a fixed time step.
+
+A game that moves its objects a fixed distance per update runs at a different speed
+when the frame rate changes.  A :class:`GTimestep` turns the varying time of the
+animation frames into a whole number of updates of exactly the same length, and keeps
+the time left over for the next frame.  It is used by :class:`GameApp` (see the
+attribute `step`), and can drive a game without a window in the same way.
+
+# John O'Donnel (jro79) and Anthony Nguyen (an523)
+# 4/27/2019
+"""
+
+
+# #mark -
+class GTimestep(object):
+    """
+    A class to split the time of the animation frames into fixed steps.
+
+    Give the time of every frame to :meth:`advance`, and take as many steps of length
+    `step` as it returns::
+
+        for count in range(timestep.advance(dt)):
+            game.update(timestep.step)
+
+    The time that does not fill a whole step is kept (as `lag`) for the next frame.
+    A frame never takes more than `MAX_STEPS` steps, so that a slow frame cannot
+    snowball into ever slower frames; the time beyond that is dropped.  The attribute
+    `blend` is the fraction of a step that is left over, to draw moving objects between
+    their positions before and after the last step.
+    """
+    # The most steps in one frame
+    MAX_STEPS = 5
+
+
+    # MUTABLE PROPERTIES
+    @property
+    def step(self):
+        """
+        The fixed time in seconds of a step.
+
+        Changing this value throws away the time left over.
+
+        **invariant**. Value must be an int or float > 0.
+        """
+        return self._step
+
+    @step.setter
+    def step(self,value):
+        assert type(value) in [int,float], '%s is not a number' % repr(value)
+        assert value > 0, '%s is not positive' % repr(value)
+        self._step = value
+        self.reset()
+
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def lag(self):
+        """
+        The time in seconds given to :meth:`advance` that is not yet stepped.
+
+        **Immutable**: This value cannot be altered.
+
+        **invariant**. Value is a float in 0..`step` (excluding `step`).
+        """
+        return self._lag
+
+    @property
+    def blend(self):
+        """
+        The fraction of a step that is left over, `lag` divided by `step`.
+
+        **Immutable**: This value cannot be altered.
+
+        **invariant**. Value is a float in 0..1.
+        """
+        return self._lag/self._step
+
+
+    # BUILT-IN METHODS
+    def __init__(self,step):
+        """
+        Creates a new time step with no time left over.
+
+        :param step: The fixed time in seconds of a step
+        :type step:  ``int`` or ``float`` > 0
+        """
+        self.step = step
+
+
+    # PUBLIC METHODS
+    def reset(self):
+        """
+        Throws away the time left over.
+        """
+        self._lag = 0.0
+
+    def advance(self,dt):
+        """
+        Returns the number of steps to take after a frame of the given time.
+
+        :param dt: The time in seconds of the frame
+        :type dt:  ``int`` or ``float`` >= 0
+        """
+        self._lag = min(self._lag+dt,self.MAX_STEPS*self._step)
+        count = 0
+        while self._lag >= self._step:
+            self._lag -= self._step
+            count += 1
+        return count
@@ -9,12 +9,23 @@ Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
 # Basic Kivy Modules
-from kivy.graphics import *
-from kivy.graphics.instructions import *
-from kivy.uix.floatlayout import FloatLayout
-from kivy.metrics import dp
+from .headless import ENABLED as HEADLESS
+if HEADLESS:
+    from .headless import *
+else:
+    from kivy.graphics import *
+    from kivy.graphics.instructions import *
+    from kivy.uix.floatlayout import FloatLayout
+    from kivy.metrics import dp
 
 from introcs.geom import Point2
+import struct
+
+# The header of a file of recorded input (see GInput.start_recording)
+INPUT_MAGIC = b'G2IN\x02'
+
+# The number of recorded frames between writes to the file of recorded input
+INPUT_CHUNK = 60
 
 
 class GInput(object):
@@ -124,6 +135,32 @@ class GInput(object):
         """
         return tuple(k for (k,v) in self._keystate.items() if v)
 
+    @property
+    def recording(self):
+        """
+        Whether this input handler is currently recording the keyboard.
+
+        **Immutable**: This value cannot be altered.  Use the methods
+        :meth:`start_recording` and :meth:`stop_recording` instead.
+
+        **Invariant**: Must be a bool
+        """
+        return not self._recording is None
+
+    @property
+    def replaying(self):
+        """
+        Whether this input handler is currently playing back a recording.
+
+        This becomes False as soon as the last recorded frame has started.
+
+        **Immutable**: This value cannot be altered.  Use the methods
+        :meth:`start_replay` and :meth:`stop_replay` instead.
+
+        **Invariant**: Must be a bool
+        """
+        return bool(self._replay)
+
 
     # BUILT-IN METHODS
     def __init__(self):
@@ -145,6 +182,10 @@ class GInput(object):
         self._keystate = {}
         self._keycount = 0
 
+        self._recording = None
+        self._replay = None
+        self._wake = None
+
 
     # PUBLIC METHODS
     def is_key_down(self,key):
@@ -185,8 +226,152 @@ class GInput(object):
         """
         return not self._touch is None
 
+    def start_recording(self,filename):
+        """
+        Starts recording the keyboard to the given file.
+
+        From now on, the keys held down in each animation frame, together with the 
+        time since the previous frame, are recorded.  The recording is written to the
+        file as it goes, every `INPUT_CHUNK` frames, so that a game that crashes loses 
+        at most the last few frames.  It is finished when :meth:`stop_recording` is 
+        called (or the recording is replaced by a new one). Only the keyboard is 
+        recorded, not the mouse.
+
+        The file is binary, with one entry per frame: the time (8 bytes), the number of
+        keys first held down in this frame (1 byte) and their names, followed by one bit 
+        for each key that was held down so far in the recording.
+
+        :param filename: the file to write the recording to
+        :type filename:  ``str``
+        """
+        assert type(filename) == str, 'filename %s is not a string' % repr(filename)
+        if self.recording:
+            self.stop_recording()
+        file = open(filename,'wb')
+        file.write(INPUT_MAGIC)
+        self._recording = {'file':file, 'keys':[], 'index':{}, 'frames':0}
+
+    def stop_recording(self):
+        """
+        Stops recording the keyboard and finishes writing its file.
+
+        This method does nothing if the keyboard is not being recorded.
+        """
+        if not self.recording:
+            return
+        self._recording['file'].close()
+        self._recording = None
+
+    def start_replay(self,filename):
+        """
+        Starts playing back the recording in the given file.
+
+        While the recording plays, the keyboard is ignored.  Instead, in each animation
+        frame the keys held down are the ones held down in the next frame of the
+        recording, and the game is updated with the recorded frame time (not the real 
+        one). When the recording is over, all keys are released and the keyboard is 
+        used again.
+
+        If the recording was cut short (say, by a crash), the last incomplete frame is 
+        ignored.
+
+        :param filename: a file written by :meth:`start_recording`
+        :type filename:  ``str``
+        """
+        with open(filename,'rb') as file:
+            data = file.read()
+        if data[:len(INPUT_MAGIC)] != INPUT_MAGIC:
+            raise IOError('File %s is not an input recording' % repr(filename))
+        
+        pos = len(INPUT_MAGIC)
+        keys = []
+        frames = []
+        while pos+9 <= len(data):
+            dt = struct.unpack_from('<d',data,pos)[0]
+            added = data[pos+8]
+            start = pos+9
+            names = []
+            for x in range(added):
+                if start >= len(data) or start+1+data[start] > len(data):
+                    break
+                names.append(data[start+1:start+1+data[start]].decode('utf-8'))
+                start += 1+data[start]
+            size = (len(keys)+len(names)+7)//8
+            if len(names) < added or start+size > len(data):
+                break
+            keys.extend(names)
+            mask = int.from_bytes(data[start:start+size],'little')
+            frames.append((dt,tuple(keys[k] for k in range(len(keys)) if mask >> k & 1)))
+            pos = start+size
+        frames.reverse()
+        self._replay = frames
+
+    def stop_replay(self):
+        """
+        Stops playing back a recording, releasing all keys.
+
+        This method does nothing if no recording is playing.
+        """
+        if not self._replay is None:
+            self._replay = None
+            self._keystate = {}
+            self._keycount = 0
+
 
     # HIDDEN METHODS
+    def _advance(self,dt):
+        """
+        Starts a new animation frame, recording or playing back the keyboard.
+
+        This method is called for you by :class:`GameApp` at the start of each frame,
+        before the game is updated.
+
+        :param dt: time in seconds since the last frame
+        :type dt:  ``int`` or ``float``
+
+        :return: The time to update the game with (the recorded time if replaying)
+        :rtype:  ``float``
+        """
+        if self.replaying:
+            (dt,keys) = self._replay.pop()
+            self._keystate = dict.fromkeys(keys,True)
+            self._keycount = len(keys)
+        elif not self._replay is None:
+            self.stop_replay()
+        
+        if self.recording:
+            self._record(dt)
+        return dt
+
+    def _record(self,dt):
+        """
+        Writes the keys held down in this frame to the recording.
+
+        The file is flushed every `INPUT_CHUNK` frames.
+
+        :param dt: time in seconds since the last frame
+        :type dt:  ``int`` or ``float``
+        """
+        index = self._recording['index']
+        names = bytearray()
+        added = 0
+        mask = 0
+        for key in self.keys:
+            if not key in index:
+                index[key] = len(self._recording['keys'])
+                self._recording['keys'].append(key)
+                name = key.encode('utf-8')
+                names += struct.pack('<B',len(name))+name
+                added += 1
+            mask |= 1 << index[key]
+        size = (len(self._recording['keys'])+7)//8
+        
+        file = self._recording['file']
+        file.write(struct.pack('<dB',float(dt),added)+names+mask.to_bytes(size,'little'))
+        self._recording['frames'] += 1
+        if self._recording['frames'] % INPUT_CHUNK == 0:
+            file.flush()
+
     def _register(self,view):
         """
         Registers the view with this input handler; activating it.
@@ -263,6 +448,9 @@ class GInput(object):
         :param modifiers: the modifiers associated with the press
         :type modifiers:  list of key codes
         """
+        if not self._replay is None:
+            return True
+        self._notify()
         k = keycode[1]
         # Need to handle the case where a release was dropped
         if not k in self._keystate or not self._keystate[k]:
@@ -280,6 +468,9 @@ class GInput(object):
         :param keycode: the key released as a pair of int (keycode) and a name
         :type keycode:  (``int``, ``str``)
         """
+        if not self._replay is None:
+            return True
+        self._notify()
         self._keystate[keycode[1]] = False
         self._keycount -= 1
         return True
@@ -294,6 +485,7 @@ class GInput(object):
         :param touch: the information about the mouse press
         :type touch:  ``kivy.input.motionevent.TouchEvent``
         """
+        self._notify()
         self._touch = touch
         #self._touch.grab(self)
 
@@ -307,8 +499,98 @@ class GInput(object):
         :param touch: the information about the mouse release
         :type touch:  ``kivy.input.motionevent.TouchEvent``
         """
+        self._notify()
         self._touch = None
 
+    def _notify(self):
+        """
+        Tells the game that there was new input, waking it if it is idle.
+        """
+        if not self._wake is None:
+            self._wake()
+
+
+# #mark -
+class ScriptedInput(GInput):
+    """
+    A class representing an input handler driven by code instead of the keyboard.
+
+    This input handler is never hooked up to the keyboard or the mouse.  Instead, keys
+    are pressed and released with the methods :meth:`press` and :meth:`release`, or by
+    a script.  A script is a sequence with one entry per animation frame, and each
+    entry is the collection of keys held down in that frame.  Every call to
+    :meth:`advance` moves on to the next frame of the script.
+
+    This is the input handler of a headless :class:`GameApp` (see
+    :mod:`game2d.headless`), but it can be used anywhere a :class:`GInput` is expected.
+    """
+
+    # BUILT-IN METHODS
+    def __init__(self,script=None):
+        """
+        Creates a new scripted input handler
+
+        :param script: the keys held down in each frame, or None for no script
+        :type script:  iterable of collections of ``str``
+        """
+        GInput.__init__(self)
+        self._touch_enabled = False
+        self._keyboard_enabled = False
+        self._script = None if script is None else iter(script)
+
+
+    # PUBLIC METHODS
+    def press(self,key):
+        """
+        Presses the given key, holding it down until it is released.
+
+        :param key: the key to press
+        :type key:  ``str``
+        """
+        if not self.is_key_down(key):
+            self._keycount += 1
+        self._keystate[key] = True
+
+    def release(self,key):
+        """
+        Releases the given key, if it is held down.
+
+        :param key: the key to release
+        :type key:  ``str``
+        """
+        if self.is_key_down(key):
+            self._keycount -= 1
+        self._keystate[key] = False
+
+    def release_all(self):
+        """
+        Releases every key held down.
+        """
+        self._keystate = {}
+        self._keycount = 0
+
+    def advance(self):
+        """
+        Moves on to the next frame of the script.
+
+        The keys held down are replaced by the keys of the next frame.  If there is no
+        script, or the script is finished, the keys are left alone.
+
+        :return: True if the script had another frame; False otherwise
+        :rtype:  ``bool``
+        """
+        if self._script is None:
+            return False
+        try:
+            keys = next(self._script)
+        except StopIteration:
+            self._script = None
+            return False
+        self.release_all()
+        for key in keys:
+            self.press(key)
+        return True
+
 
 # #mark -
 class GView(FloatLayout):
@@ -325,6 +607,33 @@ class GView(FloatLayout):
     See the documentation of that class for more information.
     """
 
+    # MUTABLE PROPERTIES
+    @property
+    def retained(self):
+        """
+        Whether this view keeps its contents on the canvas between frames.
+
+        By default, the canvas is emptied at the start of every animation frame and
+        every object drawn is added to it again.  In retained mode, you still draw
+        every object every frame, but the canvas is left alone.  Instead, at the end
+        of the frame, the objects drawn are compared with the ones on the canvas.  Only
+        the objects that appeared are added and only the ones that disappeared are
+        removed, so the cost of a frame depends on what changed, not on everything on
+        screen.  If the objects were drawn in a different order, the canvas is rebuilt.
+
+        **Invariant**: Must be a bool
+        """
+        return self._retained
+
+    @retained.setter
+    def retained(self,value):
+        assert type(value) == bool, 'value %s is not a bool' % repr(value)
+        self._retained = value
+        self.clear()
+        self._frame.clear()
+        self._shown = []
+
+
     # BUILT-IN METHODS
     def __init__(self):
         """
@@ -341,6 +650,9 @@ class GView(FloatLayout):
         self.bind(size=self._reset)
         self._reset()
         self._contents = set()
+        self._retained = False
+        self._drawn = []
+        self._shown = []
 
 
     # PUBLIC METHODS
@@ -355,20 +667,55 @@ class GView(FloatLayout):
         :type cmd:  A Kivy graphics command
         """
         if not cmd in self._contents:
-            self._frame.add(cmd)
             self._contents.add(cmd)
+            if self._retained:
+                self._drawn.append(cmd)
+            else:
+                self._frame.add(cmd)
 
     def clear(self):
         """
         Clears the contents of the view.
 
         This method is called for you automatically at the start of the animation
-        frame.  That way, you are not drawing images on top of one another.
+        frame.  That way, you are not drawing images on top of one another.  In
+        retained mode, the canvas itself is only updated at the end of the frame.
         """
-        self._frame.clear()
+        if not self._retained:
+            self._frame.clear()
         self._contents.clear()
+        self._drawn = []
 
     # HIDDEN METHODS
+    def _commit(self):
+        """
+        Brings the canvas up to date with the commands drawn this frame.
+
+        This method is called for you automatically at the end of the animation
+        frame.  It does nothing unless the view is in retained mode.
+        """
+        if not self._retained or self._drawn == self._shown:
+            return
+
+        # The commands on the canvas that were drawn again must keep their order
+        kept = [cmd for cmd in self._shown if cmd in self._contents]
+        shown = set(kept)
+        if kept != [cmd for cmd in self._drawn if cmd in shown]:
+            self._frame.clear()
+            for cmd in self._drawn:
+                self._frame.add(cmd)
+            self._shown = self._drawn
+            return
+
+        for cmd in self._shown:
+            if not cmd in self._contents:
+                self._frame.remove(cmd)
+        for pos in range(len(self._drawn)):
+            cmd = self._drawn[pos]
+            if not cmd in shown:
+                self._frame.insert(pos,cmd)
+        self._shown = self._drawn
+
     def _reset(self,obj=None,value=None):
         """
         Resets the view canvas in response to a resizing event
@@ -379,3 +726,63 @@ class GView(FloatLayout):
         # Work-around for Retina Macs
         self.canvas.add(Scale(dp(1),dp(1),dp(1)))
         self.canvas.add(self._frame)
+
+
+# #mark -
+class NullView(object):
+    """
+    A class representing a view that draws nothing.
+
+    Drawing to this view is free: the graphics commands are thrown away.  This is the
+    view of a headless :class:`GameApp` (see :mod:`game2d.headless`), and it is
+    useful whenever you want to run the ``draw`` methods of a game without a window.
+    """
+
+    # MUTABLE PROPERTIES
+    @property
+    def retained(self):
+        """
+        Whether this view keeps its contents between frames (see :class:`GView`).
+
+        It makes no difference, as nothing is ever drawn.
+
+        **Invariant**: Must be a bool
+        """
+        return self._retained
+
+    @retained.setter
+    def retained(self,value):
+        assert type(value) == bool, 'value %s is not a bool' % repr(value)
+        self._retained = value
+
+
+    # BUILT-IN METHODS
+    def __init__(self):
+        """
+        Creates a new view that draws nothing.
+        """
+        self._retained = False
+
+
+    # PUBLIC METHODS
+    def draw(self,cmd):
+        """
+        Ignores the given Kivy graphics command.
+
+        :param cmd: the command to draw
+        :type cmd:  A Kivy graphics command
+        """
+        pass
+
+    def clear(self):
+        """
+        Does nothing, as this view has no contents.
+        """
+        pass
+
+    # HIDDEN METHODS
+    def _commit(self):
+        """
+        Does nothing, as this view has no canvas.
+        """
+        pass
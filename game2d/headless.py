@@ -0,0 +1,404 @@
+"""
+Stand-ins for the Kivy classes used by game2d, for running without a window.
+
+If the environment variable ``GAME2D_HEADLESS`` is set (to anything other than an
+empty string or 0) when game2d is first imported, the other modules of this package
+take their Kivy classes from this module instead of from Kivy.  Kivy is then never
+imported: no window is opened, no graphics instructions are built and no textures
+are loaded.  Every object can still be created, moved and tested for collisions, so
+a game can be simulated (for soak tests or benchmarks) on a machine with no display.
+
+The stand-ins only remember the attributes that game2d reads back.  Drawing them
+does nothing at all.
+
+# John O'Donnel (jro79) and Anthony Nguyen (an523)
+# 4/27/2019
+"""
+import os
+
+#: Whether game2d is running without Kivy
+ENABLED = os.environ.get('GAME2D_HEADLESS','') not in ('','0')
+
+__all__ = ['InstructionGroup', 'PushMatrix', 'PopMatrix', 'Translate', 'Rotate', 'Scale',
+           'Color', 'Rectangle', 'Ellipse', 'Line', 'Mesh', 'Label', 'FloatLayout',
+           'App', 'Config', 'Clock', 'SoundLoader', 'dp']
+
+
+# #mark -
+class Instruction(object):
+    """
+    A graphics instruction that draws nothing.
+
+    The keyword arguments of the constructor are kept as attributes, so that code
+    reading them back (such as ``texture`` on a rectangle) works unchanged.
+    """
+
+    def __init__(self,*args,**keywords):
+        """
+        Creates a new instruction.
+
+        :param keywords: dictionary of keyword arguments
+        :type keywords:  keys are attribute names
+        """
+        for key in keywords:
+            setattr(self,key,keywords[key])
+
+
+class InstructionGroup(Instruction):
+    """
+    A group of instructions that draws nothing.
+    """
+
+    def __init__(self,*args,**keywords):
+        """
+        Creates a new, empty instruction group.
+        """
+        Instruction.__init__(self,**keywords)
+        self.children = []
+
+    def add(self,c):
+        """
+        Adds an instruction to the end of this group.
+
+        :param c: the instruction to add
+        :type c:  :class:`Instruction`
+        """
+        self.children.append(c)
+
+    def insert(self,index,c):
+        """
+        Inserts an instruction into this group.
+
+        :param index: the position of the new instruction
+        :type index:  ``int``
+
+        :param c: the instruction to insert
+        :type c:  :class:`Instruction`
+        """
+        self.children.insert(index,c)
+
+    def remove(self,c):
+        """
+        Removes an instruction from this group.
+
+        :param c: the instruction to remove
+        :type c:  :class:`Instruction`
+        """
+        self.children.remove(c)
+
+    def clear(self):
+        """
+        Removes every instruction from this group.
+        """
+        self.children = []
+
+
+class PushMatrix(Instruction):
+    """
+    A stand-in for the Kivy matrix push.
+    """
+    pass
+
+
+class PopMatrix(Instruction):
+    """
+    A stand-in for the Kivy matrix pop.
+    """
+    pass
+
+
+class Translate(Instruction):
+    """
+    A stand-in for the Kivy translation, remembering ``x`` and ``y``.
+    """
+
+    def __init__(self,x=0,y=0,z=0):
+        """
+        Creates a new translation.
+        """
+        self.x = x
+        self.y = y
+        self.z = z
+
+
+class Rotate(Instruction):
+    """
+    A stand-in for the Kivy rotation, remembering ``angle``.
+    """
+
+    def __init__(self,angle=0,axis=(0,0,1)):
+        """
+        Creates a new rotation.
+        """
+        self.angle = angle
+        self.axis = axis
+
+
+class Scale(Instruction):
+    """
+    A stand-in for the Kivy scale, remembering ``x`` and ``y``.
+    """
+
+    def __init__(self,x=1,y=1,z=1):
+        """
+        Creates a new scale.
+        """
+        self.x = x
+        self.y = y
+        self.z = z
+
+
+class Color(Instruction):
+    """
+    A stand-in for the Kivy color, remembering ``rgba``.
+    """
+
+    def __init__(self,r=1,g=1,b=1,a=1):
+        """
+        Creates a new color.
+        """
+        self.rgba = [r,g,b,a]
+
+
+class Rectangle(Instruction):
+    """
+    A stand-in for the Kivy rectangle.
+    """
+    texture = None
+
+
+class Ellipse(Instruction):
+    """
+    A stand-in for the Kivy ellipse.
+    """
+    texture = None
+
+
+class Line(Instruction):
+    """
+    A stand-in for the Kivy line.
+    """
+    pass
+
+
+class Mesh(Instruction):
+    """
+    A stand-in for the Kivy mesh.
+    """
+    texture = None
+
+
+# #mark -
+class Label(object):
+    """
+    A stand-in for the Kivy label widget.
+
+    No text is rendered.  The size of the text is estimated from the number of
+    characters and the font size, so that labels still have a sensible size.
+    """
+
+    @property
+    def right(self):
+        return self.x+self.width
+
+    @right.setter
+    def right(self,value):
+        self.x = value-self.width
+
+    @property
+    def top(self):
+        return self.y+self.height
+
+    @top.setter
+    def top(self,value):
+        self.y = value-self.height
+
+    @property
+    def bottom(self):
+        return self.y
+
+    @bottom.setter
+    def bottom(self,value):
+        self.y = value
+
+    @property
+    def size(self):
+        return (self.width,self.height)
+
+    @size.setter
+    def size(self,value):
+        self.width = value[0]
+        self.height = value[1]
+
+    @property
+    def center(self):
+        return (self.x+self.width/2.0,self.y+self.height/2.0)
+
+    @center.setter
+    def center(self,value):
+        self.x = value[0]-self.width/2.0
+        self.y = value[1]-self.height/2.0
+
+    def __init__(self,**keywords):
+        """
+        Creates a new label.
+
+        :param keywords: dictionary of keyword arguments
+        :type keywords:  keys are attribute names
+        """
+        self.text = ''
+        self.font_size = 15
+        self.font_name = None
+        self.bold = False
+        self.halign = 'left'
+        self.valign = 'bottom'
+        self.color = [1,1,1,1]
+        self.size_hint = (1,1)
+        self.x = 0
+        self.y = 0
+        self.width = 100
+        self.height = 100
+        self.canvas = InstructionGroup()
+        for key in keywords:
+            if key in ('text','font_size','font_name','bold','color'):
+                setattr(self,key,keywords[key])
+        self.texture_update()
+
+    def bind(self,**keywords):
+        """
+        Ignores the callbacks; the text size only changes in :meth:`texture_update`.
+        """
+        pass
+
+    def texture_update(self):
+        """
+        Estimates the size of the text from its characters and font size.
+        """
+        lines = str(self.text).split('\n')
+        width = max(len(line) for line in lines)*self.font_size*0.6
+        height = len(lines)*self.font_size*1.2
+        self.texture_size = (max(width,1),max(height,1))
+
+
+class FloatLayout(object):
+    """
+    A stand-in for the Kivy layout (the base class of :class:`GView`).
+    """
+
+    def __init__(self,**keywords):
+        """
+        Creates a new layout with an empty canvas.
+        """
+        self.canvas = InstructionGroup()
+        self.pos = (0,0)
+        self.size = (100,100)
+        self.size_hint = (1,1)
+
+    def bind(self,**keywords):
+        """
+        Ignores the callbacks; a headless layout never changes.
+        """
+        pass
+
+    def unbind(self,**keywords):
+        """
+        Ignores the callbacks; a headless layout never changes.
+        """
+        pass
+
+
+def dp(value):
+    """
+    :return: ``value``, as there is no screen density without a window.
+    """
+    return value
+
+
+# #mark -
+class App(object):
+    """
+    A stand-in for the Kivy application (the base class of :class:`GameApp`).
+
+    A headless application has no event loop, so :meth:`run` does nothing.  Drive the
+    game by calling its ``update`` method yourself.
+    """
+
+    def __init__(self,**keywords):
+        """
+        Creates a new application.
+        """
+        pass
+
+    def run(self):
+        """
+        Does nothing, as there is no window to show.
+        """
+        pass
+
+    def stop(self):
+        """
+        Calls :meth:`on_stop`, as there is no window to close.
+        """
+        self.on_stop()
+
+    def on_stop(self):
+        """
+        Called when the application stops.
+        """
+        pass
+
+
+class _Config(object):
+    """
+    A stand-in for the Kivy configuration, ignoring every setting.
+    """
+
+    def set(self,section,option,value):
+        pass
+
+
+class _Clock(object):
+    """
+    A stand-in for the Kivy clock.  Nothing is ever scheduled.
+    """
+
+    def schedule_once(self,callback,timeout=0):
+        pass
+
+    def schedule_interval(self,callback,timeout):
+        pass
+
+    def unschedule(self,callback):
+        pass
+
+
+class _Sound(object):
+    """
+    A stand-in for a Kivy sound, which is silent and never plays.
+    """
+
+    def __init__(self,source):
+        self.source = source
+        self.volume = 1
+        self.loop = False
+        self.state = 'stop'
+
+    def play(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+class _SoundLoader(object):
+    """
+    A stand-in for the Kivy sound loader, producing silent sounds.
+    """
+
+    def load(self,filename):
+        return _Sound(filename)
+
+
+Config = _Config()
+Clock  = _Clock()
+SoundLoader = _SoundLoader()
@@ -6,7 +6,11 @@ This classes wrap the Kivy audio interface, making it simpler for students to us
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
-from kivy.core.audio import SoundLoader
+from .headless import ENABLED as HEADLESS
+if HEADLESS:
+    from .headless import SoundLoader
+else:
+    from kivy.core.audio import SoundLoader
 from .app import GameApp
 
 
@@ -22,10 +26,17 @@ class Sound(object):
     When a sound is played, it cannot be played again until it finishes, or is stopped.  
     This means that if you want multiple, simultaneous sound effects from the same WAV 
     file.you will need to create multiple Sound objects.
+    
+    A sound file preloaded by a :class:`GPreloader` is not loaded again.  The sound
+    is taken from the attribute `PRELOADED` instead.
     """
     # This class is a simply replacement for the built-in Kivy Sound class.  It is a
     # little better with error handling, since GStreamer appears to be quite unreliable.
     
+    # Class attribute for the sounds loaded ahead of time (see GPreloader)
+    # Maps each file name to a list of unused Kivy sounds from that file
+    PRELOADED = {}
+    
     # MUTABLE PROPERTIES
     @property
     def volume(self):
@@ -78,7 +89,10 @@ class Sound(object):
         from .app import GameApp
         assert GameApp.is_sound(source), 'source %s is not a sound file' % repr(source)
         self._source = source
-        self._sound  = SoundLoader.load(source)
+        if Sound.PRELOADED.get(source):
+            self._sound = Sound.PRELOADED[source].pop()
+        else:
+            self._sound = SoundLoader.load(source)
         if self._sound is None:
             raise IOError('Module game2d cannot read the file %s' % repr(source))
     
@@ -179,3 +193,196 @@ class SoundLibrary(object):
         :rtype:  ``iterable``
         """
         return self._data.keys()
+
+
+# #mark -
+class SoundEffects(SoundLibrary):
+    """
+    A sound library that can play every sound several times at once.
+    
+    A :class:`Sound` cannot overlap itself, so a sound effect played on every shot
+    would cut itself off.  This library loads each effect as a small pool of voices
+    (separate :class:`Sound` objects for the same files) when the effect is added::
+        
+        effects['pew'] = 'pew1.wav'
+        effects['blast'] = ('blast1.wav','blast2.wav')
+    
+    When several files are given, the voices take turns among them, so that an
+    effect played repeatedly does not sound the same every time.  To play an effect,
+    call :meth:`play` with its key.  This picks a voice of that effect that is not
+    playing and starts it, which never waits for the sound.
+    
+    At most `limit` voices play at once over all of the effects.  When every voice of
+    an effect is busy, or the limit is reached, the voice that started first is
+    stopped and reused (that is, the oldest voice is stolen).
+    
+    Indexing the library returns the tuple of voices of an effect.  Voices preloaded by
+    a :class:`GPreloader` are used when an effect is added (see ``Sound.PRELOADED``),
+    so preload each file `voices` times.
+    """
+    
+    # MUTABLE PROPERTIES
+    @property
+    def limit(self):
+        """
+        The most voices that may play at once, over all of the effects.
+        
+        **Invariant**: Must be an int > 0.
+        """
+        return self._limit
+    
+    @limit.setter
+    def limit(self,value):
+        assert type(value) == int and value > 0, 'value %s is not a positive int' % repr(value)
+        self._limit = value
+    
+    # IMMUTABLE PROPERTIES
+    @property
+    def voices(self):
+        """
+        The number of voices of each file of an effect.
+        
+        **Immutable**: This value cannot be changed after the library is created.
+        
+        **Invariant**: Must be an int > 0.
+        """
+        return self._voices
+    
+    @property
+    def playing(self):
+        """
+        The number of voices playing right now.
+        
+        **Immutable**: This value cannot be changed.  You should use the :meth:`play` 
+        and :meth:`stop` methods to alter its value.
+        
+        **Invariant**: Must be an int >= 0.
+        """
+        self._prune()
+        return len(self._active)
+    
+    def __init__(self,voices=2,limit=8):
+        """
+        Creates a new, empty sound effect library.
+        
+        :param voices: The number of voices to load for each file of an effect
+        :type voices:  ``int`` > 0
+        
+        :param limit: The most voices that may play at once
+        :type limit:  ``int`` > 0
+        """
+        assert type(voices) == int and voices > 0, 'value %s is not a positive int' % repr(voices)
+        SoundLibrary.__init__(self)
+        self._voices = voices
+        self.limit = limit
+        self._next = {}
+        # The playing voices, from the oldest to the newest
+        self._active = []
+    
+    def __setitem__(self, key, filename):
+        """
+        Creates the voices of an effect from one or more files and assigns them the 
+        given name.
+        
+        :param key: The key identifying an effect
+        :type key:  ``str``
+        
+        :param filename: The file (or files) containing the sound source
+        :type filename:  ``str`` or ``tuple`` of ``str``
+        """
+        files = (filename,) if type(filename) == str else tuple(filename)
+        assert len(files) > 0, 'effect %s has no files' % repr(key)
+        if key in self._data:
+            del self[key]
+        voices = []
+        for pos in range(self._voices):
+            for name in files:
+                voices.append(Sound(name))
+        self._data[key] = tuple(voices)
+        self._next[key] = 0
+    
+    def __delitem__(self, key):
+        """
+        Stops and deletes the voices of an effect.
+        
+        :param key: The key identifying an effect
+        :type key:  ``str``
+        """
+        for voice in self._data[key]:
+            if voice in self._active:
+                voice.stop()
+                self._active.remove(voice)
+        del self._data[key]
+        del self._next[key]
+    
+    def play(self,key,volume=1):
+        """
+        Plays the effect with the given key on one of its voices.
+        
+        :param key: The key identifying an effect
+        :type key:  ``str``
+        
+        :param volume: The volume to play the effect at
+        :type volume:  ``int`` or ``float`` in 0..1
+        """
+        voices = self._data[key]
+        self._prune()
+        
+        # Take turns among the voices, skipping those still playing
+        start = self._next[key]
+        voice = None
+        for pos in range(len(voices)):
+            candidate = voices[(start+pos) % len(voices)]
+            if not candidate in self._active:
+                voice = candidate
+                self._next[key] = (start+pos+1) % len(voices)
+                break
+        if voice is None:
+            voice = self._oldest(voices)
+            self._steal(voice)
+        while len(self._active) >= self._limit:
+            self._steal(self._active[0])
+        
+        voice.volume = volume
+        voice.play()
+        self._active.append(voice)
+    
+    def stop(self):
+        """
+        Stops every voice that is playing.
+        """
+        for voice in self._active:
+            voice.stop()
+        self._active = []
+    
+    # HIDDEN METHODS
+    def _prune(self):
+        """
+        Forgets the voices that have finished playing.
+        """
+        if self._active:
+            self._active = [voice for voice in self._active if voice.playing]
+    
+    def _oldest(self,voices):
+        """
+        :return: The voice in voices that started playing first.
+        :rtype:  :class:`Sound`
+        
+        :param voices: The voices of an effect, all of them playing
+        :type voices:  ``tuple`` of :class:`Sound`
+        """
+        for voice in self._active:
+            if voice in voices:
+                return voice
+        return voices[0]
+    
+    def _steal(self,voice):
+        """
+        Stops a playing voice so that it can be played again.
+        
+        :param voice: The voice to stop
+        :type voice:  :class:`Sound`
+        """
+        voice.stop()
+        if voice in self._active:
+            self._active.remove(voice)
@@ -7,8 +7,8 @@ interact with on the screen is model: the ship, the laser bolts, and the aliens.
 Just because something is a model does not mean there has to be a special class for
 it.  Unless you need something special for your extra gameplay features, Ship and Aliens
 could just be an instance of GImage that you move across the screen. You only need a new
-class when you add extra features to an object. So technically Bolt, which has a velocity,
-is really the only model that needs to have its own class.
+class when you add extra features to an object. The laser bolts, which have a velocity, do
+not have a class of their own at all: they are kept in the arrays of BoltPool.
 
 With that said, we have included the subclasses for Ship and Aliens.  That is because
 there are a lot of constants in consts.py for initializing the objects, and you might
@@ -24,6 +24,7 @@ make a new class or not, please ask on Piazza.
 """
 from consts import *
 from game2d import *
+import numpy as np
 
 
 # PRIMARY RULE: Models are not allowed to access anything in any module other than
@@ -55,6 +56,13 @@ class Ship(GImage):
     features (like animation). If you add attributes, list them below.
 
     LIST MORE ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+
+    The ship can be drawn between two steps of the game (see draw).  Its x attribute
+    is always the position in the game; the position it is drawn at only changes
+    _sprite.
+
+        _last_x: the x position of the ship before the last step [float]
+        _sprite: the image that is drawn for the ship [GImage]
     """
     pass
 
@@ -80,6 +88,8 @@ class Ship(GImage):
         """
 
         super().__init__(x=a,y=b,width=SHIP_HEIGHT,height=SHIP_HEIGHT,source=source)
+        self._last_x = self.x
+        self._sprite = GImage(x=a,y=b,width=SHIP_HEIGHT,height=SHIP_HEIGHT,source=source)
     # METHODS TO MOVE THE SHIP AND CHECK FOR COLLISIONS
     def move_ship(self,direction):
         """
@@ -105,31 +115,31 @@ class Ship(GImage):
         if self.x >= GAME_WIDTH- SHIP_WIDTH/2:
             self.x -= SHIP_MOVEMENT
 
-    def detect_alien_bolt_collision(self,bolt):
+    def settle(self):
+        """
+        Remembers the position of the ship as the one before the next step
+
+        Call this method at the start of every step, before the ship moves.
         """
-        This method checks to see if an bolt fired from the ship has struck an alien if that is true it will
-        return True otherwise it will return False
+        self._last_x = self.x
 
-        Parameter bolt: an instance of Class Bolt
-        Precondition: bolt is of class bolt
+    def draw(self,view,blend=1.0):
         """
+        Draws the ship the given fraction of the way from its position before the
+        last step to its position in the game
 
-        # [x,y]
-        top_left_bolt = [bolt.get_bolt_x() - BOLT_WIDTH/2 , bolt.get_bolt_y() + BOLT_HEIGHT/2]
-        top_right_bolt = [bolt.get_bolt_x() + BOLT_WIDTH/2 , bolt.get_bolt_y() + BOLT_HEIGHT/2]
-        bottom_left_bolt = [bolt.get_bolt_x() - BOLT_WIDTH/2 , bolt.get_bolt_y() - BOLT_HEIGHT/2]
-        bottom_right_bolt =[bolt.get_bolt_x() + BOLT_WIDTH/2 , bolt.get_bolt_y() - BOLT_HEIGHT/2]
+        Only the image that is drawn moves; the ship itself stays where it is in the
+        game, so its x attribute can be read at any time.
 
-        if self.contains((top_left_bolt[0],top_left_bolt[1])):
-            return True
-        if self.contains((top_right_bolt[0],top_right_bolt[1])):
-            return True
-        if self.contains((bottom_left_bolt[0],bottom_left_bolt[1])):
-            return True
-        if self.contains((bottom_right_bolt[0],bottom_right_bolt[1])):
-            return True
+        Parameter view: the view to draw to
+        Precondition: view is a GView
+
+        Parameter blend: the fraction of the way to draw the ship at
+        Precondition: blend is a float in 0..1
+        """
+        self._sprite.x = self._last_x + blend*(self.x-self._last_x)
+        self._sprite.draw(view)
 
-        return False
     # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
 
 class Alien(GImage):
@@ -191,158 +201,412 @@ class Alien(GImage):
 
     # METHOD TO CHECK FOR COLLISION (IF DESIRED)
 
-    def detect_bolt_collision(self,bolt):
-        """
-        This method checks to see if an bolt fired from the ship has struck an alien if that is true it will
-        return True otherwise it will return False
+    # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
 
-        Parameter bolt: an instance of Class Bolt
-        Precondition: bolt is of class bolt
-        """
+class Barrier(GImage):
+    """
+    A class representing a defense barrier
 
-        # [x,y]
-        top_left_bolt = [bolt.get_bolt_x() - BOLT_WIDTH/2 , bolt.get_bolt_y() + BOLT_HEIGHT/2]
-        top_right_bolt = [bolt.get_bolt_x() + BOLT_WIDTH/2 , bolt.get_bolt_y() + BOLT_HEIGHT/2]
-        bottom_left_bolt = [bolt.get_bolt_x() - BOLT_WIDTH/2 , bolt.get_bolt_y() - BOLT_HEIGHT/2]
-        bottom_right_bolt =[bolt.get_bolt_x() + BOLT_WIDTH/2 , bolt.get_bolt_y() - BOLT_HEIGHT/2]
+    This barrier does not move the only attribute that matters is it health which starts at 10
+    and it decreases by one every time it is hit. At 0 it disappears and leaves the ship
+    defensless.
 
-        if self.contains((top_left_bolt[0],top_left_bolt[1])):
-            return True
-        if self.contains((top_right_bolt[0],top_right_bolt[1])):
-            return True
-        if self.contains((bottom_left_bolt[0],bottom_left_bolt[1])):
-            return True
-        if self.contains((bottom_right_bolt[0],bottom_right_bolt[1])):
-            return True
+    INSTANCE ATTRIBUTES:
+        _lives: Number of lives left [int >= 0]
+    """
+    def get_lives(self):
+        return self._lives
+        
+    def decrease_lives(self):
+        self._lives -= 1
 
-        return False
+    def __init__(self,x_pos,y_pos,height,width,lives):
+        self._lives = lives
+        super().__init__(x=x_pos,y=y_pos, width=width,height=height,source = "rock.png")
 
-    # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
 
-class Bolt(GRectangle):
+class Formation(object):
     """
-    A class representing a laser bolt.
+    A class storing the alien formation as a struct of NumPy arrays.
 
-    Laser bolts are often just thin, white rectangles.  The size of the bolt is
-    determined by constants in consts.py. We MUST subclass GRectangle, because we
-    need to add an extra attribute for the velocity of the bolt.
+    Wave keeps its aliens as a 2d list of Alien objects, and moving them means going
+    through the x and y setters of every one of them.  This class keeps the positions
+    and state of the whole formation in contiguous arrays instead, so that marching,
+    finding the edges of the formation, finding the lowest alien and counting the
+    dead are all one vectorized operation.
 
-    The class Wave will need to look at these attributes, so you will need getters for
-    them.  However, it is possible to write this assignment with no setters for the
-    velocities.  That is because the velocity is fixed and cannot change once the bolt
-    is fired.
+    The formation is drawn with one GSpriteBatch per alien image, so the whole
+    formation takes one draw call per image.  The batches are only rebuilt after
+    the formation marches or loses an alien.  The batches draw the filmstrips of
+    ALIEN_STRIPS, and a single GAnimator steps all of them to the next frame of
+    ALIEN_WALK every time that the formation marches.  The Alien objects themselves are
+    neither moved nor drawn; Wave finds the aliens through the lattice instead (see
+    Wave.alien_hit).
 
-    In addition to the getters, you need to write the __init__ method to set the starting
-    velocity. This __init__ method will need to call the __init__ from GRectangle as a
-    helper.
-
-    You also MIGHT want to create a method to move the bolt.  You move the bolt by adding
-    the velocity to the y-position.  However, the getter allows Wave to do this on its
-    own, so this method is not required.
+    All arrays are indexed [column][row], just like the 2d list of aliens.
 
     INSTANCE ATTRIBUTES:
-        _velocity: The velocity in y direction [int or float]
-        _kind: The kind of bolt (str) ['player' or 'alien']
+        _x:      the x position of each alien [2d numpy array of float]
+        _y:      the y position of each alien [2d numpy array of float]
+        _alive:  whether each alien is still alive [2d numpy array of bool]
+        _image:  the index in ALIEN_IMAGES of each alien [2d numpy array of int]
+        _batches: the sprites of the living aliens with each image [list of
+                  GSpriteBatch, one for each of ALIEN_STRIPS]
+        _batched: True if the batches agree with the arrays [bool]
+        _walk:    the animation of every batch [GAnimator with frames ALIEN_WALK]
+    """
 
-    LIST MORE ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
+    def get_dead_count(self):
+        """
+        Returns the number of dead aliens in the formation
+        """
+        return int(self._alive.size - np.count_nonzero(self._alive))
+
+    # INITIALIZER TO CREATE THE ARRAYS
+    def __init__(self,aliens):
+        """
+        Initializes the arrays from a 2d list of aliens
+
+        Parameter aliens: the aliens of the wave
+        Precondition: aliens is a nonempty rectangular 2d list of Alien or None
+        """
+        shape = (len(aliens),len(aliens[0]))
+        self._x = np.zeros(shape)
+        self._y = np.zeros(shape)
+        self._alive = np.zeros(shape,dtype=bool)
+        self._image = np.zeros(shape,dtype=int)
+        for column in range(shape[0]):
+            for row in range(shape[1]):
+                alien = aliens[column][row]
+                if alien != None:
+                    self._x[column,row] = alien.x
+                    self._y[column,row] = alien.y
+                    self._alive[column,row] = True
+                    self._image[column,row] = ALIEN_IMAGES.index(alien.source)
+        self._batches = [GSpriteBatch(width=ALIEN_WIDTH,height=ALIEN_HEIGHT,
+                                      source=source,format=ALIEN_FORMAT)
+                         for source in ALIEN_STRIPS]
+        self._batched = False
+        self._walk = GAnimator(ALIEN_WALK)
+        for batch in self._batches:
+            self._walk.add(batch)
+
+    # METHODS TO MOVE THE FORMATION AND REMOVE ALIENS
+    def march(self,dx,dy):
+        """
+        Moves every alien in the formation by (dx,dy)
+
+        The positions of dead aliens are moved too; that is cheaper than masking
+        them out and they are never read.  Every alien also takes a step of its
+        walk animation.
+
+        Parameter dx: the horizontal distance to move
+        Precondition: dx is an int or float
+
+        Parameter dy: the vertical distance to move
+        Precondition: dy is an int or float
+        """
+        if dx != 0:
+            self._x += dx
+        if dy != 0:
+            self._y += dy
+        self._batched = False
+        self._walk.advance()
+
+    def kill(self,column,row):
+        """
+        Marks the alien at column, row as dead
+
+        Parameter column: the column of the alien
+        Precondition: column is a valid column index of the formation
+
+        Parameter row: the row of the alien
+        Precondition: row is a valid row index of the formation
+        """
+        self._alive[column,row] = False
+        self._batched = False
+
+    def draw(self,view):
+        """
+        Draws the living aliens, one sprite batch for each alien image
+
+        Parameter view: the view to draw to
+        Precondition: view is a GView
+        """
+        if not self._batched:
+            for image in range(len(self._batches)):
+                mask = self._alive & (self._image == image)
+                self._batches[image].set_centers(self._x[mask].tolist(),
+                                                 self._y[mask].tolist())
+            self._batched = True
+        for batch in self._batches:
+            batch.draw(view)
+
+
+class BoltPool(object):
     """
+    A class storing every laser bolt on screen as a struct of NumPy arrays.
+
+    Creating a GRectangle for every shot and moving the bolts one at a time costs a
+    Python object (and its drawing instructions) per projectile per frame.  This
+    class keeps the position, velocity, kind and alive flag of each bolt in arrays
+    of a fixed capacity instead, so moving, homing and culling all the live bolts
+    is one vectorized operation.  A slot is taken from the free list when a bolt is
+    fired and given back when the bolt dies.
 
+    The bolts are drawn with two GSpriteBatch objects, one for each kind of bolt,
+    so all the bolts on screen take two draw calls.
+
+    A bolt is identified by its slot, an int in 0..capacity-1.
+
+    INSTANCE ATTRIBUTES:
+        _x:       the x position of each slot [1d numpy array of float]
+        _y:       the y position of each slot [1d numpy array of float]
+        _px:      the x position of each slot before the last step [1d numpy array
+                  of float]
+        _py:      the y position of each slot before the last step [1d numpy array
+                  of float]
+        _vy:      the vertical velocity of each slot [1d numpy array of float]
+        _alien:   whether each slot holds an alien bolt [1d numpy array of bool]
+        _alive:   whether each slot holds a live bolt [1d numpy array of bool]
+        _free:    the slots with no live bolt [list of int]
+        _live:    the slots with a live bolt, in order [1d numpy array of int, or
+                  None if it must be recomputed from _alive]
+        _batches: the sprites of the player bolts and of the alien bolts [pair of
+                  GSpriteBatch]
+    """
 
     # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
-    def get_kind_bolt(self):
-        return self._kind
+    def get_live(self,kind=None):
+        """
+        Returns the slots of the live bolts of the given kind, in slot order
 
-    def get_bolt_y(self):
-        return self.y
+        Parameter kind: the kind of bolt, or None for both kinds
+        Precondition: kind is None or a string of either "alien" or "player"
+        """
+        return self._get_slots(kind).tolist()
 
-    def get_bolt_x(self):
-        return self.x
-    # INITIALIZER TO SET THE VELOCITY
-    def __init__(self,x_pos, y_pos, velocity, kind, fillcolor = 'red'):
+    def get_kind(self,slot):
         """
-        Initializer for the Bolt Class
+        Returns the kind of the bolt in the given slot, 'alien' or 'player'
 
-        Parameter: x_pos is the x position of the Bolt
-        Precondition: x_pos is an int or float > 0
+        Parameter slot: the slot of the bolt
+        Precondition: slot is the slot of a live bolt
+        """
+        return 'alien' if self._alien[slot] else 'player'
 
-        Parameter: y_pos is the y position of the Bolt
-        Precondition: y_pos is an int or float > 0
+    def get_bounds(self,slot):
+        """
+        Returns the box of the bolt in the given slot as the tuple (left, bottom,
+        right, top), just like GObject.bounds
 
-        Parameter: velocity is the speed of the bolt
-        Precondition: velocity is an int or float > 0
+        Wave tests this box against the aliens of the lattice (see alien_hit).
 
-        Parameter: kind is the type of bolt
-        Precondition: kind is a string of either "alien" or "player"
+        Parameter slot: the slot of the bolt
+        Precondition: slot is the slot of a live bolt
+        """
+        x = float(self._x[slot])
+        y = float(self._y[slot])
+        return (x-BOLT_WIDTH/2, y-BOLT_HEIGHT/2, x+BOLT_WIDTH/2, y+BOLT_HEIGHT/2)
 
-        Parameter: fillcolor is the color of the bolt
-        Precondition: fillcolor is a string referencing a valid color
+    def get_count(self):
         """
-        self._velocity = velocity
-        self._kind = kind
-        super().__init__(x = x_pos, y=y_pos, width = BOLT_WIDTH, \
-        height = BOLT_HEIGHT, fillcolor=fillcolor)
-    # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
-    def move_bolt_up(self):
+        Returns the number of live bolts
         """
-        Changes the y position of the ship at a rate positive self._velocity
+        return len(self._alive) - len(self._free)
+
+    # INITIALIZER TO CREATE THE ARRAYS
+    def __init__(self,capacity=BOLT_CAPACITY):
         """
-        self.y += self._velocity
+        Initializes an empty pool
 
-    def move_bolt_down(self):
+        Parameter capacity: the largest number of bolts on screen at once
+        Precondition: capacity is an int > 0
         """
-        Changes the y position of the ship at a rate negative self._velocity
+        self._x = np.zeros(capacity)
+        self._y = np.zeros(capacity)
+        self._px = np.zeros(capacity)
+        self._py = np.zeros(capacity)
+        self._vy = np.zeros(capacity)
+        self._alien = np.zeros(capacity,dtype=bool)
+        self._alive = np.zeros(capacity,dtype=bool)
+        self._free = list(range(capacity-1,-1,-1))
+        self._live = None
+        self._batches = (GSpriteBatch(width=BOLT_WIDTH,height=BOLT_HEIGHT,fillcolor='red'),
+                         GSpriteBatch(width=BOLT_WIDTH,height=BOLT_HEIGHT,fillcolor='purple'))
+
+    # METHODS TO FIRE, MOVE AND REMOVE BOLTS
+    def fire(self,x,y,kind):
         """
-        self.y -= self._velocity
+        Fires a bolt from (x,y) and returns its slot, or None if the pool is full
 
-    def move_bolt_side(self, x_velocity):
+        Player bolts move up and alien bolts move down, both at BOLT_SPEED.
+
+        Parameter x: the x position of the new bolt
+        Precondition: x is an int or float
+
+        Parameter y: the y position of the new bolt
+        Precondition: y is an int or float
+
+        Parameter kind: the kind of bolt
+        Precondition: kind is a string of either "alien" or "player"
         """
-        Changes the x position of the ship
+        if len(self._free) == 0:
+            return None
+        slot = self._free.pop()
+        self._x[slot] = x
+        self._y[slot] = y
+        self._px[slot] = x
+        self._py[slot] = y
+        self._alien[slot] = kind == 'alien'
+        self._vy[slot] = -BOLT_SPEED if kind == 'alien' else BOLT_SPEED
+        self._alive[slot] = True
+        self._live = None
+        return slot
+
+    def kill(self,slot):
         """
-        self.x += x_velocity
+        Removes the bolt in the given slot, returning the slot to the free list
 
-class Barrier(GImage):
-    """
-    A class representing a defense barrier
+        Parameter slot: the slot of the bolt
+        Precondition: slot is the slot of a live bolt
+        """
+        self._alive[slot] = False
+        self._free.append(slot)
+        self._live = None
 
-    This barrier does not move the only attribute that matters is it health which starts at 10
-    and it decreases by one every time it is hit. At 0 it disappears and leaves the ship
-    defensless.
+    def kill_all(self,slots):
+        """
+        Removes the bolts in all of the given slots at once
 
-    INSTANCE ATTRIBUTES:
-        _lives: Number of lives left [int >= 0]
-    """
-    def get_lives(self):
-        return self._lives
-        
-    def decrease_lives(self):
-        self._lives -= 1
+        Parameter slots: the slots of the bolts
+        Precondition: slots is a list of distinct slots of live bolts
+        """
+        if len(slots) > 0:
+            self._alive[slots] = False
+            self._free.extend(slots)
+            self._live = None
 
-    def __init__(self,x_pos,y_pos,height,width,lives):
-        self._lives = lives
-        super().__init__(x=x_pos,y=y_pos, width=width,height=height,source = "rock.png")
+    def settle(self):
+        """
+        Remembers the position of every bolt as the one before the next step
+
+        Call this method at the start of every step, before the bolts move.
+        """
+        self._px[:] = self._x
+        self._py[:] = self._y
 
-    def detect_bolt_collision(self,bolt):
+    def move(self,target,drift):
         """
-        This method checks to see if a bolt fired from the ship or alien has struck the barrier if that is true it will
-        return True otherwise it will return False
+        Moves every live bolt one frame and removes the bolts that left the window.
+        Returns the number of player bolts removed (the missed shots).
+
+        Alien bolts are guided missiles: each one drifts a random 0..HEAT_SEEKING_DIFFICULTY
+        towards target after it moves down.  The drifts of all the alien bolts are
+        drawn at once from drift.
 
-        Parameter bolt: an instance of Class Bolt
-        Precondition: bolt is of class bolt
+        Parameter target: the x position the alien bolts home in on
+        Precondition: target is an int or float
+
+        Parameter drift: the random numbers for the drift of the alien bolts
+        Precondition: drift is a numpy.random.Generator
+        """
+        live = self._get_slots()
+        if len(live) == 0:
+            return 0
+        alien = self._alien[live]
+        y = self._y[live] + self._vy[live]
+        self._y[live] = y
+
+        homing = live[alien]
+        if len(homing) > 0:
+            steps = drift.integers(0,HEAT_SEEKING_DIFFICULTY,len(homing),endpoint=True)
+            self._x[homing] += np.sign(target-self._x[homing])*steps
+
+        gone = np.where(alien, y < 0, y >= GAME_HEIGHT)
+        if not gone.any():
+            return 0
+        missed = int(np.count_nonzero(gone & ~alien))
+        self._alive[live[gone]] = False
+        self._free.extend(live[gone].tolist())
+        self._live = live[~gone]
+        return missed
+
+    def collide(self,shapes,kind=None):
         """
+        Returns the pairs (slot, index) of every live bolt that overlaps one of the
+        shapes, where index is the position of the shape in shapes.  The pairs are
+        in slot order, and then in the order of shapes.
 
-        # [x,y]
-        top_left_bolt = [bolt.get_bolt_x() - BOLT_WIDTH/2 , bolt.get_bolt_y() + BOLT_HEIGHT/2]
-        top_right_bolt = [bolt.get_bolt_x() + BOLT_WIDTH/2 , bolt.get_bolt_y() + BOLT_HEIGHT/2]
-        bottom_left_bolt = [bolt.get_bolt_x() - BOLT_WIDTH/2 , bolt.get_bolt_y() - BOLT_HEIGHT/2]
-        bottom_right_bolt =[bolt.get_bolt_x() + BOLT_WIDTH/2 , bolt.get_bolt_y() - BOLT_HEIGHT/2]
+        All the bolts are tested against all the shapes at once, as bounding boxes
+        (see GObject.overlap_pairs).  Most frames no bolt is anywhere near the
+        shapes, so the bolts are first tested against one box around all of them.
 
-        if self.contains((top_left_bolt[0],top_left_bolt[1])):
-            return True
-        if self.contains((top_right_bolt[0],top_right_bolt[1])):
-            return True
-        if self.contains((bottom_left_bolt[0],bottom_left_bolt[1])):
-            return True
-        if self.contains((bottom_right_bolt[0],bottom_right_bolt[1])):
-            return True
+        Parameter shapes: the shapes to test the bolts against
+        Precondition: shapes is a list of GObject
+
+        Parameter kind: the kind of bolt to test, or None for both kinds
+        Precondition: kind is None or a string of either "alien" or "player"
+        """
+        slots = self._get_slots(kind)
+        if len(slots) == 0 or len(shapes) == 0:
+            return []
+        bounds = [shape.bounds for shape in shapes]
+        left = min(box[0] for box in bounds)-BOLT_WIDTH/2
+        bottom = min(box[1] for box in bounds)-BOLT_HEIGHT/2
+        right = max(box[2] for box in bounds)+BOLT_WIDTH/2
+        top = max(box[3] for box in bounds)+BOLT_HEIGHT/2
+        x = self._x[slots]
+        y = self._y[slots]
+        near = (x > left) & (x < right) & (y > bottom) & (y < top)
+        if not near.any():
+            return []
+
+        slots = slots[near]
+        x = x[near]
+        y = y[near]
+        boxes = np.stack((x-BOLT_WIDTH/2,y-BOLT_HEIGHT/2,x+BOLT_WIDTH/2,y+BOLT_HEIGHT/2),axis=1)
+        pairs = GObject.overlap_pairs(boxes,bounds)
+        pairs[:,0] = slots[pairs[:,0]]
+        return [tuple(pair) for pair in pairs.tolist()]
+
+    def draw(self,view,blend=1.0):
+        """
+        Draws every live bolt, one sprite batch for each kind of bolt
 
-        return False
+        Each bolt is drawn the fraction blend of the way from its position before
+        the last step to its position now.
+
+        Parameter view: the view to draw to
+        Precondition: view is a GView
+
+        Parameter blend: the fraction of the last step to draw the bolts at
+        Precondition: blend is a float in 0..1
+        """
+        for (kind,batch) in zip(['player','alien'],self._batches):
+            slots = self._get_slots(kind)
+            x = self._x[slots]
+            y = self._y[slots]
+            if blend != 1.0:
+                px = self._px[slots]
+                py = self._py[slots]
+                x = px+blend*(x-px)
+                y = py+blend*(y-py)
+            batch.set_centers(x.tolist(),y.tolist())
+            batch.draw(view)
+
+    # HELPER METHODS
+    def _get_slots(self,kind=None):
+        """
+        Returns the slots of the live bolts of the given kind as a numpy array, in
+        slot order
+
+        Parameter kind: the kind of bolt, or None for both kinds
+        Precondition: kind is None or a string of either "alien" or "player"
+        """
+        if self._live is None:
+            self._live = np.flatnonzero(self._alive)
+        if kind == None:
+            return self._live
+        return self._live[self._alien[self._live] == (kind == 'alien')]
@@ -0,0 +1,155 @@
+"""
+Headless simulation script for Alien Invaders
+
+This script plays waves of Alien Invaders with no window, as fast as it can, and reports
+how many frames it simulated per second.  It is meant for soak tests, balancing runs and
+benchmarks on machines with no display.  The ship is flown by a simple autopilot that
+sweeps back and forth across the screen while firing.
+
+The game runs headless (see game2d/headless.py), so Kivy is never imported.  As with the
+game itself, the first three command line arguments change the number of rows of aliens,
+the number of aliens per row, and the alien speed.  In addition you may give
+
+    --frames N   (the number of frames to simulate, default 10000)
+    --dt T       (the seconds per frame, default 1/60)
+    --seed S     (the seed of the first wave, default 0)
+    --replay F   (play back the keyboard recording F through the whole game instead,
+                  see the --record option of __main__.py)
+
+Every wave is seeded and updated at the fixed step GAME_STEP, through a GTimestep just
+like the game itself, so the same arguments always play exactly the same game.  A frame
+of dt seconds takes as many steps as fit in it.
+
+For example
+
+    python simulate.py 10 15 0.5 --frames 50000
+
+# John O'Donnel (jro79) and Anthony Nguyen (an523)
+# 4/27/2019
+"""
+import os
+os.environ['GAME2D_HEADLESS'] = '1'
+
+import sys
+import time
+
+from consts import *
+from game2d import *
+from wave import *
+from app import Invaders
+
+
+def option(name,default):
+    """
+    Returns the value given after the command line flag name, or default if the
+    flag is missing
+
+    Parameter name: the flag to look for
+    Precondition: name is a string starting with '--'
+
+    Parameter default: the value to use if the flag is missing
+    Precondition: default is a number
+    """
+    if name in sys.argv:
+        pos = sys.argv.index(name)
+        if pos+1 < len(sys.argv):
+            return type(default)(sys.argv[pos+1])
+    return default
+
+
+def autopilot():
+    """
+    Generates the keys held down in each frame: the ship sweeps left and right
+    across the screen, firing all the time
+    """
+    while True:
+        for frame in range(60):
+            yield ('left','spacebar')
+        for frame in range(120):
+            yield ('right','spacebar')
+        for frame in range(60):
+            yield ('left','spacebar')
+
+
+def simulate(frames,dt,seed):
+    """
+    Plays waves of the game for the given number of frames, starting a new wave
+    whenever the old one is over, and returns the triple (elapsed seconds, waves
+    played, aliens killed)
+
+    Parameter frames: the number of frames to simulate
+    Precondition: frames is an int > 0
+
+    Parameter dt: the time in seconds per frame (the wave is updated in steps of
+    GAME_STEP seconds, as many as fit)
+    Precondition: dt is a number > 0
+
+    Parameter seed: the seed of the first wave (each new wave adds one to it)
+    Precondition: seed is an int
+    """
+    view = NullView()
+    input = ScriptedInput(autopilot())
+    timestep = GTimestep(GAME_STEP)
+    wave = Wave(seed)
+    waves = 1
+    kills = 0
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        for count in range(timestep.advance(dt)):
+            input.advance()
+            wave.update(input,timestep.step)
+        wave.draw(view,timestep.blend)
+        if not wave.get_ship_alive():
+            wave.set_ship_alive()
+        if wave.get_dline_breached() or \
+        wave.get_dead_count() == ALIEN_ROWS * ALIENS_IN_ROW:
+            kills += wave.get_dead_count()
+            wave = Wave(seed+waves)
+            waves += 1
+    kills += wave.get_dead_count()
+    return (time.perf_counter()-start, waves, kills)
+
+
+def replay(filename):
+    """
+    Plays back a keyboard recording through the whole game, one frame per recorded
+    frame, and returns the pair (frames played, list of seconds spent on each frame)
+
+    Parameter filename: the recording to play back
+    Precondition: filename is a file written by GInput.start_recording
+    """
+    game = Invaders(width=GAME_WIDTH,height=GAME_HEIGHT,replay=filename)
+    game.build()
+    game.start()
+
+    times = []
+    while game.input.replaying:
+        start = time.perf_counter()
+        game._refresh(0)
+        times.append(time.perf_counter()-start)
+    return (len(times), times)
+
+
+# Application code
+if __name__ == '__main__':
+    GameApp.set_paths(os.path.dirname(os.path.abspath(__file__)))
+    frames = option('--frames',10000)
+    dt = option('--dt',1/60)
+    seed = option('--seed',0)
+    filename = option('--replay','')
+
+    if filename:
+        frames, times = replay(filename)
+        elapsed = sum(times)
+        times.sort()
+        print('%d frames replayed in %.3f seconds' % (frames,elapsed))
+        if frames:
+            print('frame time: median %.1f us, 99th percentile %.1f us, worst %.1f us' % \
+                  (1e6*times[frames//2],1e6*times[frames*99//100],1e6*times[-1]))
+        sys.exit(0)
+
+    elapsed, waves, kills = simulate(frames,dt,seed)
+    print('%d frames (%d waves of %dx%d aliens, %d killed) in %.3f seconds' % \
+          (frames,waves,ALIEN_ROWS,ALIENS_IN_ROW,kills,elapsed))
+    print('%.0f frames per second' % (frames/elapsed))
@@ -0,0 +1,20 @@
+"""
+Test configuration for Alien Invaders
+
+The tests run game2d headless (see game2d/headless.py), so they need no window,
+graphics card or sound device.  The game modules live at the top of the repository,
+so it is put first on the path (the module wave.py must win over the standard one).
+
+# John O'Donnel (jro79) and Anthony Nguyen (an523)
+# 4/27/2019
+"""
+import os
+import sys
+
+os.environ['GAME2D_HEADLESS'] = '1'
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if not ROOT in sys.path:
+    sys.path.insert(0,ROOT)
+
+from game2d import GameApp
+GameApp.set_paths(ROOT)
@@ -0,0 +1,111 @@
+"""
+Tests for the slots of BoltPool
+
+Every laser bolt lives in a slot of the arrays of a BoltPool.  A slot is taken from
+the free list when a bolt is fired and given back when the bolt is killed or leaves
+the window.  These tests check that the slots are reused and the live bolts stay
+correct.
+
+# John O'Donnel (jro79) and Anthony Nguyen (an523)
+# 4/27/2019
+"""
+import numpy as np
+from consts import *
+from models import BoltPool
+
+
+def test_fire_takes_free_slots():
+    """
+    Checks that bolts take the lowest free slots and keep their kind
+    """
+    pool = BoltPool(capacity=8)
+    assert pool.fire(100,100,'player') == 0
+    assert pool.fire(200,500,'alien') == 1
+    assert pool.fire(300,100,'player') == 2
+    assert pool.get_count() == 3
+    assert pool.get_live() == [0,1,2]
+    assert pool.get_live('player') == [0,2]
+    assert pool.get_live('alien') == [1]
+    assert pool.get_kind(1) == 'alien'
+    assert pool.get_kind(2) == 'player'
+
+
+def test_kill_reuses_slot():
+    """
+    Checks that a killed slot is the next one fired into, with the new bolt's state
+    """
+    pool = BoltPool(capacity=8)
+    for x in range(4):
+        pool.fire(100*x,100,'player')
+    pool.kill(1)
+    assert pool.get_live() == [0,2,3]
+    assert pool.get_count() == 3
+    assert pool.fire(50,500,'alien') == 1
+    assert pool.get_live() == [0,1,2,3]
+    assert pool.get_kind(1) == 'alien'
+    assert pool.get_bounds(1) == (50-BOLT_WIDTH/2,500-BOLT_HEIGHT/2,50+BOLT_WIDTH/2,500+BOLT_HEIGHT/2)
+
+
+def test_kill_all_reuses_slots():
+    """
+    Checks that the slots of bolts killed together are all reused
+    """
+    pool = BoltPool(capacity=8)
+    for x in range(6):
+        pool.fire(100*x,100,'player')
+    pool.kill_all([1,3,4])
+    assert pool.get_live() == [0,2,5]
+    fired = [pool.fire(0,100,'player') for x in range(3)]
+    assert sorted(fired) == [1,3,4]
+    assert pool.fire(0,100,'player') == 6
+
+
+def test_full_pool():
+    """
+    Checks that a full pool refuses bolts until a slot is free again
+    """
+    pool = BoltPool(capacity=4)
+    for x in range(4):
+        assert pool.fire(100*x,100,'player') == x
+    assert pool.fire(0,100,'player') == None
+    assert pool.get_count() == 4
+    pool.kill(2)
+    assert pool.fire(0,100,'alien') == 2
+    assert pool.fire(0,100,'player') == None
+
+
+def test_move_frees_slots():
+    """
+    Checks that bolts leaving the window give their slots back, counting missed shots
+    """
+    pool = BoltPool(capacity=8)
+    pool.fire(100,GAME_HEIGHT-1,'player')
+    pool.fire(100,GAME_HEIGHT/2,'player')
+    pool.fire(100,1,'alien')
+    pool.fire(100,GAME_HEIGHT/2,'alien')
+    missed = pool.move(100,np.random.default_rng(0))
+    assert missed == 1
+    assert pool.get_live() == [1,3]
+    assert pool.get_count() == 2
+    assert sorted([pool.fire(0,100,'player'),pool.fire(0,100,'player')]) == [0,2]
+    assert pool.get_live() == [0,1,2,3]
+
+
+def test_reuse_many_times():
+    """
+    Checks that firing and killing far more bolts than the capacity never loses a slot
+    """
+    pool = BoltPool(capacity=4)
+    rng = np.random.default_rng(1)
+    live = set()
+    for step in range(1000):
+        if live and (len(live) == 4 or rng.random() < 0.5):
+            slot = sorted(live)[int(rng.integers(len(live)))]
+            pool.kill(slot)
+            live.remove(slot)
+        else:
+            slot = pool.fire(0,100,'player')
+            assert not slot in live
+            live.add(slot)
+        assert pool.get_live() == sorted(live)
+        assert pool.get_count() == len(live)
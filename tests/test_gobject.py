@@ -0,0 +1,162 @@
+"""
+Tests for the vectorized point and box queries of GObject
+
+GObject.contains_points tests many points at once, and GObject.intersects and
+GObject.overlap_pairs test bounding boxes.  These tests compare them with the scalar
+test GObject.contains, on shapes that are moved, rotated and scaled.
+
+# John O'Donnel (jro79) and Anthony Nguyen (an523)
+# 4/27/2019
+"""
+import numpy as np
+from game2d import GObject, GRectangle, GImage
+from introcs.geom import Point2
+
+
+def make_shapes():
+    """
+    Returns a list of shapes in a variety of positions, angles and scales
+    """
+    result = []
+    for angle in [0,30,45,90,135,200]:
+        for scale in [1,2,(2,0.5),(0.75,1.5)]:
+            shape = GRectangle(x=50,y=40,width=30,height=12,fillcolor='red')
+            shape.angle = angle
+            shape.scale = scale
+            result.append(shape)
+    result.append(GImage(x=-20,y=10,width=33,height=33,source='ship.png',angle=10))
+    return result
+
+
+def random_points(rng,count):
+    """
+    Returns an count x 2 array of random points around the shapes of make_shapes
+
+    Parameter rng: the random number generator
+    Precondition: rng is a numpy.random.Generator
+
+    Parameter count: the number of points
+    Precondition: count is an int >= 0
+    """
+    return rng.uniform(-60,120,(count,2))
+
+
+def inner_corner(shape,sx,sy):
+    """
+    Returns the point half a unit inside a corner of shape, in window coordinates
+
+    Like contains, this point is only scaled if the shape is rotated.
+
+    Parameter shape: the shape
+    Precondition: shape is a GObject
+
+    Parameter sx: the horizontal side of the corner
+    Precondition: sx is -1 (left) or 1 (right)
+
+    Parameter sy: the vertical side of the corner
+    Precondition: sy is -1 (bottom) or 1 (top)
+    """
+    x = sx*(shape.width/2-0.5)
+    y = sy*(shape.height/2-0.5)
+    if shape.angle == 0:
+        return (shape.x+x, shape.y+y)
+    return tuple(shape.matrix._transform(x,y))[:2]
+
+
+def test_contains_points_matches_contains():
+    """
+    Checks contains_points against contains on every point, for every shape
+    """
+    rng = np.random.default_rng(0)
+    for shape in make_shapes():
+        points = random_points(rng,2000)
+        found = shape.contains_points(points)
+        assert found.dtype == bool
+        assert found.shape == (2000,)
+        assert found.tolist() == [shape.contains(tuple(point)) for point in points.tolist()]
+        assert found.any()
+
+
+def test_contains_points_inputs():
+    """
+    Checks that contains_points takes lists of pairs, arrays and no points at all
+    """
+    shape = GRectangle(x=0,y=0,width=10,height=10,angle=45)
+    points = [(0,0),(6,0),(4.9,0),(3,3),(4,4)]
+    expected = [shape.contains(point) for point in points]
+    assert expected == [True,True,True,True,False]
+    assert shape.contains_points(points).tolist() == expected
+    assert shape.contains_points(np.array(points)).tolist() == expected
+    assert shape.contains(Point2(6,0))
+    assert shape.contains_points([]).tolist() == []
+
+
+def test_contains_points_after_change():
+    """
+    Checks that contains_points follows the shape after it moves, turns or scales
+    """
+    rng = np.random.default_rng(1)
+    shape = GRectangle(x=50,y=40,width=30,height=12,angle=30)
+    points = random_points(rng,500)
+    shape.contains_points(points)
+    for (name, value) in [('x',20),('y',70),('angle',75),('scale',(1.5,0.5)),('angle',0)]:
+        setattr(shape,name,value)
+        expected = [shape.contains(tuple(point)) for point in points.tolist()]
+        assert shape.contains_points(points).tolist() == expected
+
+
+def test_bounds_hold_contained_points():
+    """
+    Checks that the bounds of every shape hold every point it contains, tightly
+    """
+    rng = np.random.default_rng(2)
+    for shape in make_shapes():
+        (left, bottom, right, top) = shape.bounds
+        points = random_points(rng,4000)
+        inside = points[shape.contains_points(points)]
+        assert (inside[:,0] > left).all() and (inside[:,0] < right).all()
+        assert (inside[:,1] > bottom).all() and (inside[:,1] < top).all()
+        # Points just inside the corners of the shape reach each side of the box
+        corners = np.array([inner_corner(shape,sx,sy) for sx in [-1,1] for sy in [-1,1]])
+        assert shape.contains_points(corners).all()
+        assert corners[:,0].min()-left < 2 and right-corners[:,0].max() < 2
+        assert corners[:,1].min()-bottom < 2 and top-corners[:,1].max() < 2
+
+
+def test_intersects_matches_overlap_pairs():
+    """
+    Checks intersects against overlap_pairs, and against shared contained points
+    """
+    rng = np.random.default_rng(3)
+    shapes = make_shapes()
+    for shape in shapes:
+        shape.x = float(rng.uniform(0,100))
+        shape.y = float(rng.uniform(0,80))
+    pairs = GObject.overlap_pairs(shapes)
+    found = set(map(tuple,pairs.tolist()))
+    points = random_points(rng,4000)
+    contained = [shape.contains_points(points) for shape in shapes]
+    for i in range(len(shapes)):
+        for j in range(i+1,len(shapes)):
+            hit = shapes[i].intersects(shapes[j])
+            assert hit == shapes[j].intersects(shapes[i])
+            assert hit == ((i,j) in found)
+            if (contained[i] & contained[j]).any():
+                assert hit
+
+
+def test_overlap_pairs_groups():
+    """
+    Checks that overlap_pairs gives the same pairs for shapes and for their boxes
+    """
+    shapes = make_shapes()
+    boxes = np.array([shape.bounds for shape in shapes])
+    first = GObject.overlap_pairs(shapes[:10],shapes[10:])
+    assert first.tolist() == GObject.overlap_pairs(boxes[:10],boxes[10:]).tolist()
+    assert first.tolist() == GObject.overlap_pairs(boxes[:10].tolist(),shapes[10:]).tolist()
+    for (i, j) in first.tolist():
+        assert shapes[i].intersects(shapes[10+j])
+    assert GObject.overlap_pairs([],shapes).shape == (0,2)
+    # Boxes that only touch do not overlap
+    touching = [(0,0,10,10),(10,0,20,10),(0,10,10,20)]
+    assert GObject.overlap_pairs(touching).tolist() == []
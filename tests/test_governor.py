@@ -0,0 +1,177 @@
+"""
+Tests for the adaptive frame rate of GGovernor
+
+Each test feeds GGovernor.observe a fixed sequence of frame costs, as GameApp would
+at the end of every frame, and checks the frame rates that it picks.  The costs do
+not depend on the clock, so the rates are always the same.
+
+# John O'Donnel (jro79) and Anthony Nguyen (an523)
+# 4/27/2019
+"""
+from consts import *
+from game2d import GGovernor
+
+
+def run(governor,fps,frames,busy,interval=None,update=0.0):
+    """
+    Returns the list of frame rates picked by governor over the given frames
+
+    Each cost may be a number, or a function that takes the current frame rate and
+    returns the cost of a frame at that rate.
+
+    Parameter governor: the governor to observe the frames
+    Precondition: governor is a GGovernor
+
+    Parameter fps: the frame rate of the first frame
+    Precondition: fps is an int > 0
+
+    Parameter frames: the number of frames
+    Precondition: frames is an int >= 0
+
+    Parameter busy: the time in seconds spent in each frame
+    Precondition: busy is a number >= 0 or a function returning one
+
+    Parameter interval: the time in seconds between frames, or None if unknown
+    Precondition: interval is None, a number >= 0 or a function returning one
+
+    Parameter update: the part of busy spent on updates at a fixed step
+    Precondition: update is a number >= 0 or a function returning one
+    """
+    result = []
+    for frame in range(frames):
+        cost = busy(fps) if callable(busy) else busy
+        gap = interval(fps) if callable(interval) else interval
+        part = update(fps) if callable(update) else update
+        fps = governor.observe(cost,fps,gap,part)
+        result.append(fps)
+    return result
+
+
+def changes(rates,fps):
+    """
+    Returns the list of (frame, rate) pairs at which the rate changed
+
+    Parameter rates: the rates picked in each frame
+    Precondition: rates is a list of numbers
+
+    Parameter fps: the rate before the first frame
+    Precondition: fps is a number
+    """
+    result = []
+    for frame in range(len(rates)):
+        if rates[frame] != fps:
+            fps = rates[frame]
+            result.append((frame,fps))
+    return result
+
+
+def test_light_load_keeps_high():
+    """
+    Checks that a game with little to do stays at the highest rate
+    """
+    governor = GGovernor(MIN_FPS,MAX_FPS)
+    rates = run(governor,MAX_FPS,1000,0.002,lambda fps: 1.0/fps)
+    assert rates == [MAX_FPS]*1000
+
+
+def test_lower_under_load():
+    """
+    Checks that a game that draws too slowly drops to the rate that fits LOWER
+    """
+    governor = GGovernor(MIN_FPS,MAX_FPS)
+    rates = run(governor,MAX_FPS,1000,0.020)
+    # 20ms a frame fits in 85% of a second at 42 fps, rounded down to 40
+    assert changes(rates,MAX_FPS) == [(GGovernor.HOLD,40)]
+    assert abs(governor.load-0.8) < 1e-9
+
+
+def test_lower_with_fixed_step_updates():
+    """
+    Checks that updates at a fixed step count per second, not per frame
+    """
+    governor = GGovernor(MIN_FPS,MAX_FPS)
+    # 10ms for each of 60 updates a second, and 5ms to draw a frame
+    update = lambda fps: 0.010*60/fps
+    busy = lambda fps: update(fps)+0.005
+    rates = run(governor,MAX_FPS,1000,busy,None,update)
+    assert changes(rates,MAX_FPS) == [(GGovernor.HOLD,50)]
+
+
+def test_raise_again():
+    """
+    Checks that the rate goes back up a STEP at a time once the load drops
+    """
+    governor = GGovernor(MIN_FPS,MAX_FPS)
+    rates = run(governor,MAX_FPS,200,0.020)
+    assert rates[-1] == 40
+    rates = run(governor,40,1000,0.005)
+    steps = changes(rates,40)
+    assert [fps for (frame,fps) in steps] == [45,50,55,60]
+    for pos in range(1,len(steps)):
+        assert steps[pos][0]-steps[pos-1][0] == GGovernor.HOLD+1
+    assert max(rates) == MAX_FPS
+
+
+def test_hold():
+    """
+    Checks that the rate never changes within HOLD frames of the start or a change
+    """
+    governor = GGovernor(MIN_FPS,MAX_FPS)
+    rates = run(governor,MAX_FPS,GGovernor.HOLD,0.100)
+    assert rates == [MAX_FPS]*GGovernor.HOLD
+    rates = run(governor,MAX_FPS,1,0.100)
+    assert rates == [MIN_FPS]
+    rates = run(governor,MIN_FPS,GGovernor.HOLD,0.001)
+    assert rates == [MIN_FPS]*GGovernor.HOLD
+    rates = run(governor,MIN_FPS,30,0.001)
+    assert rates[-1] == MIN_FPS+GGovernor.STEP
+
+
+def test_probe():
+    """
+    Checks that a rate that made the frames late is not tried again for PROBE frames
+    """
+    governor = GGovernor(MIN_FPS,MAX_FPS)
+    # Little Python time, but the frames cannot come faster than every 27ms
+    late = lambda fps: max(1.0/fps,0.027)
+    rates = run(governor,MAX_FPS,3000,0.003,late)
+    steps = changes(rates,MAX_FPS)
+    assert steps[0] == (GGovernor.HOLD,MIN_FPS)
+    assert min(rates) == MIN_FPS
+
+    # 50 fps makes the frames late, so the rate drops and waits before trying it again
+    tries = [frame for (frame,fps) in steps if fps == 50]
+    assert len(tries) >= 2
+    for pos in range(1,len(tries)):
+        drop = [frame for (frame,fps) in steps if tries[pos-1] < frame < tries[pos]][0]
+        assert tries[pos]-drop >= GGovernor.PROBE-1
+    assert max(rates[GGovernor.HOLD:]) == 50
+
+
+def test_clamp():
+    """
+    Checks that the rate stays between MIN_FPS and MAX_FPS
+    """
+    governor = GGovernor(MIN_FPS,MAX_FPS)
+    # The updates alone take all of every second, so no rate is fast enough
+    update = lambda fps: 0.016*60/fps
+    rates = run(governor,MAX_FPS,1000,update,None,update)
+    assert changes(rates,MAX_FPS) == [(GGovernor.HOLD,MIN_FPS)]
+
+    governor = GGovernor(MIN_FPS,MAX_FPS)
+    rates = run(governor,2*MAX_FPS,1000,0.0001)
+    assert rates == [MAX_FPS]*1000
+    governor = GGovernor(MIN_FPS,MAX_FPS)
+    rates = run(governor,MIN_FPS//2,1,0.0001)
+    assert rates == [MIN_FPS]
+
+
+def test_spike_ignored():
+    """
+    Checks that one very slow frame (such as loading a file) does not lower the rate
+    """
+    governor = GGovernor(MIN_FPS,MAX_FPS)
+    rates = run(governor,MAX_FPS,100,0.004,1.0/MAX_FPS)
+    rates += run(governor,MAX_FPS,1,0.800,0.800)
+    rates += run(governor,MAX_FPS,1000,0.004,1.0/MAX_FPS)
+    assert rates == [MAX_FPS]*1101
@@ -0,0 +1,170 @@
+"""
+Tests for the preloading of assets with GPreloader
+
+A preloader decodes the images in a worker thread, and finishes them, the fonts and
+the sounds on the main thread.  Headless, nothing is decoded, so the tests of the
+worker thread stand in a tiny image loader for the Kivy one, which records the thread
+it runs on.
+
+# John O'Donnel (jro79) and Anthony Nguyen (an523)
+# 4/27/2019
+"""
+import sys
+import types
+import threading
+import pytest
+from game2d import GameApp, GlyphAtlas, GPreloader
+from game2d import gloader, sound
+from game2d.sound import Sound
+
+
+# A small manifest of the files of the game
+IMAGES = ['space.png','ship.png']
+FONTS  = [('Arcade',40),('Arcade',20)]
+SOUNDS = ['pew1.wav','pew1.wav','pop1.wav']
+
+
+@pytest.fixture(autouse=True)
+def caches(monkeypatch):
+    """
+    Gives every test empty caches of textures, glyph atlases and sounds
+    """
+    monkeypatch.setattr(GameApp,'TEXTURE_CACHE',{})
+    monkeypatch.setattr(GlyphAtlas,'ATLAS_CACHE',{})
+    monkeypatch.setattr(Sound,'PRELOADED',{})
+
+
+@pytest.fixture
+def threads(monkeypatch):
+    """
+    Runs the preloader as if it were not headless, with a stand-in image loader
+
+    Returns a dictionary with the list of threads that decoded images ('image') and
+    loaded sounds ('sound').  The image 'rock.png' cannot be decoded.
+    """
+    result = {'image':[], 'sound':[]}
+
+    class ImageLoader(object):
+        @staticmethod
+        def load(path,keep_data=False):
+            result['image'].append(threading.current_thread())
+            if path.endswith('rock.png'):
+                raise ValueError('cannot decode %s' % path)
+            return ('decoded',path)
+
+    class Image(object):
+        def __init__(self,data):
+            self.texture = ('texture',data[1])
+
+    module = types.ModuleType('kivy.core.image')
+    module.ImageLoader = ImageLoader
+    module.Image = Image
+    monkeypatch.setitem(sys.modules,'kivy.core.image',module)
+    monkeypatch.setattr(gloader,'HEADLESS',False)
+
+    loader = sound.SoundLoader
+    class SoundLoader(object):
+        @staticmethod
+        def load(name):
+            result['sound'].append(threading.current_thread())
+            return loader.load(name)
+    monkeypatch.setattr(sound,'SoundLoader',SoundLoader)
+    return result
+
+
+def test_headless_manifest():
+    """
+    Checks the progress and the caches as a manifest is finished over many frames
+    """
+    preloader = GPreloader(IMAGES,FONTS,SOUNDS)
+    assert preloader.progress == 0
+    assert not preloader.done
+    preloader.start()
+    progress = [preloader.progress]
+    while not preloader.done:
+        preloader.update()
+        progress.append(preloader.progress)
+    assert progress == sorted(progress)
+    assert progress[-1] == 1.0
+    assert preloader._finished == len(IMAGES)+len(FONTS)+len(SOUNDS)
+    # The fonts and the sounds take one update each
+    assert len(progress)-1 >= len(FONTS)+len(SOUNDS)
+
+    for pair in FONTS:
+        assert pair in GlyphAtlas.ATLAS_CACHE
+    assert len(Sound.PRELOADED['pew1.wav']) == 2
+    assert len(Sound.PRELOADED['pop1.wav']) == 1
+    preloaded = Sound.PRELOADED['pop1.wav'][0]
+    assert Sound('pop1.wav')._sound is preloaded
+    assert Sound.PRELOADED['pop1.wav'] == []
+
+
+def test_empty_manifest():
+    """
+    Checks that a preloader with nothing to load is done at once
+    """
+    preloader = GPreloader()
+    assert preloader.done
+    assert preloader.progress == 1.0
+    preloader.start()
+    preloader.update()
+    assert preloader.done
+
+
+def test_worker_thread(threads):
+    """
+    Checks that images are decoded in the worker thread, and the rest on the main one
+    """
+    preloader = GPreloader(IMAGES,FONTS,SOUNDS)
+    preloader.start()
+    preloader.finish()
+    assert preloader.done
+    for name in IMAGES:
+        (kind, path) = GameApp.TEXTURE_CACHE[name]
+        assert kind == 'texture' and path.endswith(name)
+    assert len(threads['image']) == len(IMAGES)
+    for thread in threads['image']:
+        assert thread is not threading.main_thread()
+    assert threads['sound'] == [threading.main_thread()]*len(SOUNDS)
+    for pair in FONTS:
+        assert pair in GlyphAtlas.ATLAS_CACHE
+    assert len(Sound.PRELOADED['pew1.wav']) == 2
+
+
+def test_missing_file():
+    """
+    Checks that a file that does not exist is refused when the preloader is made
+    """
+    with pytest.raises(AssertionError):
+        GPreloader(images=['missing.png'])
+    with pytest.raises(AssertionError):
+        GPreloader(sounds=['missing.wav'])
+
+
+def test_unreadable_image(threads):
+    """
+    Checks that an image that cannot be decoded is reported, with the decoder error
+    """
+    preloader = GPreloader(['space.png','rock.png'])
+    preloader.start()
+    with pytest.raises(IOError) as info:
+        preloader.finish()
+    assert 'rock.png' in str(info.value)
+    assert isinstance(info.value.__cause__,ValueError)
+    assert 'space.png' in GameApp.TEXTURE_CACHE
+
+
+def test_unreadable_sound(monkeypatch):
+    """
+    Checks that a sound that cannot be loaded is reported
+    """
+    class SoundLoader(object):
+        @staticmethod
+        def load(name):
+            return None
+    monkeypatch.setattr(sound,'SoundLoader',SoundLoader)
+    preloader = GPreloader(sounds=['pew1.wav'])
+    preloader.start()
+    with pytest.raises(IOError):
+        while not preloader.done:
+            preloader.update()
@@ -0,0 +1,196 @@
+"""
+Tests for the frame times of GProfiler
+
+The profiler reads the clock time.perf_counter.  These tests replace that clock by
+one that only moves when told to, so that every phase takes a fixed time, and then
+check the reported percentiles and the totals of nested phases.  The times are whole
+milliseconds, which are close enough to exact for the comparisons below.
+
+# John O'Donnel (jro79) and Anthony Nguyen (an523)
+# 4/27/2019
+"""
+import types
+import pytest
+from game2d import GProfiler
+from game2d import gprofile
+
+
+class Clock(object):
+    """
+    A clock that only moves when told to
+    """
+
+    def __init__(self):
+        """
+        Creates a clock at time 0
+        """
+        self.now = 0.0
+
+    def __call__(self):
+        """
+        Returns the time in seconds
+        """
+        return self.now
+
+    def wait(self,ms):
+        """
+        Moves the clock forward
+
+        Parameter ms: the time to move forward in milliseconds
+        Precondition: ms is a number >= 0
+        """
+        self.now += ms/1000.0
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    Returns the clock that the profiler reads
+    """
+    result = Clock()
+    monkeypatch.setattr(gprofile,'time',types.SimpleNamespace(perf_counter=result))
+    return result
+
+
+def percentile(values,q):
+    """
+    Returns the q-th percentile of values, interpolating between the nearest ranks
+
+    Parameter values: the values
+    Precondition: values is a non-empty list of numbers
+
+    Parameter q: the percentile
+    Precondition: q is a number in 0..100
+    """
+    values = sorted(values)
+    rank = q/100.0*(len(values)-1)
+    below = int(rank)
+    above = min(below+1,len(values)-1)
+    return values[below]+(rank-below)*(values[above]-values[below])
+
+
+def play(profiler,clock,update,collide,draw):
+    """
+    Times one frame with an update phase that holds two collision phases, and a draw
+
+    Parameter profiler: the profiler to time the frame
+    Precondition: profiler is a GProfiler
+
+    Parameter clock: the clock that the profiler reads
+    Precondition: clock is a Clock
+
+    Parameter update: the time in milliseconds of the update, outside the collisions
+    Precondition: update is a number >= 0
+
+    Parameter collide: the time in milliseconds of each collision phase
+    Precondition: collide is a number >= 0
+
+    Parameter draw: the time in milliseconds of the draw
+    Precondition: draw is a number >= 0
+    """
+    profiler.begin_frame()
+    clock.wait(1)
+    with profiler.phase('update'):
+        clock.wait(update)
+        for pos in range(2):
+            with profiler.phase('collide'):
+                clock.wait(collide)
+    with profiler.phase('draw'):
+        clock.wait(draw)
+    profiler.end_frame()
+
+
+def assert_stats(stats,expected):
+    """
+    Checks that stats (in seconds) match expected (in milliseconds)
+
+    Parameter stats: the reported times
+    Precondition: stats is a tuple of three numbers
+
+    Parameter expected: the expected times
+    Precondition: expected is a tuple of three numbers
+    """
+    assert stats == pytest.approx(tuple(ms/1000.0 for ms in expected))
+
+
+def test_percentiles(clock):
+    """
+    Checks the current, median and 99th percentile time of each phase
+    """
+    profiler = GProfiler(size=100,enabled=True)
+    draws = [(17*pos) % 100+1 for pos in range(100)]
+    for pos in range(100):
+        play(profiler,clock,pos % 10,2,draws[pos])
+    assert profiler.frames == 100
+    assert profiler.phases == ['update','collide','draw']
+
+    draw = (draws[-1],percentile(draws,50),percentile(draws,99))
+    assert draw[1:] == (50.5,99.01)
+    assert_stats(profiler.stats('draw'),draw)
+    assert_stats(profiler.stats('collide'),(4,4,4))
+    updates = [pos % 10+4 for pos in range(100)]
+    assert_stats(profiler.stats('update'),(13,percentile(updates,50),percentile(updates,99)))
+    frames = [1+updates[pos]+draws[pos] for pos in range(100)]
+    assert_stats(profiler.stats(),(frames[-1],percentile(frames,50),percentile(frames,99)))
+
+
+def test_nested_totals(clock):
+    """
+    Checks that a phase holds the phases nested in it, and repeats are added up
+    """
+    profiler = GProfiler(size=10,enabled=True)
+    play(profiler,clock,3,5,7)
+    # The update takes 3ms of its own and two collisions of 5ms
+    assert_stats(profiler.stats('collide'),(10,10,10))
+    assert_stats(profiler.stats('update'),(13,13,13))
+    assert_stats(profiler.stats('draw'),(7,7,7))
+    assert_stats(profiler.stats(),(21,21,21))
+
+    rows = profiler.report()
+    assert rows[0] == ('ms','now','p50','p99')
+    assert rows[1] == ('frame','21.00','21.00','21.00')
+    assert rows[2] == ('  update','13.00','13.00','13.00')
+    assert rows[3] == ('    collide','10.00','10.00','10.00')
+    assert rows[4] == ('  draw','7.00','7.00','7.00')
+
+
+def test_missing_phase(clock):
+    """
+    Checks that a phase that does not run in a frame takes 0 in that frame
+    """
+    profiler = GProfiler(size=10,enabled=True)
+    play(profiler,clock,2,1,2)
+    profiler.begin_frame()
+    clock.wait(6)
+    profiler.end_frame()
+    assert_stats(profiler.stats('draw'),(0,1,1.98))
+    assert_stats(profiler.stats(),(6,6.5,6.99))
+
+
+def test_ring_buffer(clock):
+    """
+    Checks that the percentiles only use the last size frames
+    """
+    profiler = GProfiler(size=4,enabled=True)
+    for draw in [100,100,100,1,2,3,4]:
+        play(profiler,clock,0,0,draw)
+    assert profiler.frames == 7
+    assert_stats(profiler.stats('draw'),(4,2.5,percentile([1,2,3,4],99)))
+
+
+def test_disabled(clock):
+    """
+    Checks that a disabled profiler records nothing, and enabling it starts afresh
+    """
+    profiler = GProfiler()
+    play(profiler,clock,1,1,1)
+    assert profiler.frames == 0
+    assert profiler.phases == []
+    assert profiler.stats() == (0.0,0.0,0.0)
+
+    profiler.enabled = True
+    play(profiler,clock,1,1,1)
+    profiler.enabled = False
+    profiler.enabled = True
+    assert profiler.frames == 0
+    assert profiler.stats('draw') == (0.0,0.0,0.0)
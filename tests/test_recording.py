@@ -0,0 +1,142 @@
+"""
+Tests for recording and playing back the keyboard
+
+A recording made with GInput.start_recording must play back the same keys and frame
+times with GInput.start_replay, and a replayed game must play exactly the same game
+as its recording.  The recording is written as it goes, so a recording that was never
+stopped (as after a crash) must still play back the frames written so far.
+
+# John O'Donnel (jro79) and Anthony Nguyen (an523)
+# 4/27/2019
+"""
+import itertools
+from consts import *
+from game2d import GInput, ScriptedInput
+from game2d.gview import INPUT_CHUNK
+from app import Invaders
+
+
+# The keys held down in each frame of the recordings
+SCRIPT = [(), ('left',), ('left','spacebar'), ('spacebar',), (), ('right',),
+          ('right','up','spacebar'), ('s',), (), ('left',)]
+
+
+def record(filename,frames,stop=True):
+    """
+    Records frames of SCRIPT (repeated) to filename, returning the recorded frames
+
+    Each recorded frame is a pair (dt, keys), where keys is the set of keys down.
+
+    Parameter filename: the file to record to
+    Precondition: filename is a string
+
+    Parameter frames: the number of frames to record
+    Precondition: frames is an int >= 0
+
+    Parameter stop: whether to stop the recording at the end
+    Precondition: stop is a bool
+    """
+    input = ScriptedInput(itertools.cycle(SCRIPT))
+    input.start_recording(filename)
+    result = []
+    for frame in range(frames):
+        input.advance()
+        dt = 1/60+(frame % 7)*0.001
+        input._advance(dt)
+        result.append((dt,set(input.keys)))
+    if stop:
+        input.stop_recording()
+    return (input, result)
+
+
+def replay(filename):
+    """
+    Plays back the recording in filename, returning the frames played
+
+    Each frame is a pair (dt, keys), where keys is the set of keys down.
+
+    Parameter filename: the file to play back
+    Precondition: filename is a file written by GInput.start_recording
+    """
+    input = GInput()
+    input.start_replay(filename)
+    result = []
+    while input.replaying:
+        dt = input._advance(0)
+        result.append((dt,set(input.keys)))
+    return result
+
+
+def test_round_trip(tmp_path):
+    """
+    Checks that a recording plays back the same keys and frame times
+    """
+    filename = str(tmp_path/'input.bin')
+    (input, frames) = record(filename,250)
+    assert not input.recording
+    assert replay(filename) == frames
+
+
+def test_empty_recording(tmp_path):
+    """
+    Checks that a recording with no frames plays back nothing
+    """
+    filename = str(tmp_path/'input.bin')
+    record(filename,0)
+    assert replay(filename) == []
+
+
+def test_unstopped_recording(tmp_path):
+    """
+    Checks that a recording that was never stopped plays back its written chunks
+    """
+    filename = str(tmp_path/'input.bin')
+    (input, frames) = record(filename,2*INPUT_CHUNK+10,False)
+    assert input.recording
+    assert replay(filename) == frames[:2*INPUT_CHUNK]
+    input.stop_recording()
+    assert replay(filename) == frames
+
+
+def test_truncated_recording(tmp_path):
+    """
+    Checks that a recording cut off in the middle of a frame drops only that frame
+    """
+    filename = str(tmp_path/'input.bin')
+    (input, frames) = record(filename,40)
+    with open(filename,'rb') as file:
+        data = file.read()
+    # The last frame adds no keys, so it is the time, a count and one byte of keys
+    for cut in range(1,10):
+        with open(filename,'wb') as file:
+            file.write(data[:-cut])
+        assert replay(filename) == frames[:-1]
+
+
+def test_game_replay(tmp_path):
+    """
+    Checks that a replayed game plays exactly the same game as its recording
+    """
+    filename = str(tmp_path/'game.bin')
+    keys = itertools.chain([()]*5,[('s',)],
+        itertools.cycle([('right','spacebar')]*90+[('left','spacebar')]*90))
+    game = Invaders(width=GAME_WIDTH,height=GAME_HEIGHT,record=filename)
+    game.build()
+    game.start()
+    game.input._script = keys
+    recorded = []
+    for frame in range(600):
+        game.input.advance()
+        game._refresh(1/60+(frame % 7)*0.001)
+        recorded.append((game._state,game._score,game._wave.get_dead_count() if game._wave else None))
+    game.input.stop_recording()
+
+    game = Invaders(width=GAME_WIDTH,height=GAME_HEIGHT,replay=filename)
+    game.build()
+    game.start()
+    replayed = []
+    while game.input.replaying:
+        game._refresh(0)
+        replayed.append((game._state,game._score,game._wave.get_dead_count() if game._wave else None))
+    assert replayed == recorded
+    assert recorded[-1][1] > 0
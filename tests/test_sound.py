@@ -0,0 +1,135 @@
+"""
+Tests for the voices of SoundEffects
+
+SoundEffects plays each effect on one of several voices, and steals the oldest voice
+when every voice of an effect is busy or too many voices play at once.  The headless
+sounds never play, so these tests make them keep a play state that only stop resets,
+as if every sound were very long.
+
+# John O'Donnel (jro79) and Anthony Nguyen (an523)
+# 4/27/2019
+"""
+import pytest
+from game2d import headless
+from game2d.sound import SoundEffects
+
+
+@pytest.fixture
+def stopped(monkeypatch):
+    """
+    Makes the headless sounds play until stopped, returning the list of stopped sounds
+
+    The list holds the headless sound of each call to stop that stopped it, in order.
+    """
+    result = []
+    def play(sound):
+        sound.state = 'play'
+    def stop(sound):
+        if sound.state == 'play':
+            result.append(sound)
+        sound.state = 'stop'
+    monkeypatch.setattr(headless._Sound,'play',play)
+    monkeypatch.setattr(headless._Sound,'stop',stop)
+    return result
+
+
+def playing(effects):
+    """
+    Returns the list of the playing voices of effects, from the oldest to the newest
+
+    Parameter effects: the sound effects
+    Precondition: effects is a SoundEffects
+    """
+    effects._prune()
+    return list(effects._active)
+
+
+def test_voices_take_turns(stopped):
+    """
+    Checks that the voices of an effect take turns among its files
+    """
+    effects = SoundEffects(voices=2)
+    effects['pew'] = ('pew1.wav','pew2.wav')
+    voices = effects['pew']
+    assert [voice.source for voice in voices] == ['pew1.wav','pew2.wav']*2
+    for count in range(4):
+        effects.play('pew')
+    assert playing(effects) == list(voices)
+    assert effects.playing == 4
+    assert stopped == []
+
+
+def test_finished_voice_is_reused(stopped):
+    """
+    Checks that a voice that finished playing is picked again without stealing
+    """
+    effects = SoundEffects(voices=2)
+    effects['pop'] = 'pop1.wav'
+    (first, second) = effects['pop']
+    effects.play('pop')
+    effects.play('pop')
+    first._sound.state = 'stop'
+    assert effects.playing == 1
+    effects.play('pop')
+    assert playing(effects) == [second,first]
+    assert stopped == []
+
+
+def test_busy_effect_steals_oldest(stopped):
+    """
+    Checks that an effect with every voice busy steals its oldest voice
+    """
+    effects = SoundEffects(voices=3)
+    effects['blast'] = 'blast1.wav'
+    effects['pew'] = 'pew1.wav'
+    (first, second, third) = effects['blast']
+    effects.play('blast')
+    effects.play('pew')
+    effects.play('blast')
+    effects.play('blast')
+    effects.play('blast')
+    assert stopped == [first._sound]
+    assert playing(effects)[-1] == first
+    effects.play('blast')
+    assert stopped == [first._sound,second._sound]
+    assert [voice.source for voice in playing(effects)] == ['pew1.wav']+['blast1.wav']*3
+
+
+def test_limit_steals_oldest_overall(stopped):
+    """
+    Checks that playing past the limit steals the oldest voice of any effect
+    """
+    effects = SoundEffects(voices=2,limit=3)
+    effects['pew'] = 'pew1.wav'
+    effects['blast'] = 'blast1.wav'
+    effects['pop'] = 'pop1.wav'
+    effects.play('pew')
+    effects.play('blast')
+    effects.play('pop')
+    oldest = effects['pew'][0]
+    effects.play('pop')
+    assert stopped == [oldest._sound]
+    assert effects.playing == 3
+    assert [voice.source for voice in playing(effects)] == ['blast1.wav','pop1.wav','pop1.wav']
+
+    effects.limit = 1
+    effects.play('pew')
+    assert effects.playing == 1
+    assert playing(effects)[0].source == 'pew1.wav'
+
+
+def test_stop_and_delete(stopped):
+    """
+    Checks that stop and del stop the playing voices
+    """
+    effects = SoundEffects(voices=2)
+    effects['pew'] = 'pew1.wav'
+    effects['pop'] = 'pop1.wav'
+    effects.play('pew')
+    effects.play('pop')
+    del effects['pew']
+    assert effects.playing == 1
+    assert len(stopped) == 1
+    effects.stop()
+    assert effects.playing == 0
+    assert len(stopped) == 2
@@ -0,0 +1,91 @@
+"""
+Tests for the fixed-step accumulator GTimestep
+
+The steps use binary fractions of a second, so that the time left over is exact.
+
+# John O'Donnel (jro79) and Anthony Nguyen (an523)
+# 4/27/2019
+"""
+import pytest
+from game2d.gtimestep import GTimestep
+
+
+def test_whole_steps():
+    """
+    Checks the number of steps taken for frames of whole steps
+    """
+    timestep = GTimestep(0.25)
+    assert timestep.advance(0.25) == 1
+    assert timestep.advance(0.75) == 3
+    assert timestep.advance(0) == 0
+    assert timestep.lag == 0
+    assert timestep.blend == 0
+
+
+def test_partial_steps():
+    """
+    Checks that the time left over is kept for the next frame, with its blend
+    """
+    timestep = GTimestep(0.25)
+    assert timestep.advance(0.125) == 0
+    assert timestep.lag == 0.125
+    assert timestep.blend == 0.5
+    assert timestep.advance(0.1875) == 1
+    assert timestep.lag == 0.0625
+    assert timestep.blend == 0.25
+    assert timestep.advance(0.6875) == 3
+    assert timestep.lag == 0
+    assert timestep.blend == 0
+
+
+def test_many_small_frames():
+    """
+    Checks that frames shorter than a step add up to the right number of steps
+    """
+    timestep = GTimestep(0.25)
+    counts = [timestep.advance(0.0625) for frame in range(16)]
+    assert counts == [0,0,0,1]*4
+    assert sum(counts) == 4
+
+
+def test_max_steps():
+    """
+    Checks that a slow frame takes at most MAX_STEPS steps, and the rest is dropped
+    """
+    timestep = GTimestep(0.25)
+    assert timestep.advance(0.25*(GTimestep.MAX_STEPS+3)+0.125) == GTimestep.MAX_STEPS
+    # The backlog is gone, not carried over to the next frames
+    assert timestep.lag == 0
+    assert timestep.advance(0.125) == 0
+    assert timestep.advance(0.125) == 1
+
+    timestep = GTimestep(0.25)
+    timestep.advance(0.125)
+    assert timestep.advance(100) == GTimestep.MAX_STEPS
+    assert timestep.lag == 0
+
+
+def test_reset():
+    """
+    Checks that reset and a new step throw away the time left over
+    """
+    timestep = GTimestep(0.25)
+    timestep.advance(0.125)
+    timestep.reset()
+    assert timestep.lag == 0
+    timestep.advance(0.125)
+    timestep.step = 0.5
+    assert timestep.step == 0.5
+    assert timestep.lag == 0
+    assert timestep.advance(0.75) == 1
+    assert timestep.blend == 0.5
+
+
+def test_invalid_step():
+    """
+    Checks that a step that is not a positive number is refused
+    """
+    with pytest.raises(AssertionError):
+        GTimestep(0)
+    with pytest.raises(AssertionError):
+        GTimestep('1')
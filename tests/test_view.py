@@ -0,0 +1,183 @@
+"""
+Tests for the retained mode of GView
+
+In retained mode, GView._commit brings the canvas up to date with the objects drawn
+in a frame by removing the ones that disappeared and inserting the ones that
+appeared, and rebuilds it if the objects changed order.  These tests check that the
+canvas always holds exactly the objects drawn in the last frame, in the order drawn.
+
+# John O'Donnel (jro79) and Anthony Nguyen (an523)
+# 4/27/2019
+"""
+import random
+from game2d import GView, GRectangle
+
+
+class CountingView(GView):
+    """
+    A view that counts the changes made to its canvas
+    """
+
+    def __init__(self):
+        """
+        Creates a retained view with no changes counted
+        """
+        GView.__init__(self)
+        self.retained = True
+        self.changes = {'add':0, 'insert':0, 'remove':0, 'clear':0}
+        frame = self._frame
+        for name in self.changes:
+            self._count(frame,name)
+
+    def _count(self,frame,name):
+        """
+        Replaces the method name of frame by one that counts its calls
+
+        Parameter frame: the instruction group to count the changes of
+        Precondition: frame is an InstructionGroup
+
+        Parameter name: the method to count
+        Precondition: name is a key of changes
+        """
+        method = getattr(frame,name)
+        def counted(*args):
+            self.changes[name] += 1
+            return method(*args)
+        setattr(frame,name,counted)
+
+
+def shapes(count):
+    """
+    Returns a list of count distinct rectangles
+
+    Parameter count: the number of rectangles
+    Precondition: count is an int >= 0
+    """
+    return [GRectangle(x=10*pos,y=10,width=5,height=5,fillcolor='red')
+            for pos in range(count)]
+
+
+def frame(view,objects):
+    """
+    Draws objects in view as one animation frame, and returns what the canvas holds
+
+    Parameter view: the view to draw in
+    Precondition: view is a GView
+
+    Parameter objects: the objects to draw, in order
+    Precondition: objects is a list of GObject
+    """
+    view.clear()
+    for obj in objects:
+        obj.draw(view)
+    view._commit()
+    return list(view._frame.children)
+
+
+def caches(objects):
+    """
+    Returns the drawing commands of objects, in order, without repeats
+
+    Parameter objects: the objects drawn
+    Precondition: objects is a list of GObject
+    """
+    result = []
+    for obj in objects:
+        if not obj._cache in result:
+            result.append(obj._cache)
+    return result
+
+
+def test_appear_and_disappear():
+    """
+    Checks the canvas as objects appear and disappear, in place
+    """
+    view = CountingView()
+    (a, b, c, d) = shapes(4)
+    assert frame(view,[a,b,c]) == caches([a,b,c])
+    assert view.changes['insert'] == 3
+    assert frame(view,[a,c]) == caches([a,c])
+    assert view.changes['remove'] == 1
+    assert frame(view,[a,b,c,d]) == caches([a,b,c,d])
+    assert view.changes['insert'] == 5
+    assert view.changes['clear'] == 0
+    assert frame(view,[d]) == caches([d])
+    assert frame(view,[]) == []
+    assert frame(view,[b,a]) == caches([b,a])
+
+
+def test_swap_order():
+    """
+    Checks that objects drawn in a new order are shown in that order
+    """
+    view = CountingView()
+    (a, b, c) = shapes(3)
+    frame(view,[a,b,c])
+    clears = view.changes['clear']
+    assert frame(view,[a,c,b]) == caches([a,c,b])
+    assert view.changes['clear'] == clears+1
+    assert frame(view,[c,b]) == caches([c,b])
+    assert frame(view,[b,c,a]) == caches([b,c,a])
+
+
+def test_same_frame_twice():
+    """
+    Checks that drawing the same objects again changes nothing on the canvas
+    """
+    view = CountingView()
+    objects = shapes(5)
+    first = frame(view,objects)
+    counts = dict(view.changes)
+    assert frame(view,objects) == first
+    assert frame(view,list(objects)) == first
+    assert view.changes == counts
+
+
+def test_repeated_draw():
+    """
+    Checks that an object drawn twice in a frame is shown once, where first drawn
+    """
+    view = CountingView()
+    (a, b) = shapes(2)
+    assert frame(view,[a,b,a]) == caches([a,b])
+    counts = dict(view.changes)
+    assert frame(view,[a,a,b]) == caches([a,b])
+    assert view.changes == counts
+
+
+def test_random_frames():
+    """
+    Checks the canvas after many frames of random objects in random orders
+    """
+    rng = random.Random(0)
+    view = CountingView()
+    pool = shapes(12)
+    drawn = []
+    for step in range(500):
+        choice = rng.random()
+        if choice < 0.3:
+            drawn = [obj for obj in drawn if rng.random() < 0.8]
+        elif choice < 0.6:
+            for obj in rng.sample(pool,3):
+                if not obj in drawn:
+                    drawn.insert(rng.randint(0,len(drawn)),obj)
+        elif choice < 0.7 and len(drawn) > 1:
+            (i, j) = rng.sample(range(len(drawn)),2)
+            (drawn[i], drawn[j]) = (drawn[j], drawn[i])
+        assert frame(view,drawn) == caches(drawn)
+
+
+def test_leave_retained_mode():
+    """
+    Checks that turning retained mode off or on empties the canvas
+    """
+    view = GView()
+    view.retained = True
+    (a, b) = shapes(2)
+    frame(view,[a,b])
+    view.retained = False
+    assert view._frame.children == []
+    assert frame(view,[b]) == caches([b])
+    view.retained = True
+    assert view._frame.children == []
+    assert frame(view,[a]) == caches([a])
@@ -0,0 +1,256 @@
+"""
+Tests for the alien lattice bookkeeping of Wave
+
+Wave keeps the formation bounds (the living count and lowest row of each column, the
+columns that can fire, the outer columns and the lowest row) up to date in
+remove_alien, and finds the alien hit by a bolt with alien_hit.  These tests check
+both against a search of the whole formation.
+
+# John O'Donnel (jro79) and Anthony Nguyen (an523)
+# 4/27/2019
+"""
+import random
+import models
+from consts import *
+from wave import Wave
+
+
+def lattice_bounds(wave):
+    """
+    Returns the formation bounds of wave, found by searching every alien
+
+    The result is a tuple (counts, bottoms, left, right, lowest) in the form that
+    remove_alien keeps them.
+
+    Parameter wave: the wave to search
+    Precondition: wave is a Wave
+    """
+    aliens = wave.get_aliens()
+    counts = [sum(1 for alien in column if alien != None) for column in aliens]
+    bottoms = []
+    for column in aliens:
+        rows = [row for row in range(len(column)) if column[row] != None]
+        bottoms.append(rows[0] if rows else None)
+    living = [column for column in range(len(aliens)) if counts[column] > 0]
+    left = living[0] if living else None
+    right = living[-1] if living else None
+    rows = [bottom for bottom in bottoms if bottom != None]
+    lowest = min(rows) if rows else None
+    return (counts, bottoms, left, right, lowest)
+
+
+def assert_bookkeeping(wave):
+    """
+    Checks that the formation bounds kept by wave match a search of every alien
+
+    Parameter wave: the wave to check
+    Precondition: wave is a Wave
+    """
+    (counts, bottoms, left, right, lowest) = lattice_bounds(wave)
+    assert wave._column_count == counts
+    assert wave._column_bottom == bottoms
+    assert wave._left_column == left
+    assert wave._right_column == right
+    assert wave._lowest_row == lowest
+    living = [column for column in range(len(counts)) if counts[column] > 0]
+    assert sorted(wave._shooters) == living
+    for column in range(len(counts)):
+        if counts[column] > 0:
+            assert wave._shooters[wave._shooter_index[column]] == column
+        else:
+            assert wave._shooter_index[column] == None
+
+
+def alien_center(wave,column,row):
+    """
+    Returns the center (x,y) of the alien at column, row, wherever it is kept
+
+    When the wave keeps the formation in arrays, the Alien objects never move, so
+    the position is read from the arrays instead.
+
+    Parameter wave: the wave of the alien
+    Precondition: wave is a Wave
+
+    Parameter column: the column of the alien
+    Precondition: column is a valid column index
+
+    Parameter row: the row of the alien
+    Precondition: row is a valid row index
+    """
+    if wave._formation != None:
+        return (wave._formation._x[column,row], wave._formation._y[column,row])
+    alien = wave.get_aliens()[column][row]
+    return (alien.get_alien_x(), alien.get_alien_y())
+
+
+def searched_hit(wave,x,y):
+    """
+    Returns the (column, row) of the first living alien overlapping a bolt at (x,y),
+    found by testing the box of the bolt against every alien, or None
+
+    Parameter wave: the wave to search
+    Precondition: wave is a Wave
+
+    Parameter x: the x position of the bolt
+    Precondition: x is an int or float
+
+    Parameter y: the y position of the bolt
+    Precondition: y is an int or float
+    """
+    width = models.BOLT_WIDTH
+    height = models.BOLT_HEIGHT
+    aliens = wave.get_aliens()
+    for column in range(len(aliens)):
+        for row in range(len(aliens[column])):
+            if aliens[column][row] != None:
+                (ax, ay) = alien_center(wave,column,row)
+                if (abs(ax-x) < (ALIEN_WIDTH+width)/2 and
+                    abs(ay-y) < (ALIEN_HEIGHT+height)/2):
+                    return (column,row)
+    return None
+
+
+def bolt_hit(wave,x,y):
+    """
+    Returns the result of alien_hit for a player bolt fired at (x,y)
+
+    Parameter wave: the wave to fire in
+    Precondition: wave is a Wave
+
+    Parameter x: the x position of the bolt
+    Precondition: x is an int or float
+
+    Parameter y: the y position of the bolt
+    Precondition: y is an int or float
+    """
+    slot = wave._bolts.fire(x,y,'player')
+    result = wave.alien_hit(slot)
+    wave._bolts.kill(slot)
+    return result
+
+
+def test_alien_hit_every_alien():
+    """
+    Checks that a bolt at the center or on the corners of an alien hits it
+    """
+    wave = Wave(seed=0)
+    for column in range(ALIENS_IN_ROW):
+        for row in range(ALIEN_ROWS):
+            (x, y) = alien_center(wave,column,row)
+            assert bolt_hit(wave,x,y) == (column,row)
+            for dx in [-1,1]:
+                for dy in [-1,1]:
+                    assert bolt_hit(wave,x+dx*ALIEN_WIDTH/2,y+dy*ALIEN_HEIGHT/2) == (column,row)
+
+
+def test_alien_hit_misses_gaps_and_outside():
+    """
+    Checks that bolts between the aliens, touching them or outside the formation miss
+    """
+    wave = Wave(seed=0)
+    (x, y) = alien_center(wave,0,0)
+    assert bolt_hit(wave,x+(ALIEN_WIDTH+ALIEN_H_SEP)/2,y) == None
+    assert bolt_hit(wave,x+(ALIEN_WIDTH+BOLT_WIDTH)/2,y) == None
+    assert bolt_hit(wave,x,y-(ALIEN_HEIGHT+BOLT_HEIGHT)/2) == None
+    assert bolt_hit(wave,x-ALIEN_WIDTH-ALIEN_H_SEP,y) == None
+    assert bolt_hit(wave,x,y-ALIEN_HEIGHT-ALIEN_V_SEP) == None
+    assert bolt_hit(wave,x+(ALIEN_WIDTH+ALIEN_H_SEP)*ALIENS_IN_ROW,y) == None
+    assert bolt_hit(wave,x,y+(ALIEN_HEIGHT+ALIEN_V_SEP)*ALIEN_ROWS) == None
+
+
+def test_alien_hit_without_corners(monkeypatch):
+    """
+    Checks that a bolt longer than an alien hits it with all its corners outside
+    """
+    wave = Wave(seed=0)
+    (x, y) = alien_center(wave,4,2)
+    monkeypatch.setattr(models,'BOLT_WIDTH',ALIEN_WIDTH+ALIEN_H_SEP/2)
+    monkeypatch.setattr(models,'BOLT_HEIGHT',4)
+    assert bolt_hit(wave,x,y) == (4,2)
+    monkeypatch.setattr(models,'BOLT_WIDTH',4)
+    monkeypatch.setattr(models,'BOLT_HEIGHT',ALIEN_HEIGHT+ALIEN_V_SEP/2)
+    assert bolt_hit(wave,x,y) == (4,2)
+
+
+def test_alien_hit_first_and_living(monkeypatch):
+    """
+    Checks that a bolt over two aliens hits the smallest column, and dead aliens
+    are passed over
+    """
+    wave = Wave(seed=0)
+    (x, y) = alien_center(wave,2,1)
+    x += (ALIEN_WIDTH+ALIEN_H_SEP)/2
+    monkeypatch.setattr(models,'BOLT_WIDTH',ALIEN_H_SEP+8)
+    assert bolt_hit(wave,x,y) == (2,1)
+    wave.remove_alien(2,1)
+    assert bolt_hit(wave,x,y) == (3,1)
+    wave.remove_alien(3,1)
+    assert bolt_hit(wave,x,y) == None
+
+
+def test_alien_hit_matches_search():
+    """
+    Checks alien_hit against a search of every alien, as the formation moves and dies
+    """
+    rng = random.Random(0)
+    wave = Wave(seed=0)
+    for step in range(6):
+        wave._time = ALIEN_SPEED
+        wave.move_aliens_right()
+        wave.move_aliens_down()
+        for count in range(10):
+            wave.remove_alien(*rng.choice([(column,row)
+                for column in range(ALIENS_IN_ROW) for row in range(ALIEN_ROWS)
+                if wave.get_aliens()[column][row] != None]))
+        for count in range(500):
+            x = rng.uniform(-ALIEN_WIDTH,GAME_WIDTH+ALIEN_WIDTH)
+            y = rng.uniform(0,GAME_HEIGHT)
+            assert bolt_hit(wave,x,y) == searched_hit(wave,x,y)
+
+
+def test_remove_alien_bottom_row():
+    """
+    Checks that removing the bottom alien of a column moves its bottom up a row
+    """
+    wave = Wave(seed=0)
+    wave.remove_alien(3,0)
+    assert wave._column_bottom[3] == 1
+    assert wave._lowest_row == 0
+    assert wave.get_dead_count() == 1
+    assert_bookkeeping(wave)
+
+    for column in range(ALIENS_IN_ROW):
+        if column != 3:
+            wave.remove_alien(column,0)
+    assert wave._lowest_row == 1
+    assert_bookkeeping(wave)
+
+
+def test_remove_alien_outer_columns():
+    """
+    Checks that emptying the outer columns moves the left and right columns in
+    """
+    wave = Wave(seed=0)
+    for row in range(ALIEN_ROWS):
+        wave.remove_alien(0,row)
+        wave.remove_alien(ALIENS_IN_ROW-1,row)
+    assert wave._left_column == 1
+    assert wave._right_column == ALIENS_IN_ROW-2
+    assert not 0 in wave._shooters
+    assert not ALIENS_IN_ROW-1 in wave._shooters
+    assert_bookkeeping(wave)
+
+
+def test_remove_alien_random_order():
+    """
+    Checks the bookkeeping after every removal, killing the aliens in random orders
+    """
+    for seed in range(5):
+        wave = Wave(seed=seed)
+        cells = [(column,row) for column in range(ALIENS_IN_ROW) for row in range(ALIEN_ROWS)]
+        random.Random(seed).shuffle(cells)
+        for (column,row) in cells:
+            wave.remove_alien(column,row)
+            assert_bookkeeping(wave)
+        assert wave.get_dead_count() == ALIENS_IN_ROW*ALIEN_ROWS
+        assert wave._shooters == []
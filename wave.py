@@ -20,12 +20,73 @@ from consts import *
 from models import *
 
 import random
+import math
+import numpy as np
 
 # PRIMARY RULE: Wave can only access attributes in models.py via getters/setters
 # Wave is NOT allowed to access anything in app.py (Subcontrollers are not permitted
 # to access anything in their parent. To see why, take CS 3152)
 
 
+class RandomStream(object):
+    """
+    A class representing a seeded stream of random numbers for one part of a Wave.
+
+    A seeded Wave gives each of its random decisions (when the aliens fire, which
+    column fires, how the alien bolts drift) its own stream, so that changing how
+    often one of them draws a number does not change the numbers seen by the others.
+    The numbers are generated RANDOM_BLOCK at a time by a private random.Random, and
+    then handed out one by one from that block.
+
+    A stream has a randint method just like the random module, so Wave can use
+    either one without knowing which it has.
+
+    INSTANCE ATTRIBUTES:
+        _random: the generator for this stream [random.Random]
+        _block:  the current block of numbers [list of float in 0..1, excluding 1]
+        _next:   the position of the next unused number in _block [int >= 0]
+    """
+
+    def __init__(self,seed,name):
+        """
+        Initializes a stream from the seed of a Wave and the name of the stream
+
+        Streams with the same seed and name always produce the same numbers.
+
+        Parameter seed: the seed of the Wave
+        Precondition: seed is an int
+
+        Parameter name: the name of the part of the Wave using this stream
+        Precondition: name is a string
+        """
+        self._random = random.Random(str(seed)+'/'+name)
+        self._block = []
+        self._next = 0
+
+    def random(self):
+        """
+        Returns the next number in the stream, a float in 0..1 (excluding 1)
+        """
+        if self._next == len(self._block):
+            self._block = [self._random.random() for x in range(RANDOM_BLOCK)]
+            self._next = 0
+        self._next += 1
+        return self._block[self._next-1]
+
+    def randint(self,a,b):
+        """
+        Returns the next random int in the range a..b (including b)
+
+        Parameter a: the smallest possible value
+        Precondition: a is an int
+
+        Parameter b: the largest possible value
+        Precondition: b is an int >= a
+        """
+        return a + int(self.random()*(b-a+1))
+
+
+
 class Wave(object):
     """
     This class controls a single level or wave of Alien Invaders.
@@ -45,7 +106,7 @@ class Wave(object):
     INSTANCE ATTRIBUTES:
         _ship:   the player ship to control [Ship]
         _aliens: the 2d list of aliens in the wave [rectangular 2d list of Alien or None]
-        _bolts:  the laser bolts currently on screen [list of Bolt, possibly empty]
+        _bolts:  the laser bolts currently on screen [BoltPool]
         _dline:  the defensive line being protected [GPath]
         _lives:  the number of lives left  [int >= 0]
         _time:   The amount of time since the last Alien "step" [number >= 0]
@@ -61,7 +122,7 @@ class Wave(object):
     and number of lives. If you make changes, please list the changes with the invariants.
 
     LIST MORE ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
-        _exists_player_bolt: boolean if a Ship Bolt is in the _bolts list
+        _exists_player_bolt: boolean if a Ship Bolt is in the _bolts pool
         _direction: the direction the aliens are currently moving
                     (string "left" or "right")
         _steps_until_fire: the number of steps until the aliens fire (int >= 0)
@@ -70,6 +131,32 @@ class Wave(object):
         _dline_breached: True or False if aliens have breached the dline
         _ship_alive: True or False if the ship is currenty alive
         _missed_shots: number of missed shots (int >= 0)
+        _origin_x: x position of the lattice cell in column 0, row 0 (int or float)
+        _origin_y: y position of the lattice cell in column 0, row 0 (int or float)
+        _fire_random: the random stream for when the aliens fire [RandomStream, or
+                      the random module if the Wave is not seeded]
+        _column_random: the random stream for which column fires [RandomStream, or
+                        the random module if the Wave is not seeded]
+        _drift_random: the random numbers for the drift of alien bolts
+                       [numpy.random.Generator]
+        _profiler: the profiler that times each part of a step [GProfiler, disabled
+                   if none was given]
+        _sounds: the sound effects of the wave [SoundEffects with the keys of
+                 SOUND_EFFECTS, or None to play no sounds]
+        _formation: the aliens as NumPy arrays [Formation, or None if FORMATION_ARRAYS
+                    is False]
+        _column_count: the number of living aliens in each column [list of int >= 0]
+        _column_bottom: the lowest living row of each column [list of int, or None
+                        for a column with no living aliens]
+        _shooters: the columns with a living alien, in no particular order [list of int]
+        _shooter_index: the position of each column in _shooters [list of int, or None
+                        for a column with no living aliens]
+        _left_column: the leftmost column with a living alien [int, or None if every
+                      alien is dead]
+        _right_column: the rightmost column with a living alien [int, or None if every
+                       alien is dead]
+        _lowest_row: the lowest row with a living alien [int, or None if every alien
+                     is dead]
     """
 
     # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
@@ -105,8 +192,16 @@ class Wave(object):
         """
         Getter for _dead_count attibute in Wave
         """
+        if self._formation != None:
+            return self._formation.get_dead_count()
         return self._dead_count
 
+    def get_bolt_count(self):
+        """
+        Returns the number of laser bolts on screen
+        """
+        return self._bolts.get_count()
+
     def get_left_barrier():
         """
         Getter for _left_barrier in Wave
@@ -136,15 +231,43 @@ class Wave(object):
         return self._right_barrier.get_lives()
 
     # INITIALIZER (standard form) TO CREATE SHIP AND ALIENS
-    def __init__(self):
+    def __init__(self,seed=None,profiler=None,sounds=None):
         """
         Ititializer for the Wave class
-        """
+
+        A Wave with a seed is deterministic: the same seed and the same sequence of
+        inputs and update times always produce exactly the same game.  To keep the
+        update times the same at any frame rate, update the wave at a fixed step (see
+        GTimestep).
+
+        Parameter seed: the seed for the random decisions of the wave, or None to
+        use the (unseeded) random module
+        Precondition: seed is an int or None
+
+        Parameter profiler: the profiler to time the parts of each step with, or None
+        to not time them
+        Precondition: profiler is a GProfiler or None
+
+        Parameter sounds: the sound effects to play, or None to play no sounds
+        Precondition: sounds is a SoundEffects with the keys of SOUND_EFFECTS, or None
+        """
+        if seed == None:
+            self._fire_random = random
+            self._column_random = random
+            self._drift_random = np.random.default_rng()
+        else:
+            self._fire_random = RandomStream(seed,'fire')
+            self._column_random = RandomStream(seed,'column')
+            #the drift of all alien bolts is drawn at once (see BoltPool.move)
+            drift = random.Random(str(seed)+'/drift').getrandbits(64)
+            self._drift_random = np.random.default_rng(drift)
+        self._profiler = profiler if profiler != None else GProfiler()
+        self._sounds = sounds
         self._ship = Ship(400,SHIP_BOTTOM,'ship.png')
         self.create_aliens()
         self.create_dline()
         self._time = 0
-        self._bolts = []
+        self._bolts = BoltPool()
         self._exists_player_bolt = False
         self._direction = 'right'
         self._steps = 0
@@ -164,11 +287,17 @@ class Wave(object):
         Creates the list of aliens in their respective positions, drawing from
         left to right, upwards. Images of every two rows of aliens cycles through
         ALIEN_IMAGES[n] where n goes from 0 to 2.
+
+        The aliens form a lattice whose origin (the position of the alien in column 0,
+        row 0) is stored in _origin_x and _origin_y.
         """
         self._aliens =[]
         upper = GAME_HEIGHT-ALIEN_CEILING
         x=ALIEN_H_SEP + ALIEN_WIDTH*.5
         base = upper-(ALIEN_HEIGHT+ALIEN_V_SEP)*ALIEN_ROWS
+        #the formation is a rigid lattice anchored at the bottom left alien
+        self._origin_x = x
+        self._origin_y = base
          #image looper
         for across in range(ALIENS_IN_ROW):
             group = []
@@ -181,6 +310,14 @@ class Wave(object):
                 group.append(Alien(x+(ALIEN_WIDTH+ALIEN_H_SEP)*(across)\
                 ,base + (ALIEN_HEIGHT+ALIEN_V_SEP)*(up),source))
             self._aliens.append(group)
+        self._formation = Formation(self._aliens) if FORMATION_ARRAYS else None
+        self._column_count = [ALIEN_ROWS]*ALIENS_IN_ROW
+        self._column_bottom = [0]*ALIENS_IN_ROW
+        self._shooters = list(range(ALIENS_IN_ROW))
+        self._shooter_index = list(range(ALIENS_IN_ROW))
+        self._left_column = 0
+        self._right_column = ALIENS_IN_ROW-1
+        self._lowest_row = 0
         return self._aliens
 
     def create_dline(self):
@@ -193,24 +330,33 @@ class Wave(object):
         return self._dline
 
     # UPDATE METHOD TO MOVE THE SHIP, ALIENS, AND LASER BOLTS
-    def update(self,input, dt):
+    def update(self,input,dt):
         """
-        Calls update method for Ship, Aliens, Laser Bolts, and Dline
+        Advances the wave by one step of dt seconds, calling the update methods
+        for the Ship, Aliens, Laser Bolts, and Dline
+
+        Each of these parts is timed by _profiler, when it is enabled.
 
         Parameter: input is a user input
         Precondition: input is a valid GInput
 
-        Parameter dt: The time in seconds since last update
+        Parameter dt: The time in seconds of this step
         Precondition: dt is a number (int or float)
         """
+        profiler = self._profiler
         self._time+=dt
-        self.update_ship(input)
-        self.move_aliens(dt)
-        self.update_bolts(input)
-        self.ship_collisions()
-        self.alien_collisions()
-        self.alien_dline_collision()
-        self.barrier_collision()
+        self._ship.settle()
+        self._bolts.settle()
+        with profiler.phase('update_ship'):
+            self.update_ship(input)
+        with profiler.phase('move_aliens'):
+            self.move_aliens(dt)
+        with profiler.phase('update_bolts'):
+            self.update_bolts(input)
+        with profiler.phase('bolt_collisions'):
+            self.bolt_collisions()
+        with profiler.phase('dline_collision'):
+            self.alien_dline_collision()
 
     def update_ship(self,input):
         """
@@ -229,37 +375,43 @@ class Wave(object):
         """
         Handles updates for player bolts and alien bolts
 
+        New bolts are fired first.  Then every bolt is moved (the alien bolts homing
+        in on the ship) and the bolts that left the game window are removed, all in
+        one batch.  A player bolt that leaves the window is a missed shot.
+
         Parameter: input is a user input
         Precondition: input is a valid GInput
         """
         self.player_bolts(input)
         self.alien_bolts()
+        missed = self._bolts.move(self._ship.get_ship_x(),self._drift_random)
+        if missed > 0:
+            self._missed_shots += missed
+            self._exists_player_bolt = False
 
     def player_bolts(self, input):
         """
-        Creates and moves the player bolts; Removes it once it leaves the game window
+        Creates the player bolt if the spacebar is down and there is not one already,
+        playing a pew
 
         Parameter: input is a user input
         Precondition: input is a valid GInput
         """
         if input.is_key_down('spacebar') and self._exists_player_bolt == False:
-            self._bolts.append(Bolt(self._ship.get_ship_x(),SHIP_BOTTOM + SHIP_HEIGHT,\
-             BOLT_SPEED, 'player'))
-            self._exists_player_bolt = True
-
-        for bolt in self._bolts:
-            if bolt._kind == "player":
-                bolt.move_bolt_up()
-            if bolt.get_kind_bolt() == 'player' and bolt.get_bolt_y() >= GAME_HEIGHT:
-                self._bolts.remove(bolt)
-                self._missed_shots += 1
-                self._exists_player_bolt = False
+            slot = self._bolts.fire(self._ship.get_ship_x(),SHIP_BOTTOM + SHIP_HEIGHT,\
+             'player')
+            self._exists_player_bolt = slot != None
+            if slot != None:
+                self.play_sound('pew')
 
     def move_aliens(self, dt):
         """
         Determines whether to move aliens to the left or to the right. When the
         aliens hit the right wall it changes their direction to left and vice versa.
 
+        The walls are checked against the leftmost and rightmost living columns
+        (kept up to date by remove_alien), so no alien has to be looked at.
+
         Parameter dt: The time in seconds since last update
         Precondition: dt is a number (int or float)
         """
@@ -271,16 +423,14 @@ class Wave(object):
         if self._direction == "left":
             self.move_aliens_left()
 
-        for row in range(len(self.get_aliens())):
-            for column in range(len(self.get_aliens()[row])):
-                alien=self.get_aliens()[row][column]
-                if (alien != None):
-                    if alien.x > right_end:
-                        self._direction = "left"
-                        down = True
-                    if alien.x < left_end:
-                        self._direction = "right"
-                        down = True
+        if self._right_column != None:
+            pitch = ALIEN_WIDTH+ALIEN_H_SEP
+            if self._origin_x + pitch*self._right_column > right_end:
+                self._direction = "left"
+                down = True
+            if self._origin_x + pitch*self._left_column < left_end:
+                self._direction = "right"
+                down = True
 
         if down == True and self._time < dt:
             self.move_aliens_down()
@@ -296,6 +446,10 @@ class Wave(object):
         if self._time >= ALIEN_SPEED*(SPEED_UP**self.get_dead_count()):
             self._time = 0
             self._steps += 1
+            self._origin_x += ALIEN_H_WALK
+            if self._formation != None:
+                self._formation.march(ALIEN_H_WALK,0)
+                return
             for row in range(len(self.get_aliens())):
                 for column in range(len(self.get_aliens()[row])):
                     alien=self.get_aliens()[row][column]
@@ -313,6 +467,10 @@ class Wave(object):
         if self._time >= ALIEN_SPEED*(SPEED_UP**self.get_dead_count()):
             self._time = 0
             self._steps += 1
+            self._origin_x -= ALIEN_H_WALK
+            if self._formation != None:
+                self._formation.march(-ALIEN_H_WALK,0)
+                return
             for row in range(len(self.get_aliens())):
                 for column in range(len(self.get_aliens()[row])):
                     alien=self.get_aliens()[row][column]
@@ -323,6 +481,15 @@ class Wave(object):
         """
         Method which moves the aliens downward
         """
+        self._origin_y -= ALIEN_V_WALK
+        if self._direction == "right":
+            self._origin_x += ALIEN_H_WALK
+        if self._direction == "left":
+            self._origin_x -= ALIEN_H_WALK
+        if self._formation != None:
+            dx = ALIEN_H_WALK if self._direction == "right" else -ALIEN_H_WALK
+            self._formation.march(dx,-ALIEN_V_WALK)
+            return
         for row in range(len(self.get_aliens())):
             for column in range(len(self.get_aliens()[row])):
                 alien=self.get_aliens()[row][column]
@@ -335,67 +502,68 @@ class Wave(object):
 
     def alien_bolts(self):
         """
-        Creates and moves the alien bolts; removes it once it leaves the game window.
+        Creates the alien bolts.
         If the alien has just fired 0 steps ago, _steps_until_fire will be assigned
         a random integer value within 0 to BOLT_RATE. Once the alien has moved that
         many _steps, a bolt will be formed. The bolt is formed by choosing a random
-        column of aliens and finding the minimum of all the values of the alien's
-        y position within that column.
+        column with a living alien (from _shooters) and firing from its lowest
+        living alien (from _column_bottom).  Both are kept up to date by
+        remove_alien, so no column is ever searched.  Nothing fires once every
+        alien is dead.
         """
 
 
         if self._steps== 0:
-            self._steps_until_fire = random.randint(1,BOLT_RATE)
-        if self._steps == self._steps_until_fire:
-            aliens = self.get_aliens()
-            y = []
+            self._steps_until_fire = self._fire_random.randint(1,BOLT_RATE)
+        if self._steps == self._steps_until_fire and len(self._shooters) > 0:
             #finds a random column of aliens
-            column = random.randint(0, len(aliens) - 1 )
-            while aliens[column].count(None) == ALIEN_ROWS:
-                column = random.randint(0, len(aliens) - 1 )
-
-            for i in aliens[column]:
-                if(i != None):
-                    y.append(i.y)
-                    x=i.x
+            pick = self._column_random.randint(0, len(self._shooters) - 1)
+            column = self._shooters[pick]
+            row = self._column_bottom[column]
+            x = self._origin_x + (ALIEN_WIDTH+ALIEN_H_SEP)*column
+            y = self._origin_y + (ALIEN_HEIGHT+ALIEN_V_SEP)*row
             #creates a bolt at the coordinate of the sait alien
-            self._bolts.append(Bolt(x,min(y), BOLT_SPEED, "alien", "purple" ))
+            self._bolts.fire(x,y,'alien')
             self._steps = 0 #bolt has just fired 0 steps ago
-        for bolt in self._bolts:
-            if bolt._kind == "alien":
-                bolt.move_bolt_down()
-                if bolt.x > self._ship.get_ship_x():
-                    bolt.move_bolt_side(random.randint(-HEAT_SEEKING_DIFFICULTY,0))
-                if bolt.x < self._ship.get_ship_x():
-                    bolt.move_bolt_side(random.randint(0,HEAT_SEEKING_DIFFICULTY))
-            if bolt.get_kind_bolt() == 'alien' and bolt.get_bolt_y() < 0:
-                self._bolts.remove(bolt)
     # DRAW METHOD TO DRAW THE SHIP, ALIENS, DEFENSIVE LINE AND BOLTS
-    def draw(self, view):
+    def draw(self, view, blend=1.0):
         """
         Calls the draw functions for Ship, Aliens, Defensive Line, and Bolts
+
+        The ship and the bolts are drawn the fraction blend of the way through the
+        last step (see GameApp.blend).  The aliens march in whole steps, so they are
+        always drawn where they are.
+
+        Parameter view: the view to draw to
+        Precondition: view is a GView
+
+        Parameter blend: the fraction of the last step to draw the wave at
+        Precondition: blend is a float in 0..1
         """
         self.draw_wave_aliens(view)
-        self.draw_ship(view)
+        self.draw_ship(view,blend)
         self.draw_dline(view)
-        self.draw_bolt(view)
+        self.draw_bolt(view,blend)
         self.draw_barriers(view)
 
     def draw_wave_aliens(self,view):
         """
         Draw the wave of aliens
         """
+        if self._formation != None:
+            self._formation.draw(view)
+            return
         for row in range(len(self.get_aliens())):
             for column in range(len(self.get_aliens()[row])):
                 alien=self.get_aliens()[row][column]
                 if (alien != None):
                     alien.draw(view) #drawing gimage
 
-    def draw_ship(self,view):
+    def draw_ship(self,view,blend=1.0):
         """
-        Draw the ship
+        Draw the ship, the fraction blend of the way through the last step
         """
-        self._ship.draw(view)
+        self._ship.draw(view,blend)
 
     def draw_dline(self,view):
         """
@@ -403,13 +571,11 @@ class Wave(object):
         """
         self._dline.draw(view)
 
-    def draw_bolt(self,view):
+    def draw_bolt(self,view,blend=1.0):
         """
-        Draws the Bolts
+        Draws the Bolts, the fraction blend of the way through the last step
         """
-
-        for i in self._bolts:
-            i.draw(view)
+        self._bolts.draw(view,blend)
     def draw_barriers(self,view):
         """
         Draws the defense barriers
@@ -419,69 +585,195 @@ class Wave(object):
         if(self._right_barrier != None):
             self._right_barrier.draw(view)
     # HELPER METHODS FOR COLLISION DETECTION
-    def alien_collisions(self):
-        """
-        Checks each single in every row and column and determines if it
-        has collided with the ship's bolt. If it has, remove that particular alien
-        and remove the ship's bolt from _bolt.
-
-        For every removal, it adds 1 to _dead_count
-        """
-        for x in range(len(self._aliens)):
-            for y in range(len(self._aliens[x])):
-                if self._aliens[x][y] != None:
-                    for ii in self._bolts:
-                        if ii.get_kind_bolt() == 'player':
-                            if self._aliens[x][y].detect_bolt_collision(ii):
-                                self._aliens[x][y] = None
-                                self._bolts.remove(ii)
-                                self._exists_player_bolt = False
-                                self._dead_count += 1
-
-    def ship_collisions(self):
-        """
-        Checks if the ship has collided with the aliens' bolt. If it has, remove
-        the alien's bolt from _bolt and sets the ship's alive status to False in
-        _ship_alive.
-        """
-        for ii in self._bolts:
-            if ii.get_kind_bolt() == 'alien':
-                if self._ship.detect_alien_bolt_collision(ii):
-                    self._bolts.remove(ii)
-                    self._ship_alive = False
-                    
-    def alien_dline_collision(self):
-        """
-        Checks every alien to see if it has crossed the defensive line
-        """
-        for x in range(len(self._aliens)):
-            for y in range(len(self._aliens[x])):
-                if self._aliens[x][y] != None and \
-                self._aliens[x][y].get_alien_y() <= DEFENSE_LINE + ALIEN_HEIGHT/2:
-                    self._dline_breached = True
-
-
-    def barrier_collision(self):
-        """
-        Check to see if a bolt hits the barrier, sets self._barrier to None when lives hit 0
-        """
-
-        for i in self._bolts:
-            if(self._left_barrier != None):
-                if self._left_barrier.detect_bolt_collision(i):
-                    self._left_barrier.decrease_lives()
-                    self._bolts.remove(i)
-                    if i.get_kind_bolt() == 'player':
-                        self._exists_player_bolt = False
-            if(self._right_barrier != None):
-                if self._right_barrier.detect_bolt_collision(i):
-                    self._right_barrier.decrease_lives()
-                    self._bolts.remove(i)
-                    if i.get_kind_bolt() == 'player':
+    def bolt_collisions(self):
+        """
+        Resolves every live bolt against the ship, the aliens and the barriers in
+        a single pass.
+
+        An alien bolt that hits the ship sets _ship_alive to False.  A player bolt
+        that hits an alien removes that alien (see remove_alien).  A bolt that hits
+        neither and hits a barrier takes a life from the barrier.  Each bolt is
+        resolved once, against the first thing it hits, and the bolts that hit
+        something are only removed from _bolts after every bolt has been resolved.
+        A barrier with no lives left is set to None.  A hit on the ship or an alien
+        plays a blast, and a hit on a barrier plays a pop.
+
+        The bolts are tested against the ship and the barriers with a single call
+        (see BoltPool.collide); only the aliens are found through the lattice.
+        """
+        shapes = [self._ship]
+        for barrier in [self._left_barrier,self._right_barrier]:
+            if barrier != None:
+                shapes.append(barrier)
+        ship = set()
+        barriers = [(barrier,set()) for barrier in shapes[1:]]
+        for (slot, index) in self._bolts.collide(shapes):
+            if index == 0:
+                ship.add(slot)
+            else:
+                barriers[index-1][1].add(slot)
+
+        dead = []
+        for slot in self._bolts.get_live():
+            player = self._bolts.get_kind(slot) == 'player'
+            if not player and slot in ship:
+                self._ship_alive = False
+                self.play_sound('blast')
+                dead.append(slot)
+                continue
+            if player:
+                hit = self.alien_hit(slot)
+                if hit != None:
+                    self.remove_alien(hit[0],hit[1])
+                    self.play_sound('blast')
+                    self._exists_player_bolt = False
+                    dead.append(slot)
+                    continue
+            for (barrier,hits) in barriers:
+                if slot in hits:
+                    barrier.decrease_lives()
+                    self.play_sound('pop')
+                    if player:
                         self._exists_player_bolt = False
+                    dead.append(slot)
+                    break
+        self._bolts.kill_all(dead)
+
         if(self._left_barrier != None):
-            if self._left_barrier.get_lives() == 0:
+            if self._left_barrier.get_lives() <= 0:
                 self._left_barrier = None
         if(self._right_barrier != None):
-            if self._right_barrier.get_lives() == 0:
+            if self._right_barrier.get_lives() <= 0:
                 self._right_barrier = None
+
+    def play_sound(self,key):
+        """
+        Plays the sound effect with the given key, if the wave has sound effects
+
+        Parameter key: the sound effect to play
+        Precondition: key is a key of SOUND_EFFECTS
+        """
+        if self._sounds != None:
+            self._sounds.play(key)
+
+    def alien_hit(self,slot):
+        """
+        Returns the (column, row) of the living alien hit by the bolt in the given
+        slot, or None if it hits no alien.  If it hits more than one, this is the
+        one with the smallest column (and then the smallest row).
+
+        The bolt hits an alien if their boxes overlap (boxes that only touch do not
+        overlap, as in GObject.overlap_pairs).  Instead of testing the bolt against
+        every alien, only the aliens in the lattice cells that the box of the bolt
+        reaches are tested (see alien_span), so each bolt costs the same no matter
+        how large the formation is.
+
+        Parameter slot: the slot of the bolt in _bolts
+        Precondition: slot is the slot of a live bolt
+        """
+        (left, bottom, right, top) = self._bolts.get_bounds(slot)
+        (columns, rows) = self.alien_span(left,bottom,right,top)
+        for column in columns:
+            x = self._origin_x+(ALIEN_WIDTH+ALIEN_H_SEP)*column
+            if x-ALIEN_WIDTH/2 >= right or left >= x+ALIEN_WIDTH/2:
+                continue
+            for row in rows:
+                y = self._origin_y+(ALIEN_HEIGHT+ALIEN_V_SEP)*row
+                if y-ALIEN_HEIGHT/2 >= top or bottom >= y+ALIEN_HEIGHT/2:
+                    continue
+                if self._aliens[column][row] != None:
+                    return (column,row)
+        return None
+
+    def remove_alien(self,column,row):
+        """
+        Removes the alien at column, row from the wave and adds 1 to _dead_count.
+
+        This also brings the formation bounds up to date: the living count and lowest
+        living row of the column, the columns that can still fire, the leftmost and
+        rightmost living columns and the lowest living row.  These only change when
+        an alien dies, so keeping them here means move_aliens, alien_bolts and
+        alien_dline_collision never scan the formation.
+
+        Parameter column: the column of the alien
+        Precondition: column is a valid column index and the alien there is alive
+
+        Parameter row: the row of the alien
+        Precondition: row is a valid row index and the alien there is alive
+        """
+        self._aliens[column][row] = None
+        if self._formation != None:
+            self._formation.kill(column,row)
+        self._dead_count += 1
+
+        self._column_count[column] -= 1
+        if self._column_count[column] == 0:
+            self._column_bottom[column] = None
+            #swap the last shooter into the place of this column
+            pick = self._shooter_index[column]
+            last = self._shooters.pop()
+            if last != column:
+                self._shooters[pick] = last
+                self._shooter_index[last] = pick
+            self._shooter_index[column] = None
+        elif self._column_bottom[column] == row:
+            while self._aliens[column][row] == None:
+                row += 1
+            self._column_bottom[column] = row
+
+        if self._dead_count == len(self._column_count)*ALIEN_ROWS:
+            self._left_column = None
+            self._right_column = None
+            self._lowest_row = None
+            return
+        while self._column_count[self._left_column] == 0:
+            self._left_column += 1
+        while self._column_count[self._right_column] == 0:
+            self._right_column -= 1
+        lowest = None
+        for bottom in self._column_bottom:
+            if bottom != None and (lowest == None or bottom < lowest):
+                lowest = bottom
+        self._lowest_row = lowest
+
+    def alien_span(self,left,bottom,right,top):
+        """
+        Returns the ranges (columns, rows) of the lattice cells whose alien may
+        overlap the box with the given sides.  Either range is empty if the box lies
+        outside the lattice.
+
+        The formation only ever translates as a unit, so the ranges are found with
+        arithmetic from the lattice origin instead of searching the aliens.  They may
+        include a cell whose alien only touches the box, or is dead (None in
+        _aliens); that is for the caller to check.
+
+        Parameter left: the left side of the box
+        Precondition: left is an int or float <= right
+
+        Parameter bottom: the bottom side of the box
+        Precondition: bottom is an int or float <= top
+
+        Parameter right: the right side of the box
+        Precondition: right is an int or float
+
+        Parameter top: the top side of the box
+        Precondition: top is an int or float
+        """
+        width = ALIEN_WIDTH+ALIEN_H_SEP
+        height = ALIEN_HEIGHT+ALIEN_V_SEP
+        first = max(0,math.floor((left-self._origin_x-ALIEN_WIDTH/2)/width))
+        last = min(len(self._aliens)-1,math.ceil((right-self._origin_x+ALIEN_WIDTH/2)/width))
+        lowest = max(0,math.floor((bottom-self._origin_y-ALIEN_HEIGHT/2)/height))
+        highest = min(len(self._aliens[0])-1,
+                      math.ceil((top-self._origin_y+ALIEN_HEIGHT/2)/height))
+        return (range(first,last+1), range(lowest,highest+1))
+
+    def alien_dline_collision(self):
+        """
+        Checks if the lowest living row of aliens has crossed the defensive line
+        """
+        if self._lowest_row == None:
+            return
+        lowest = self._origin_y + (ALIEN_HEIGHT+ALIEN_V_SEP)*self._lowest_row
+        if lowest <= DEFENSE_LINE + ALIEN_HEIGHT/2:
+            self._dline_breached = True